@@ -4,12 +4,22 @@
 数据库连接配置
 """
 
-from sqlalchemy import create_engine
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from urllib.parse import quote
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from typing import Any, Dict, Generator, List, Optional
 from .settings import settings
 
+logger = logging.getLogger(__name__)
+
 # SQLAlchemy引擎配置
 DATABASE_URL = settings.database_url
 
@@ -19,6 +29,47 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 )
 
+
+
+def _sqlite_file_path(url: str) -> Optional[str]:
+    """SQLite文件库的绝对路径，非SQLite或内存库返回None"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    return os.path.abspath(parsed.database)
+
+
+SQLITE_FILE_PATH = _sqlite_file_path(DATABASE_URL)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragma(dbapi_connection, connection_record) -> None:
+    """启用WAL：读连接与唯一的写连接互不阻塞"""
+    if SQLITE_FILE_PATH:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
+# 只读引擎：mode=ro的URI连接 + query_only，独立连接池
+if SQLITE_FILE_PATH:
+    read_engine = create_engine(
+        f"sqlite:///file:{quote(SQLITE_FILE_PATH)}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        pool_size=settings.read_pool_size,
+        max_overflow=settings.read_max_overflow
+    )
+    
+    @event.listens_for(read_engine, "connect")
+    def _set_query_only(dbapi_connection, connection_record) -> None:
+        """只读连接拒绝任何写入"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+else:
+    # 内存库等无法以只读方式共享，读写共用同一引擎
+    read_engine = engine
+
 # 会话管理
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -26,9 +77,265 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
 # 基础模型类
 Base = declarative_base()
 
+# 语句归一化：IN列表、数字与字符串字面量折叠，得到语句形态
+_IN_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_NUMBER_PATTERN = re.compile(r"\b\d+\b")
+_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_SPACE_PATTERN = re.compile(r"\s+")
+
+# 可执行EXPLAIN QUERY PLAN的语句类型
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH")
+
+# 服务层源码目录，用于定位发起慢语句的服务方法
+_SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "service") + os.sep
+
+# 慢语句日志中保留的参数个数
+_MAX_LOGGED_PARAMETERS = 20
+
+
+def statement_shape(statement: str) -> str:
+    """
+    语句形态：去除参数个数与字面量差异，同一形态的语句视为同一查询
+    
+    Args:
+        statement: SQL语句
+    
+    Returns:
+        str: 归一化后的语句
+    """
+    shape = _SPACE_PATTERN.sub(" ", statement).strip()
+    shape = _STRING_PATTERN.sub("?", shape)
+    shape = _NUMBER_PATTERN.sub("?", shape)
+    return _IN_LIST_PATTERN.sub("(?…)", shape)
+
+
+def explain_query_plan(cursor, statement: str, parameters: Any) -> List[str]:
+    """
+    在同一连接上执行EXPLAIN QUERY PLAN
+    
+    Args:
+        cursor: 执行原语句的DBAPI游标
+        statement: SQL语句
+        parameters: 语句参数
+    
+    Returns:
+        List[str]: 执行计划各行，不可解释的语句返回空列表
+    """
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword not in _EXPLAINABLE:
+        return []
+    try:
+        explain_cursor = cursor.connection.cursor()
+        try:
+            rows = explain_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+        finally:
+            explain_cursor.close()
+        return [row[-1] for row in rows]
+    except Exception as e:
+        return [f"EXPLAIN失败: {str(e)}"]
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """
+    脱敏语句参数：保留数值，字符串与二进制只记录类型和长度
+    
+    Args:
+        parameters: 语句参数
+        executemany: 是否为批量执行
+    
+    Returns:
+        Any: 可记录的参数
+    """
+    if executemany:
+        return f"<{len(parameters)} rows>"
+    if isinstance(parameters, dict):
+        items = list(parameters.items())[:_MAX_LOGGED_PARAMETERS]
+        return {key: _redact_value(value) for key, value in items}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters[:_MAX_LOGGED_PARAMETERS]]
+    return _redact_value(parameters)
+
+
+def _redact_value(value: Any) -> Any:
+    """脱敏单个参数值"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<bytes:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def _calling_service_method() -> str:
+    """沿调用栈查找发起语句的服务方法（仅慢语句时调用）"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_SERVICE_DIR):
+            owner = frame.f_locals.get("self")
+            if owner is not None:
+                return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class SlowQueryLog:
+    """慢语句日志：按语句形态聚合耗时、调用方与执行计划"""
+    
+    def __init__(self, enabled: bool, threshold_ms: float, max_entries: int):
+        """
+        初始化慢语句日志
+        
+        Args:
+            enabled: 是否启用
+            threshold_ms: 慢语句阈值（毫秒）
+            max_entries: 聚合的语句形态上限
+        """
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        
+        # 语句形态 -> 聚合记录
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, cursor, statement: str, parameters: Any, executemany: bool, elapsed_ms: float) -> None:
+        """
+        记录一条慢语句，同一形态首次出现时获取执行计划
+        
+        Args:
+            cursor: 执行语句的DBAPI游标
+            statement: SQL语句
+            parameters: 语句参数
+            executemany: 是否为批量执行
+            elapsed_ms: 耗时（毫秒）
+        """
+        shape = statement_shape(statement)
+        service = _calling_service_method()
+        redacted = redact_parameters(parameters, executemany)
+        
+        with self._lock:
+            entry = self._entries.get(shape)
+            need_plan = entry is None or not entry["plan"]
+        
+        # 执行计划在锁外获取，使用原参数以得到真实的索引选择
+        plan = explain_query_plan(cursor, statement, parameters) if need_plan and not executemany else None
+        
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    # 淘汰总耗时最小的形态
+                    smallest = min(self._entries, key=lambda key: self._entries[key]["total_ms"])
+                    del self._entries[smallest]
+                entry = self._entries[shape] = {
+                    "statement": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "services": {},
+                    "plan": [],
+                    "full_scan": False
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_ms"] = elapsed_ms
+            entry["last_parameters"] = redacted
+            entry["last_seen"] = time.time()
+            entry["services"][service] = entry["services"].get(service, 0) + 1
+            if plan:
+                entry["plan"] = plan
+                entry["full_scan"] = any(
+                    line.startswith("SCAN") and "USING" not in line for line in plan
+                )
+        
+        logger.warning(
+            "慢语句 %.1fms [%s]: %s，参数: %s，执行计划: %s",
+            elapsed_ms, service, shape, redacted, " | ".join(plan) if plan else "-",
+            extra={"duration_ms": round(elapsed_ms, 3), "service_method": service, "statement_shape": shape}
+        )
+    
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """
+        按指标排序的慢语句形态
+        
+        Args:
+            limit: 返回条数
+            order_by: 排序字段（total_ms、max_ms或count）
+        
+        Returns:
+            List[Dict[str, Any]]: 聚合记录（含平均耗时）
+        """
+        with self._lock:
+            entries = [
+                {**entry, "services": dict(entry["services"]), "avg_ms": entry["total_ms"] / entry["count"]}
+                for entry in self._entries.values()
+            ]
+        entries.sort(key=lambda entry: entry[order_by], reverse=True)
+        return entries[:limit]
+    
+    def reset(self) -> None:
+        """清空聚合记录"""
+        with self._lock:
+            self._entries.clear()
+
+
+# 全局慢语句日志
+slow_query_log = SlowQueryLog(
+    enabled=settings.slow_query_log_enabled,
+    threshold_ms=settings.slow_query_log_ms,
+    max_entries=settings.slow_query_log_max_entries
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_start(conn, cursor, statement, parameters, context, executemany) -> None:
+    """记录语句开始时间（保存在本次执行的上下文上，语句失败时随上下文丢弃，不在连接上残留）"""
+    if context is not None:
+        context.query_started = time.perf_counter()
+
+
+def query_elapsed(context) -> Optional[float]:
+    """
+    本次执行的语句耗时，供各after_cursor_execute监听器共用
+    
+    Args:
+        context: 执行上下文
+        
+    Returns:
+        Optional[float]: 耗时（秒），没有开始时间时返回None
+    """
+    started = getattr(context, "query_started", None)
+    return None if started is None else time.perf_counter() - started
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _slow_query_end(conn, cursor, statement, parameters, context, executemany) -> None:
+    """超过阈值的语句写入慢语句日志"""
+    if not slow_query_log.enabled:
+        return
+    elapsed = query_elapsed(context)
+    if elapsed is None:
+        return
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms >= slow_query_log.threshold_ms:
+        try:
+            slow_query_log.record(cursor, statement, parameters, executemany, elapsed_ms)
+        except Exception as e:
+            logger.warning("记录慢语句失败: %s", e)
+
 
 def get_db() -> Generator:
     """依赖注入生成器"""
@@ -36,4 +343,19 @@ def get_db() -> Generator:
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+
+def get_read_db() -> Generator:
+    """只读依赖注入生成器，用于查询类接口"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def init_db() -> None:
+    """按模型创建或迁移数据库结构（建表、迁移旧表、补建列与索引）"""
+    from .schema import bootstrap_schema
+    bootstrap_schema(engine)
\ No newline at end of file
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库结构初始化与迁移（由模型生成，应用启动与data/init_database.py共用）
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import Column, CreateIndex, CreateTable, Table
+
+from .database import Base
+
+logger = logging.getLogger(__name__)
+
+# 旧版初始化脚本创建的表：模型表名 -> 旧表名（仅与模型表名不同的表，大小写不同的表SQLite视为同一张表，由重建处理）
+LEGACY_TABLES: Dict[str, str] = {
+    "table_info": "Table",
+    "text_info": "TextInfo"
+}
+
+# 旧表中改名的列：模型表名 -> {模型列名: 旧列名}
+LEGACY_COLUMNS: Dict[str, Dict[str, str]] = {
+    "coordinate": {"table_id": "tableId"}
+}
+
+# 已由复合索引或主键取代的旧索引
+OBSOLETE_INDEXES = (
+    "ix_table_info_id",
+    "ix_text_info_id",
+    "ix_phrase_id",
+    "ix_phrase_text_id",
+    "ix_coordinate_id",
+    "ix_coordinate_table_id",
+    "ux_coordinate_table_position",
+    "ix_import_job_id",
+    "ix_import_job_status"
+)
+
+
+@contextmanager
+def _transaction(bind: Engine) -> Iterator:
+    """
+    显式事务中执行DDL（pysqlite默认不为DDL开启事务，重建中途失败时须整体回滚）
+    
+    Yields:
+        DBAPI游标
+    """
+    connection = bind.raw_connection()
+    driver_connection = connection.driver_connection
+    isolation_level = driver_connection.isolation_level
+    driver_connection.isolation_level = None
+    cursor = driver_connection.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    finally:
+        cursor.close()
+        driver_connection.isolation_level = isolation_level
+        connection.close()
+
+
+def _stored_tables(bind: Engine) -> Dict[str, str]:
+    """
+    数据库中已有的表
+    
+    Returns:
+        Dict[str, str]: 表名 -> 建表语句
+    """
+    with bind.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).all()
+    return {name: sql for name, sql in rows}
+
+
+def _default_sql(column: Column) -> Optional[str]:
+    """列默认值对应的SQL（INSERT ... SELECT不会应用Python端默认值）"""
+    default = column.default
+    if default is None:
+        return None
+    if default.is_scalar:
+        return repr(default.arg) if isinstance(default.arg, (int, float)) else f"'{default.arg}'"
+    if default.is_clause_element:
+        return "CURRENT_TIMESTAMP"
+    return None
+
+
+def _copy_expressions(table: Table, source_columns: List[str]) -> Dict[str, str]:
+    """
+    旧表数据复制到模型表的列表达式（按列名匹配，改名的列按LEGACY_COLUMNS映射）
+    
+    Args:
+        table: 模型表
+        source_columns: 旧表列名
+    
+    Returns:
+        Dict[str, str]: 模型列名 -> 旧表上的SQL表达式
+    """
+    available = {name.lower(): name for name in source_columns}
+    renamed = LEGACY_COLUMNS.get(table.name, {})
+    expressions = {}
+    for column in table.columns:
+        source = available.get(column.name.lower()) or available.get(renamed.get(column.name, "").lower())
+        default = _default_sql(column)
+        if source is None:
+            if default is not None:
+                expressions[column.name] = default
+            continue
+        expression = f'"{source}"'
+        if not column.nullable and default is not None:
+            expression = f"COALESCE({expression}, {default})"
+        expressions[column.name] = expression
+    return expressions
+
+
+def _insert_select(cursor, table: Table, source_name: str, source_columns: List[str]) -> int:
+    """从旧表复制数据到模型表，返回复制的行数"""
+    expressions = _copy_expressions(table, source_columns)
+    columns = ", ".join(f'"{name}"' for name in expressions)
+    cursor.execute(
+        f'INSERT INTO "{table.name}" ({columns}) SELECT {", ".join(expressions.values())} FROM "{source_name}"'
+    )
+    return cursor.rowcount
+
+
+def _drop_duplicate_keys(cursor, table: Table, source_name: str, source_columns: List[str]) -> int:
+    """
+    删除旧表中主键重复的行（旧表没有该唯一约束），每组保留ID最大（最新）的一行
+    
+    Args:
+        cursor: DBAPI游标
+        table: 模型表
+        source_name: 旧表名
+        source_columns: 旧表列名
+    
+    Returns:
+        int: 删除的行数
+    """
+    key_columns = [column.name for column in table.primary_key.columns]
+    if key_columns == ["id"] or "id" not in table.columns:
+        return 0
+    expressions = _copy_expressions(table, source_columns)
+    if any(name not in expressions for name in key_columns + ["id"]):
+        return 0
+    group_by = ", ".join(expressions[name] for name in key_columns)
+    cursor.execute(
+        f'DELETE FROM "{source_name}" WHERE {expressions["id"]} NOT IN '
+        f'(SELECT MAX({expressions["id"]}) FROM "{source_name}" GROUP BY {group_by})'
+    )
+    return cursor.rowcount
+
+
+def _needs_rebuild(table: Table, stored_name: str, stored_sql: str, stored_columns: List[str]) -> bool:
+    """
+    已有表与模型不一致、无法原地修改时需要重建：
+    表名大小写不同（旧版脚本）、缺少非空列、WITHOUT ROWID布局不同
+    """
+    if stored_name != table.name:
+        return True
+    existing = {name.lower() for name in stored_columns}
+    if any(not column.nullable and column.name.lower() not in existing for column in table.columns):
+        return True
+    with_rowid = table.dialect_options["sqlite"]["with_rowid"]
+    return with_rowid == ("WITHOUT ROWID" in (stored_sql or "").upper())
+
+
+def _rebuild_table(bind: Engine, table: Table, stored_name: str, stored_columns: List[str]) -> None:
+    """
+    按模型重建表：旧表改名、按模型建表与索引、复制数据、删除旧表，整体在一个事务中完成
+    
+    旧表没有模型主键的唯一约束时（如coordinate的(table_id, position)），重复的行只保留ID最大的一行。
+    
+    Args:
+        bind: 数据库引擎
+        table: 模型表
+        stored_name: 已有表名
+        stored_columns: 已有表的列名
+    """
+    started = time.perf_counter()
+    old_name = f"{table.name}__old"
+    with _transaction(bind) as cursor:
+        # 步骤1：删除旧表上的索引（索引名随表保留，会与模型索引重名）
+        indexes = cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? COLLATE NOCASE AND sql IS NOT NULL",
+            (stored_name,)
+        ).fetchall()
+        for (index_name,) in indexes:
+            cursor.execute(f'DROP INDEX "{index_name}"')
+        
+        # 步骤2：旧表改名后按模型建表（legacy_alter_table避免其他表的外键随改名指向旧表）
+        cursor.execute("PRAGMA legacy_alter_table=ON")
+        cursor.execute(f'ALTER TABLE "{stored_name}" RENAME TO "{old_name}"')
+        cursor.execute("PRAGMA legacy_alter_table=OFF")
+        cursor.execute(str(CreateTable(table).compile(dialect=bind.dialect)))
+        
+        # 步骤3：去除主键重复的行，复制数据并删除旧表
+        dropped = _drop_duplicate_keys(cursor, table, old_name, stored_columns)
+        if dropped:
+            logger.warning("重建表 %s: 删除 %d 行主键重复的旧数据，每组保留ID最大的一行", table.name, dropped)
+        copied = _insert_select(cursor, table, old_name, stored_columns)
+        cursor.execute(f'DROP TABLE "{old_name}"')
+        
+        # 步骤4：按模型建索引
+        for index in table.indexes:
+            cursor.execute(str(CreateIndex(index).compile(dialect=bind.dialect)))
+    logger.info("按模型重建表 %s（原表 %s）: %d 行，耗时 %.1fms", table.name, stored_name, copied, (time.perf_counter() - started) * 1000)
+
+
+def _import_legacy_tables(bind: Engine) -> None:
+    """旧版脚本创建的表中的数据复制到对应的模型表（模型表为空时），随后删除旧表"""
+    stored = _stored_tables(bind)
+    for table_name, legacy_name in LEGACY_TABLES.items():
+        if legacy_name not in stored:
+            continue
+        legacy_columns = [column["name"] for column in inspect(bind).get_columns(legacy_name)]
+        table = Base.metadata.tables[table_name]
+        with _transaction(bind) as cursor:
+            copied = 0
+            if cursor.execute(f'SELECT 1 FROM "{table_name}" LIMIT 1').fetchone() is None:
+                copied = _insert_select(cursor, table, legacy_name, legacy_columns)
+            cursor.execute(f'DROP TABLE "{legacy_name}"')
+        logger.info("迁移旧表 %s 到 %s: %d 行", legacy_name, table_name, copied)
+
+
+def _add_missing_columns(bind: Engine) -> None:
+    """已存在的表不会由create_all补建列，新增的可空列逐个补建"""
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=bind.dialect)
+            try:
+                with bind.begin() as connection:
+                    connection.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+                logger.info("补建列 %s.%s", table.name, column.name)
+            except SQLAlchemyError as e:
+                logger.warning("补建列 %s.%s 失败: %s", table.name, column.name, e)
+
+
+def _sync_indexes(bind: Engine) -> None:
+    """
+    删除已被取代的旧索引；已存在的表不会由create_all补建索引，逐个检查创建
+    
+    索引创建失败（如已有数据违反唯一约束）直接抛出：依赖唯一索引的upsert在运行时会全部失败，
+    不能带着缺失的索引启动。
+    
+    Raises:
+        SQLAlchemyError: 索引创建失败
+    """
+    with bind.begin() as connection:
+        for index_name in OBSOLETE_INDEXES:
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS "{index_name}"')
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=bind, checkfirst=True)
+            except SQLAlchemyError as e:
+                logger.error("创建索引 %s 失败，请先清理违反约束的数据: %s", index.name, e)
+                raise
+
+
+def bootstrap_schema(bind: Engine) -> None:
+    """
+    按模型创建或迁移数据库结构（可重复执行）
+    
+    依次：创建缺失的表、迁移旧版脚本的表、重建与模型不一致的表、补建可空列、同步索引。
+    
+    Args:
+        bind: 数据库引擎
+    
+    Raises:
+        SQLAlchemyError: 建表、迁移或创建索引失败
+    """
+    from .. import models  # noqa: F401  注册全部模型
+    Base.metadata.create_all(bind=bind)
+    
+    if bind.dialect.name == "sqlite":
+        _import_legacy_tables(bind)
+        stored = _stored_tables(bind)
+        stored_names = {name.lower(): name for name in stored}
+        inspector = inspect(bind)
+        for table in Base.metadata.sorted_tables:
+            stored_name = stored_names[table.name.lower()]
+            stored_columns = [column["name"] for column in inspector.get_columns(stored_name)]
+            if _needs_rebuild(table, stored_name, stored[stored_name], stored_columns):
+                _rebuild_table(bind, table, stored_name, stored_columns)
+    
+    _add_missing_columns(bind)
+    _sync_indexes(bind)
\ No newline at end of file
@@ -14,9 +14,88 @@ class Settings(BaseSettings):
     # 数据库连接配置
     database_url: str = "sqlite:///./cube.db"
     
+    # 只读连接池配置
+    read_pool_size: int = 8
+    read_max_overflow: int = 8
+    
     # 环境变量管理
     debug: bool = True
     
+    # SQL语句检查配置（调试模式下生效）
+    sql_inspect_enabled: bool = False
+    sql_inspect_header: bool = True
+    sql_n_plus_one_threshold: int = 5
+    sql_slow_ms: float = 100.0
+    
+    # 慢语句日志配置（所有环境生效，按语句形态聚合）
+    slow_query_log_enabled: bool = True
+    slow_query_log_ms: float = 100.0
+    slow_query_log_max_entries: int = 200
+    
+    # 单请求CPU剖析配置（未设置令牌时不启用）
+    profile_token: Optional[str] = None
+    profile_dir: str = "data/profiles"
+    profile_max_files: int = 50
+    profile_sample_interval_ms: float = 1.0
+    
+    # 链路追踪配置（导出为OTLP JSON格式的滚动JSONL文件）
+    tracing_enabled: bool = False
+    tracing_file: str = "data/traces/traces.jsonl"
+    tracing_max_bytes: int = 10 * 1024 * 1024
+    tracing_backup_count: int = 5
+    
+    # 日志配置（队列异步写入，重复日志限流采样）
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_file: Optional[str] = None
+    log_file_max_bytes: int = 20 * 1024 * 1024
+    log_file_backup_count: int = 5
+    log_queue_size: int = 10000
+    log_rate_limit_burst: int = 10
+    log_rate_limit_interval_seconds: float = 10.0
+    log_sample_rate: int = 100
+    
+    # 启动预热配置（预建连接、更新统计信息、编译热点语句、填充小缓存）
+    warmup_enabled: bool = True
+    warmup_connections: int = 4
+    warmup_analysis_limit: int = 1000
+    
+    # 服务监听配置
+    host: str = "127.0.0.1"
+    port: int = 8000
+    
+    # 坐标导入配置
+    cor_file_path: str = "data/cor.txt"
+    import_batch_size: int = 1000
+    import_max_workers: int = 2
+    import_max_pending: int = 16
+    import_stale_seconds: int = 60
+    import_report_max_samples: int = 10
+    
+    # 响应缓存配置
+    response_cache_enabled: bool = True
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    response_cache_ttl_seconds: int = 300
+    
+    # 跨进程缓存失效配置
+    change_log_retention: int = 10000
+    
+    # 共享内存网格缓存配置
+    grid_cache_enabled: bool = True
+    grid_cache_min_cells: int = 1000
+    
+    # 热点表格内存写回配置
+    write_behind_enabled: bool = False
+    write_behind_flush_interval_ms: int = 200
+    write_behind_max_dirty: int = 10000
+    write_behind_max_tables: int = 4
+    write_behind_journal_path: str = "data/write_behind.journal"
+    
+    # 组提交写入队列配置
+    write_queue_enabled: bool = True
+    write_queue_window_ms: float = 2.0
+    write_queue_max_batch: int = 256
+    
     # 环境变量文件配置
     class Config:
         env_file = ".env"
@@ -8,11 +8,21 @@ from .table import Table
 from .text_info import TextInfo
 from .phrase import Phrase
 from .coordinate import Coordinate
+from .import_job import ImportJob
+from .import_digest import ImportDigest
+from .import_staging import ImportStaging
+from .change_log import ChangeLog
+from .version_state import VersionState
 
 # 导出所有模型
 __all__ = [
     "Table",
     "TextInfo", 
     "Phrase",
-    "Coordinate"
+    "Coordinate",
+    "ImportJob",
+    "ImportDigest",
+    "ImportStaging",
+    "ChangeLog",
+    "VersionState"
 ] 
\ No newline at end of file
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ChangeLog模型定义
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..config.database import Base
+
+
+class ChangeLog(Base):
+    """ChangeLog模型（跨进程缓存失效日志）"""
+    
+    __tablename__ = "change_log"
+    
+    # 主键：单调递增序号，删除旧记录后不复用
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # 字段定义
+    version_key = Column(String(255), nullable=False)
+    create_time = Column(DateTime, nullable=False, default=func.now())
+    
+    __table_args__ = (
+        {"sqlite_autoincrement": True},
+    )
+    
+    def __repr__(self) -> str:
+        """字符串表示方法"""
+        return f"<ChangeLog(seq={self.seq}, version_key='{self.version_key}')>"
\ No newline at end of file
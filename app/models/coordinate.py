@@ -14,23 +14,28 @@ class Coordinate(Base):
     
     __tablename__ = "coordinate"
     
-    # 主键索引
-    id = Column(BigInteger, primary_key=True, index=True)
+    # 唯一ID（ORM主键，按ID查询走唯一索引）
+    id = Column(BigInteger, nullable=False)
     
-    # 外键关系
-    table_id = Column(BigInteger, ForeignKey("table_info.id"), nullable=False, index=True)
+    # 外键关系（聚簇主键第一列：同一表格的坐标连续存储）
+    table_id = Column(BigInteger, ForeignKey("table_info.id"), primary_key=True)
     
     # 字段定义
     color = Column(Integer, nullable=False)
-    position = Column(String(255), nullable=False)
+    position = Column(String(255), primary_key=True)
     voc = Column(String(255), nullable=True)
     repeated = Column(Integer, nullable=False, default=0)
     
-    # 约束：color字段范围检查
+    # 约束：color字段范围检查；WITHOUT ROWID按(table_id, position)聚簇，同一表格内位置唯一（导入按位置upsert）
     __table_args__ = (
         CheckConstraint('color >= 0 AND color <= 8', name='check_coordinate_color_range'),
+        Index('ux_coordinate_id', 'id', unique=True),
+        {"sqlite_with_rowid": False},
     )
     
+    # ORM按id标识对象（数据库主键为聚簇键）
+    __mapper_args__ = {"primary_key": [id]}
+    
     # 关系：多对一关联Table模型
     table = relationship("Table", back_populates="coordinates")
     
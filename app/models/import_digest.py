@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ImportDigest模型定义
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..config.database import Base
+
+
+class ImportDigest(Base):
+    """ImportDigest模型（表格最近一次导入的文件摘要）"""
+    
+    __tablename__ = "import_digest"
+    
+    # 主键：每个表格一条记录
+    table_id = Column(BigInteger, primary_key=True)
+    
+    # 字段定义
+    content_hash = Column(String(64), nullable=False)
+    cell_count = Column(Integer, nullable=False, default=0)
+    update_time = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self) -> str:
+        """字符串表示方法"""
+        return f"<ImportDigest(table_id={self.table_id}, content_hash='{self.content_hash}', cell_count={self.cell_count})>"
\ No newline at end of file
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ImportJob模型定义
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from ..config.database import Base
+
+
+class ImportJob(Base):
+    """ImportJob模型（后台坐标导入任务）"""
+    
+    __tablename__ = "import_job"
+    
+    # 主键索引
+    id = Column(BigInteger, primary_key=True)
+    
+    # 字段定义
+    table_id = Column(BigInteger, nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="pending")
+    parsed = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    message = Column(String(1000), nullable=True)
+    report = Column(Text, nullable=True)  # 校验报告（JSON）
+    owner = Column(String(128), nullable=True)  # 执行进程标识（主机:进程号:启动ID）
+    create_time = Column(DateTime, nullable=False, default=func.now())
+    update_time = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    
+    # 索引：按状态统计未完成任务、按创建顺序恢复待执行任务
+    __table_args__ = (
+        Index('ix_import_job_status_create_time', 'status', 'create_time'),
+    )
+    
+    def __repr__(self) -> str:
+        """字符串表示方法"""
+        return f"<ImportJob(id={self.id}, table_id={self.table_id}, status='{self.status}', parsed={self.parsed}, inserted={self.inserted}, rejected={self.rejected})>"
\ No newline at end of file
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ImportStaging模型定义
+"""
+
+from sqlalchemy import Column, BigInteger, String
+from ..config.database import Base
+
+
+class ImportStaging(Base):
+    """ImportStaging模型（导入任务已处理的位置，收尾时按反连接删除文件中已不存在的格子）"""
+    
+    __tablename__ = "import_staging"
+    
+    # 主键：按任务聚簇，与批次同一事务写入，断点续传后仍完整
+    job_id = Column(BigInteger, primary_key=True)
+    position = Column(String(255), primary_key=True)
+    
+    __table_args__ = (
+        {"sqlite_with_rowid": False},
+    )
+    
+    def __repr__(self) -> str:
+        """字符串表示方法"""
+        return f"<ImportStaging(job_id={self.job_id}, position='{self.position}')>"
\ No newline at end of file
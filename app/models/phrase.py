@@ -15,15 +15,21 @@ class Phrase(Base):
     __tablename__ = "phrase"
     
     # 主键索引
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True)
     
     # 外键关系
-    text_id = Column(BigInteger, ForeignKey("text_info.id"), nullable=False, index=True)
+    text_id = Column(BigInteger, ForeignKey("text_info.id"), nullable=False)
     
     # 字段定义
     word = Column(String(255), nullable=False)
     type = Column(Integer, nullable=False, default=0)
     
+    # 索引：按颜色精确查找词汇；词根前缀匹配（LIKE不区分大小写，索引须为NOCASE才能按前缀范围查找）
+    __table_args__ = (
+        Index('ix_phrase_text_word', 'text_id', 'word'),
+        Index('ix_phrase_word_nocase', word.collate('NOCASE')),
+    )
+    
     # 关系：多对一关联TextInfo模型
     text_info = relationship("TextInfo", back_populates="phrases")
     
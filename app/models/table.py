@@ -16,12 +16,17 @@ class Table(Base):
     __tablename__ = "table_info"
     
     # 主键索引
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True)
     
     # 字段定义
     name = Column(String(255), nullable=False)
     create_time = Column(DateTime, nullable=False, default=func.now())
     
+    # 索引：列表按(create_time, id)键集分页，包含name的覆盖索引，名称前缀过滤与分页不回表
+    __table_args__ = (
+        Index('ix_table_info_create_time_id_name', 'create_time', 'id', 'name'),
+    )
+    
     # 关系：一对多关联Coordinate模型，级联删除
     coordinates = relationship("Coordinate", back_populates="table", cascade="all, delete-orphan")
     
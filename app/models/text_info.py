@@ -15,7 +15,7 @@ class TextInfo(Base):
     __tablename__ = "text_info"
     
     # 主键索引
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True)
     
     # 字段定义
     color = Column(Integer, nullable=False, unique=True)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VersionState模型定义
+"""
+
+from sqlalchemy import Column, BigInteger, String
+from ..config.database import Base
+
+
+class VersionState(Base):
+    """VersionState模型（各版本键的全局版本号，所有进程一致）"""
+    
+    __tablename__ = "version_state"
+    
+    # 主键：版本键
+    version_key = Column(String(255), primary_key=True)
+    
+    # 字段定义
+    version = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        """字符串表示方法"""
+        return f"<VersionState(version_key='{self.version_key}', version={self.version})>"
\ No newline at end of file
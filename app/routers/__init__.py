@@ -8,10 +8,16 @@ from .text_info import router as text_info_router
 from .phrase import router as phrase_router
 from .table import router as table_router
 from .coordinate import router as coordinate_router
+from .import_job import router as import_job_router
+from .diagnostics import router as diagnostics_router
+from .metrics import router as metrics_router
 
 __all__ = [
     "text_info_router",
     "phrase_router", 
     "table_router",
     "coordinate_router",
+    "import_job_router",
+    "diagnostics_router",
+    "metrics_router",
 ]
\ No newline at end of file
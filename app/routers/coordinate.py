@@ -4,18 +4,21 @@
 Coordinate路由模块
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional
 from ..schemas import CoordinateUpdate
 from ..service import CoordinateService
-from ..service.dependencies import get_coordinate_service
+from ..service.dependencies import get_coordinate_service, get_read_coordinate_service
+from ..tool import check_not_modified, cached_response, coordinate_version_key, TEXT_INFO_VERSION_KEY, PHRASE_VERSION_KEY, TracedRoute
 
-router = APIRouter(prefix="/coordinate", tags=["coordinates"])
+router = APIRouter(prefix="/coordinate", tags=["coordinates"], route_class=TracedRoute)
 
 
 @router.get("/batch", response_model=Dict[str, Any])
 async def batch_import_coordinates(
     id: int = Query(..., description="表格ID"),
+    dry_run: bool = Query(False, description="只校验文件并返回预计差异，不写入"),
     coordinate_service: CoordinateService = Depends(get_coordinate_service)
 ):
     """
@@ -23,12 +26,13 @@ async def batch_import_coordinates(
     
     Args:
         id: 表格ID
+        dry_run: 是否只校验不写入
         
     Returns:
-        Dict: 包含coordinates和total的字典
+        Dict: 包含coordinates、total和report（校验报告）的字典
     """
     try:
-        return await coordinate_service.batch_import(id)
+        return await coordinate_service.batch_import(id, dry_run)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,11 +75,12 @@ async def delete_coordinates(
 
 @router.get("/find", response_model=Dict[str, Any])
 async def find_coordinates(
-    id: int = Query(..., description="表格ID"),
-    coordinate_service: CoordinateService = Depends(get_coordinate_service)
+    request: Request,
+    response: Response,
+    id: int = Query(..., description="表格ID")
 ):
     """
-    获取表格坐标
+    获取表格坐标（支持If-None-Match条件请求）
     
     Args:
         id: 表格ID
@@ -83,8 +88,15 @@ async def find_coordinates(
     Returns:
         Dict: 包含coordinates和total的字典
     """
+    not_modified = check_not_modified(request, response, coordinate_version_key(id))
+    if not_modified:
+        return not_modified
+    
     try:
-        return await coordinate_service.find_coordinates_by_table(id)
+        return await cached_response(
+            response, f"coordinate:find:{id}", [coordinate_version_key(id)], Dict[str, Any],
+            lambda db: CoordinateService(db).find_coordinates_by_table(id)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,12 +109,56 @@ async def find_coordinates(
         )
 
 
+@router.get("/export")
+async def export_coordinates(
+    id: int = Query(..., description="表格ID"),
+    format: str = Query("cor", pattern="^(cor|csv)$", description="导出格式：cor或csv"),
+    gzip: bool = Query(False, description="是否gzip压缩"),
+    coordinate_service: CoordinateService = Depends(get_read_coordinate_service)
+):
+    """
+    导出表格坐标（batch导入的逆操作，流式输出）
+    
+    Args:
+        id: 表格ID
+        format: 导出格式
+        gzip: 是否gzip压缩
+        
+    Returns:
+        StreamingResponse: 导出文件流
+    """
+    try:
+        content = await coordinate_service.export_coordinates(id, format, gzip)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"导出坐标失败: {str(e)}"
+        )
+    
+    filename = f"table_{id}.{'txt' if format == 'cor' else 'csv'}"
+    media_type = "text/csv" if format == "csv" else "text/plain"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/list", response_model=Dict[str, Any])
 async def list_coordinate_phrases(
+    response: Response,
     color: Optional[int] = Query(None, ge=0, le=8, description="颜色筛选"),
     table_id: Optional[int] = Query(None, description="表格ID"),
-    coordinate_id: Optional[int] = Query(None, description="坐标ID"),
-    coordinate_service: CoordinateService = Depends(get_coordinate_service)
+    coordinate_id: Optional[int] = Query(None, description="坐标ID")
 ):
     """
     坐标关联词汇查询
@@ -116,7 +172,11 @@ async def list_coordinate_phrases(
         Dict: 包含phrases和total的字典
     """
     try:
-        return await coordinate_service.list_coordinate_phrases(color, table_id, coordinate_id)
+        return await cached_response(
+            response, f"coordinate:list:{color}:{table_id}:{coordinate_id}",
+            [PHRASE_VERSION_KEY, TEXT_INFO_VERSION_KEY], Dict[str, Any],
+            lambda db: CoordinateService(db).list_coordinate_phrases(color, table_id, coordinate_id)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diagnostics路由模块
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Dict, Any, List
+from ..config.database import slow_query_log
+from ..tool import response_cache, single_flight, grid_store, memory_profiler, log_pipeline, TracedRoute, require_profile_token
+from ..service.write_queue import write_queue
+from ..service.warmup import startup_timer
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"], route_class=TracedRoute)
+
+# 内存跟踪、慢语句等诊断接口需要profile_token（未配置时不可用）
+_token_required = [Depends(require_profile_token)]
+
+
+@router.get("/cache", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """
+    查询缓存与写入统计（命中率、内存占用、并发读取合并、共享网格、组提交、日志队列）
+    
+    Returns:
+        Dict: 缓存统计信息
+    """
+    try:
+        return {**response_cache.stats(), **single_flight.stats(), **grid_store.stats(), **write_queue.stats(), **log_pipeline.stats()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询缓存统计失败: {str(e)}"
+        )
+
+
+@router.post("/memory/start", response_model=Dict[str, Any], dependencies=_token_required)
+async def start_memory_tracing(
+    frames: int = Query(1, ge=1, le=64, description="每个分配记录的调用栈深度")
+):
+    """
+    开始tracemalloc内存跟踪
+    
+    Args:
+        frames: 调用栈深度
+        
+    Returns:
+        Dict: 跟踪状态
+    """
+    try:
+        return memory_profiler.start(frames)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"开始内存跟踪失败: {str(e)}"
+        )
+
+
+@router.post("/memory/stop", response_model=Dict[str, Any], dependencies=_token_required)
+async def stop_memory_tracing():
+    """
+    停止内存跟踪并清除快照
+    
+    Returns:
+        Dict: 跟踪状态
+    """
+    try:
+        return memory_profiler.stop()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"停止内存跟踪失败: {str(e)}"
+        )
+
+
+@router.get("/memory/status", response_model=Dict[str, Any], dependencies=_token_required)
+async def get_memory_status():
+    """
+    查询内存跟踪状态（当前/峰值内存、已有快照）
+    
+    Returns:
+        Dict: 跟踪状态
+    """
+    try:
+        return memory_profiler.status()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询内存状态失败: {str(e)}"
+        )
+
+
+@router.post("/memory/snapshot", response_model=Dict[str, Any], dependencies=_token_required)
+async def take_memory_snapshot(
+    name: str = Query(..., min_length=1, max_length=64, description="快照名称")
+):
+    """
+    生成命名内存快照
+    
+    Args:
+        name: 快照名称
+        
+    Returns:
+        Dict: 快照名称与已跟踪的内存总量
+    """
+    try:
+        return memory_profiler.take_snapshot(name)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"生成内存快照失败: {str(e)}"
+        )
+
+
+@router.get("/memory/diff", response_model=Dict[str, Any], dependencies=_token_required)
+async def diff_memory_snapshots(
+    base: str = Query(..., description="基准快照名称"),
+    target: str = Query(..., description="目标快照名称"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$", description="分组方式"),
+    limit: int = Query(20, ge=1, le=200, description="返回的分配位置数")
+):
+    """
+    比较两个快照，返回增长最多的分配位置
+    
+    Args:
+        base: 基准快照名称
+        target: 目标快照名称
+        group_by: 分组方式
+        limit: 返回的分配位置数
+        
+    Returns:
+        Dict: 快照差异
+    """
+    try:
+        return memory_profiler.diff(base, target, group_by, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"比较内存快照失败: {str(e)}"
+        )
+
+
+@router.get("/memory/requests", response_model=List[Dict[str, Any]], dependencies=_token_required)
+async def get_request_memory_peaks(
+    limit: int = Query(10, ge=1, le=100, description="返回的路由数")
+):
+    """
+    查询内存峰值最高的路由（跟踪期间的单请求峰值）
+    
+    Args:
+        limit: 返回的路由数
+        
+    Returns:
+        List[Dict]: 路由峰值统计
+    """
+    try:
+        return memory_profiler.heaviest_routes(limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询请求内存峰值失败: {str(e)}"
+        )
+
+
+@router.get("/slow-queries", response_model=List[Dict[str, Any]], dependencies=_token_required)
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200, description="返回的语句形态数"),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|avg_ms|count)$", description="排序字段")
+):
+    """
+    查询慢语句排行（按语句形态聚合，含调用方、脱敏参数与执行计划）
+    
+    Args:
+        limit: 返回的语句形态数
+        order_by: 排序字段
+        
+    Returns:
+        List[Dict]: 慢语句聚合记录
+    """
+    try:
+        return slow_query_log.top(limit, order_by)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询慢语句失败: {str(e)}"
+        )
+
+
+@router.delete("/slow-queries", response_model=Dict[str, Any], dependencies=_token_required)
+async def reset_slow_queries():
+    """
+    清空慢语句聚合记录
+    
+    Returns:
+        Dict: 操作结果
+    """
+    try:
+        slow_query_log.reset()
+        return {"success": True}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"清空慢语句失败: {str(e)}"
+        )
+
+
+@router.get("/startup", response_model=Dict[str, Any])
+async def get_startup_timing():
+    """
+    查询本进程启动总耗时与各阶段耗时（建表、恢复、预热等）
+    
+    Returns:
+        Dict: total_ms与phases（毫秒）
+    """
+    try:
+        return startup_timer.report()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询启动耗时失败: {str(e)}"
+        )
\ No newline at end of file
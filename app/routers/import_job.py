@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ImportJob路由模块
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from ..schemas import ImportJobResponse
+from ..service import ImportJobService
+from ..service.dependencies import get_import_job_service, get_read_import_job_service
+from ..tool import TracedRoute
+
+router = APIRouter(prefix="/import", tags=["import_jobs"], route_class=TracedRoute)
+
+
+@router.post("/add", response_model=ImportJobResponse)
+async def submit_import_job(
+    id: int = Query(..., description="表格ID"),
+    import_job_service: ImportJobService = Depends(get_import_job_service)
+):
+    """
+    提交后台坐标导入任务（从cor.txt导入）
+    
+    Args:
+        id: 表格ID
+    
+    Returns:
+        ImportJobResponse: 新建的任务信息
+    """
+    try:
+        return await import_job_service.submit_job(id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"提交导入任务失败: {str(e)}"
+        )
+
+
+@router.get("/find", response_model=ImportJobResponse)
+async def find_import_job(
+    id: int = Query(..., description="任务ID"),
+    import_job_service: ImportJobService = Depends(get_read_import_job_service)
+):
+    """
+    查询导入任务进度
+    
+    Args:
+        id: 任务ID
+    
+    Returns:
+        ImportJobResponse: 任务信息（已解析、已插入、已拒绝数量）
+    """
+    try:
+        return await import_job_service.find_job(id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"查询导入任务失败: {str(e)}"
+        )
+
+
+@router.put("/cancel", response_model=ImportJobResponse)
+async def cancel_import_job(
+    id: int = Query(..., description="任务ID"),
+    import_job_service: ImportJobService = Depends(get_import_job_service)
+):
+    """
+    取消导入任务
+    
+    Args:
+        id: 任务ID
+    
+    Returns:
+        ImportJobResponse: 任务信息
+    """
+    try:
+        return await import_job_service.cancel_job(id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"取消导入任务失败: {str(e)}"
+        )
\ No newline at end of file
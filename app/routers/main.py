@@ -5,7 +5,7 @@
 """
 
 from fastapi import APIRouter
-from . import text_info_router, phrase_router, table_router, coordinate_router
+from . import text_info_router, phrase_router, table_router, coordinate_router, import_job_router, diagnostics_router
 
 # 创建主路由器
 api_router = APIRouter(prefix="/api")
@@ -14,4 +14,6 @@ api_router = APIRouter(prefix="/api")
 api_router.include_router(text_info_router)
 api_router.include_router(phrase_router)
 api_router.include_router(table_router)
-api_router.include_router(coordinate_router)
\ No newline at end of file
+api_router.include_router(coordinate_router)
+api_router.include_router(import_job_router)
+api_router.include_router(diagnostics_router)
\ No newline at end of file
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrics路由模块
+"""
+
+from fastapi import APIRouter, HTTPException, status, Response
+from ..tool import metrics_registry, TracedRoute
+
+router = APIRouter(tags=["metrics"], route_class=TracedRoute)
+
+# Prometheus文本格式
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    导出Prometheus格式指标（请求延迟、服务方法耗时、SQL统计、连接池、导入吞吐、缓存命中率）
+    
+    Returns:
+        Response: Prometheus文本格式指标
+    """
+    try:
+        return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"导出指标失败: {str(e)}"
+        )
\ No newline at end of file
@@ -4,13 +4,14 @@
 Phrase路由模块
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import Dict, Any, Optional
 from ..schemas import TextInfoColorUpdate, PhraseListResponse
 from ..service import PhraseService
 from ..service.dependencies import get_phrase_service
+from ..tool import check_not_modified, cached_response, TEXT_INFO_VERSION_KEY, PHRASE_VERSION_KEY, TracedRoute
 
-router = APIRouter(prefix="/phrase", tags=["phrases"])
+router = APIRouter(prefix="/phrase", tags=["phrases"], route_class=TracedRoute)
 
 
 @router.post("/add", response_model=Dict[str, Any])
@@ -66,11 +67,12 @@ async def delete_phrase(
 
 @router.get("/list", response_model=PhraseListResponse)
 async def list_phrases(
-    color: Optional[int] = Query(None, ge=0, le=8, description="颜色筛选，范围0-8"),
-    phrase_service: PhraseService = Depends(get_phrase_service)
+    request: Request,
+    response: Response,
+    color: Optional[int] = Query(None, ge=0, le=8, description="颜色筛选，范围0-8")
 ):
     """
-    查询词汇列表
+    查询词汇列表（支持If-None-Match条件请求）
     
     Args:
         color: 颜色筛选参数
@@ -78,8 +80,16 @@ async def list_phrases(
     Returns:
         PhraseListResponse: 词汇列表响应
     """
+    # 颜色到TextInfo的映射也会影响结果，同时依赖两个版本
+    not_modified = check_not_modified(request, response, PHRASE_VERSION_KEY, TEXT_INFO_VERSION_KEY)
+    if not_modified:
+        return not_modified
+    
     try:
-        return await phrase_service.list_phrases(color)
+        return await cached_response(
+            response, f"phrase:list:{color}", [PHRASE_VERSION_KEY, TEXT_INFO_VERSION_KEY], PhraseListResponse,
+            lambda db: PhraseService(db).list_phrases(color)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -4,13 +4,15 @@
 Table路由模块
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from typing import Dict, Any, Optional
 from ..schemas import TableCreate, TableResponse, TableUpdate, TableListResponse
 from ..service import TableService
 from ..service.dependencies import get_table_service
+from ..service.table import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..tool import check_not_modified, cached_response, TABLE_VERSION_KEY, TracedRoute
 
-router = APIRouter(prefix="/table", tags=["tables"])
+router = APIRouter(prefix="/table", tags=["tables"], route_class=TracedRoute)
 
 
 @router.post("/add", response_model=TableResponse)
@@ -38,16 +40,39 @@ async def create_table(
 
 @router.get("/page", response_model=TableListResponse)
 async def get_table_page(
-    table_service: TableService = Depends(get_table_service)
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="每页数量"),
+    cursor: Optional[str] = Query(None, max_length=512, description="上一页返回的next_cursor"),
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=255, description="名称前缀过滤"),
+    with_total: bool = Query(False, description="是否返回符合条件的总数")
 ):
     """
-    查询表格列表
+    分页查询表格列表（按创建时间降序的键集分页，支持If-None-Match条件请求）
     
+    Args:
+        limit: 每页数量
+        cursor: 上一页返回的next_cursor
+        name_prefix: 名称前缀过滤
+        with_total: 是否返回符合条件的总数
+        
     Returns:
         TableListResponse: 表格列表响应
     """
+    not_modified = check_not_modified(request, response, TABLE_VERSION_KEY)
+    if not_modified:
+        return not_modified
+    
     try:
-        return await table_service.get_table_page()
+        return await cached_response(
+            response, f"table:page:{limit}:{cursor}:{name_prefix}:{with_total}", [TABLE_VERSION_KEY], TableListResponse,
+            lambda db: TableService(db).get_table_page(limit, cursor, name_prefix, with_total)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -55,6 +80,36 @@ async def get_table_page(
         )
 
 
+@router.post("/clone", response_model=TableResponse)
+async def clone_table(
+    id: int = Query(..., description="源表格ID"),
+    name: Optional[str] = Query(None, min_length=1, max_length=255, description="新表格名称，可选"),
+    table_service: TableService = Depends(get_table_service)
+):
+    """
+    克隆表格（数据库内复制坐标数据）
+    
+    Args:
+        id: 源表格ID
+        name: 新表格名称
+        
+    Returns:
+        TableResponse: 新建的表格信息
+    """
+    try:
+        return await table_service.clone_table(id, name)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"克隆表格失败: {str(e)}"
+        )
+
+
 @router.put("/update", response_model=Dict[str, str])
 async def update_table(
     table_update: TableUpdate,
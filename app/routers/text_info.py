@@ -4,27 +4,36 @@
 TextInfo路由模块
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from typing import List
 from ..schemas import TextInfoResponse, TextInfoUpdate
 from ..service import TextInfoService
 from ..service.dependencies import get_text_info_service
+from ..tool import check_not_modified, cached_response, TEXT_INFO_VERSION_KEY, TracedRoute
 
-router = APIRouter(prefix="/text", tags=["text_info"])
+router = APIRouter(prefix="/text", tags=["text_info"], route_class=TracedRoute)
 
 
 @router.get("/find", response_model=List[TextInfoResponse])
 async def find_text_info(
-    text_info_service: TextInfoService = Depends(get_text_info_service)
+    request: Request,
+    response: Response
 ):
     """
-    查询所有TextInfo信息
+    查询所有TextInfo信息（支持If-None-Match条件请求）
     
     Returns:
         List[TextInfoResponse]: TextInfo列表
     """
+    not_modified = check_not_modified(request, response, TEXT_INFO_VERSION_KEY)
+    if not_modified:
+        return not_modified
+    
     try:
-        return await text_info_service.find_all()
+        return await cached_response(
+            response, "text:find", [TEXT_INFO_VERSION_KEY], List[TextInfoResponse],
+            lambda db: TextInfoService(db).find_all()
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
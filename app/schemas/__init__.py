@@ -7,6 +7,7 @@ from .text_info import TextInfoBase, TextInfoResponse, TextInfoUpdate, TextInfoC
 from .phrase import PhraseBase, PhraseResponse, PhraseListResponse
 from .table import TableBase, TableCreate, TableResponse, TableUpdate, TableListResponse
 from .coordinate import CoordinateUpdate, CoordinateResponse, CoordinateListResponse
+from .import_job import ImportJobResponse
 
 __all__ = [
     # TextInfo schemas
@@ -31,4 +32,7 @@ __all__ = [
     "CoordinateUpdate",
     "CoordinateResponse",
     "CoordinateListResponse",
+    
+    # ImportJob schemas
+    "ImportJobResponse",
 ] 
\ No newline at end of file
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ImportJob Schema数据模型
+"""
+
+import json
+from pydantic import BaseModel, Field, ConfigDict, field_serializer, field_validator
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class ImportJobResponse(BaseModel):
+    """ImportJob响应模型"""
+    id: int = Field(..., description="任务ID")
+    table_id: int = Field(..., description="表格ID")
+    status: str = Field(..., description="任务状态：pending/running/succeeded/failed/cancelled")
+    parsed: int = Field(..., description="已解析行数")
+    inserted: int = Field(..., description="已写入（新增或变更）坐标数")
+    rejected: int = Field(..., description="已拒绝行数")
+    message: Optional[str] = Field(None, description="任务信息")
+    report: Optional[Dict[str, Any]] = Field(None, description="校验报告：按拒绝原因汇总的行数与样例行")
+    create_time: datetime = Field(..., description="创建时间")
+    update_time: datetime = Field(..., description="更新时间")
+    
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+    
+    @field_validator('report', mode='before')
+    @classmethod
+    def parse_report(cls, value: Any) -> Any:
+        """数据库中以JSON文本存储"""
+        return json.loads(value) if isinstance(value, str) else value
+    
+    @field_serializer('id', 'table_id')
+    def serialize_ids(self, value: int) -> str:
+        """ID字段转字符串"""
+        return str(value)
\ No newline at end of file
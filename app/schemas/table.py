@@ -41,8 +41,9 @@ class TableUpdate(BaseModel):
 
 
 class TableListResponse(BaseModel):
-    """Table列表响应模型"""
+    """Table列表响应模型（按创建时间降序的键集分页）"""
     tables: List[TableResponse] = Field(..., description="表格列表")
-    total: int = Field(..., description="总数")
+    total: Optional[int] = Field(None, description="符合条件的总数，with_total=true时返回")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，没有下一页时为空")
     
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
\ No newline at end of file
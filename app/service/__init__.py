@@ -8,11 +8,18 @@ from .text_info import TextInfoService
 from .phrase import PhraseService
 from .table import TableService
 from .coordinate import CoordinateService
+from .import_job import ImportJobService
 from .dependencies import (
     get_text_info_service,
     get_phrase_service,
     get_table_service,
-    get_coordinate_service
+    get_coordinate_service,
+    get_import_job_service,
+    get_read_text_info_service,
+    get_read_phrase_service,
+    get_read_table_service,
+    get_read_coordinate_service,
+    get_read_import_job_service
 )
 
 __all__ = [
@@ -21,8 +28,15 @@ __all__ = [
     "PhraseService", 
     "TableService",
     "CoordinateService",
+    "ImportJobService",
     "get_text_info_service",
     "get_phrase_service",
     "get_table_service",
     "get_coordinate_service",
+    "get_import_job_service",
+    "get_read_text_info_service",
+    "get_read_phrase_service",
+    "get_read_table_service",
+    "get_read_coordinate_service",
+    "get_read_import_job_service",
 ] 
\ No newline at end of file
@@ -4,10 +4,14 @@
 Coordinate Service业务逻辑
 """
 
+import csv
+import io
 import logging
-import re
 import os
-from typing import List, Dict, Any, Optional
+import time
+import zlib
+from typing import List, Dict, Any, Iterator, Optional
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -15,14 +19,166 @@ from ..models.coordinate import Coordinate
 from ..models.text_info import TextInfo
 from ..models.phrase import Phrase
 from ..models.table import Table
+from ..models.import_digest import ImportDigest
 from ..schemas.coordinate import CoordinateUpdate
-from ..tool import generate_id
+from ..config.settings import settings
+from ..tool import CorParser, ValidationReport, generate_id, mark_changed, coordinate_version_key, grid_store, timed_service, record_import
 from .exceptions import BusinessException
+from .hot_grid import hot_grid_store
+from .write_queue import write_queue
 
 
 logger = logging.getLogger(__name__)
 
+# 单条写入语句的行数上限（受SQLite绑定参数数量限制）
+WRITE_CHUNK_SIZE = 500
 
+# 导出格式与每个输出分块的行数
+EXPORT_FORMATS = ("cor", "csv")
+EXPORT_CHUNK_ROWS = 1000
+
+
+def upsert_coordinates(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    按(table_id, position)批量upsert坐标，颜色未变化的行不产生写入
+    
+    Args:
+        db: 数据库会话
+        rows: 坐标数据列表
+        
+    Returns:
+        int: 实际写入（新增或变更）的行数
+    """
+    if not rows:
+        return 0
+    
+    coordinate_table = Coordinate.__table__
+    stmt = sqlite_insert(coordinate_table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[coordinate_table.c.table_id, coordinate_table.c.position],
+        set_={"color": stmt.excluded.color},
+        where=coordinate_table.c.color != stmt.excluded.color
+    )
+    
+    written = 0
+    for i in range(0, len(rows), WRITE_CHUNK_SIZE):
+        written += db.execute(stmt, rows[i:i + WRITE_CHUNK_SIZE]).rowcount
+    return written
+
+
+def delete_coordinates_by_ids(db: Session, coordinate_ids: List[int]) -> int:
+    """
+    按ID分批删除坐标
+    
+    Args:
+        db: 数据库会话
+        coordinate_ids: 坐标ID列表
+        
+    Returns:
+        int: 删除的行数
+    """
+    deleted = 0
+    for i in range(0, len(coordinate_ids), WRITE_CHUNK_SIZE):
+        deleted += db.query(Coordinate).filter(
+            Coordinate.id.in_(coordinate_ids[i:i + WRITE_CHUNK_SIZE])
+        ).delete(synchronize_session=False)
+    return deleted
+
+
+def clear_import_digest(db: Session, table_id: int) -> None:
+    """
+    清除表格的导入摘要（坐标被其他途径修改后，下次导入需重新比较）
+    
+    Args:
+        db: 数据库会话
+        table_id: 表格ID
+    """
+    db.query(ImportDigest).filter(
+        ImportDigest.table_id == table_id
+    ).delete(synchronize_session=False)
+
+
+def apply_coordinate_update(db: Session, coordinate_update: CoordinateUpdate) -> Dict[str, Any]:
+    """
+    在会话中更新坐标（不提交）
+    
+    Args:
+        db: 数据库会话
+        coordinate_update: 坐标更新数据
+        
+    Returns:
+        Dict: 更新后的坐标
+        
+    Raises:
+        BusinessException: 坐标不存在
+    """
+    # 数据获取：通过ID查询Coordinate记录
+    existing_coordinate = db.query(Coordinate).filter(
+        Coordinate.id == coordinate_update.id
+    ).first()
+    
+    # 存在性验证：检查Coordinate是否存在
+    if not existing_coordinate:
+        raise BusinessException(f"ID为 {coordinate_update.id} 的坐标不存在")
+    
+    # 导入摘要失效：原表格与目标表格的网格均已变化
+    original_table_id = existing_coordinate.table_id
+    clear_import_digest(db, existing_coordinate.table_id)
+    if coordinate_update.table_id != existing_coordinate.table_id:
+        clear_import_digest(db, coordinate_update.table_id)
+    
+    # 数据操作：更新字段
+    existing_coordinate.table_id = coordinate_update.table_id
+    existing_coordinate.color = coordinate_update.color
+    existing_coordinate.position = coordinate_update.position
+    existing_coordinate.voc = coordinate_update.voc
+    existing_coordinate.repeated = coordinate_update.repeated
+    
+    mark_changed(
+        db,
+        coordinate_version_key(original_table_id),
+        coordinate_version_key(coordinate_update.table_id)
+    )
+    
+    # 结果转换：转换为Dict格式
+    return {
+        'id': existing_coordinate.id,
+        'table_id': existing_coordinate.table_id,
+        'color': existing_coordinate.color,
+        'position': existing_coordinate.position,
+        'voc': existing_coordinate.voc,
+        'repeated': existing_coordinate.repeated
+    }
+
+
+def _parse_cor_file(cor_file_path: str, report: ValidationReport) -> Dict[str, int]:
+    """
+    解析坐标文件，同一位置以最后一行为准，拒绝的行记入校验报告
+    
+    Args:
+        cor_file_path: 坐标文件路径
+        report: 校验报告
+    
+    Returns:
+        Dict[str, int]: 位置 -> 颜色
+    """
+    cells = {}
+    with open(cor_file_path, 'r', encoding='utf-8') as file:
+        for line_num, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                report.add(line_num, line, None)
+                continue
+            
+            # 解析"（x， y） color"格式并验证数据有效性
+            reason, position, color_int = CorParser.parse_line(line)
+            report.add(line_num, line, reason)
+            if reason is None:
+                cells[position] = color_int
+    return cells
+
+
+@timed_service
 class CoordinateService:
     """Coordinate服务类"""
     
@@ -34,15 +190,22 @@ class CoordinateService:
         """
         self.db = db
     
-    async def batch_import(self, table_id: int) -> Dict[str, Any]:
+    async def batch_import(self, table_id: int, dry_run: bool = False) -> Dict[str, Any]:
         """
-        批量导入坐标（从cor.txt导入）
+        批量导入坐标（从cor.txt增量导入）
+        
+        文件内容与上次导入一致时不写入；否则与已存储网格逐格比较，
+        仅对新增、变更、删除的格子按(table_id, position)执行upsert/删除。
+        被拒绝的行汇总到校验报告（按原因计数并保留样例行），不逐行记录日志。
+        dry_run时只解析校验并计算差异，不做任何写入。
         
         Args:
             table_id: 表格ID
+            dry_run: 是否只校验不写入
             
         Returns:
-            Dict: 包含coordinates和total的字典
+            Dict: 包含coordinates、total、inserted/updated/deleted/unchanged及report（校验报告，
+                文件未变化时为None）的字典；dry_run时coordinates为空，total为有效格子数
             
         Raises:
             BusinessException: 表格不存在或导入失败
@@ -54,63 +217,89 @@ class CoordinateService:
                 raise BusinessException(f"ID为 {table_id} 的表格不存在")
             
             # 文件处理：读取cor.txt文件
-            cor_file_path = "data/cor.txt"  # 假设文件在data目录下
+            cor_file_path = settings.cor_file_path
             if not os.path.exists(cor_file_path):
                 raise BusinessException("cor.txt文件不存在")
             
-            with open(cor_file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
+            if dry_run:
+                return self._validate_import(table_id, cor_file_path)
             
-            # 数据解析：解析坐标数据
-            coordinates_data = []
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if not line:
-                    continue
+            # 内存表格先写回并移出，导入直接修改数据库
+            hot_grid_store.evict(table_id)
+            
+            # 幂等检查：文件内容与该表格上次导入一致时不做任何写入
+            content_hash = CorParser.file_digest(cor_file_path)
+            digest = self.db.query(ImportDigest).filter(
+                ImportDigest.table_id == table_id
+            ).first()
+            
+            report = None
+            if digest and digest.content_hash == content_hash:
+                logger.info("cor.txt内容未变化，跳过导入，表格ID: %s", table_id)
+                diff_counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": digest.cell_count}
+            else:
+                # 数据解析：解析坐标数据，同一位置以最后一行为准
+                started = time.perf_counter()
+                report = ValidationReport(settings.import_report_max_samples)
+                cells = _parse_cor_file(cor_file_path, report)
+                if report.rejected:
+                    logger.warning("cor.txt存在 %s 行无效数据，表格ID: %s", report.rejected, table_id, extra={"table_id": table_id})
                 
-                # 正则匹配"（x， y） color"格式
-                match = re.match(r'[（(](\d+)[，,]\s*(\d+)[）)]\s*(\d+)', line)
-                if not match:
-                    logger.warning(f"第{line_num}行格式不正确: {line}")
-                    continue
+                if not cells:
+                    return {"coordinates": [], "total": 0, "report": report.to_dict()}
                 
-                x, y, color = match.groups()
-                position = f"({x}, {y})"
-                color_int = int(color)
+                # 差异计算：与已存储网格逐格比较
+                stored = {
+                    position: (coordinate_id, color)
+                    for coordinate_id, position, color in self.db.query(
+                        Coordinate.id, Coordinate.position, Coordinate.color
+                    ).filter(Coordinate.table_id == table_id)
+                }
                 
-                # 验证数据有效性
-                if not (0 <= color_int <= 8):
-                    logger.warning(f"第{line_num}行颜色值超出范围: {color_int}")
-                    continue
+                upsert_rows = []
+                inserted_count = 0
+                for position, color_int in cells.items():
+                    stored_cell = stored.get(position)
+                    if stored_cell is not None and stored_cell[1] == color_int:
+                        continue
+                    if stored_cell is None:
+                        inserted_count += 1
+                    upsert_rows.append({
+                        'id': generate_id(),
+                        'table_id': table_id,
+                        'position': position,
+                        'color': color_int,
+                        'voc': '',  # 默认空
+                        'repeated': 0  # 默认0
+                    })
                 
-                coordinates_data.append({
-                    'id': generate_id(),
-                    'table_id': table_id,
-                    'position': position,
-                    'color': color_int,
-                    'voc': '',  # 默认空
-                    'repeated': 0  # 默认0
-                })
-            
-            if not coordinates_data:
-                return {"coordinates": [], "total": 0}
-            
-            # 批量操作：分批插入
-            batch_size = 1000
-            total_inserted = 0
-            
-            for i in range(0, len(coordinates_data), batch_size):
-                batch = coordinates_data[i:i + batch_size]
+                removed_ids = [
+                    coordinate_id for position, (coordinate_id, _) in stored.items()
+                    if position not in cells
+                ]
                 
-                # bulk_insert_mappings批量插入
-                self.db.bulk_insert_mappings(Coordinate, batch)
+                # 批量操作：仅写入新增、变更和删除的格子，单事务提交
+                upsert_coordinates(self.db, upsert_rows)
+                delete_coordinates_by_ids(self.db, removed_ids)
+                self.db.merge(ImportDigest(
+                    table_id=table_id,
+                    content_hash=content_hash,
+                    cell_count=len(cells)
+                ))
+                if upsert_rows or removed_ids:
+                    mark_changed(self.db, coordinate_version_key(table_id))
                 self.db.commit()
                 
-                batch_count = len(batch)
-                total_inserted += batch_count
-                logger.info(f"成功插入第{i//batch_size + 1}批坐标数据，数量: {batch_count}")
-            
-            # 结果查询：查询插入的坐标记录
+                diff_counts = {
+                    "inserted": inserted_count,
+                    "updated": len(upsert_rows) - inserted_count,
+                    "deleted": len(removed_ids),
+                    "unchanged": len(cells) - len(upsert_rows)
+                }
+                record_import("batch", len(cells), time.perf_counter() - started)
+                logger.info("增量导入完成，表格ID: %s，新增: %s，变更: %s，删除: %s", table_id, diff_counts['inserted'], diff_counts['updated'], diff_counts['deleted'])
+            
+            # 结果查询：查询导入后的坐标记录
             inserted_coordinates = self.db.query(Coordinate).filter(
                 Coordinate.table_id == table_id
             ).all()
@@ -127,11 +316,11 @@ class CoordinateService:
                     'repeated': coord.repeated
                 })
             
-            logger.info(f"批量导入完成，表格ID: {table_id}，总数量: {total_inserted}")
-            
             return {
                 "coordinates": coordinate_dicts,
-                "total": len(coordinate_dicts)
+                "total": len(coordinate_dicts),
+                **diff_counts,
+                "report": report.to_dict() if report is not None else None
             }
             
         except BusinessException:
@@ -141,9 +330,44 @@ class CoordinateService:
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"批量导入坐标错误: {str(e)}")
+            logger.error("批量导入坐标错误: %s", e)
             raise BusinessException("批量导入坐标失败", str(e))
     
+    def _validate_import(self, table_id: int, cor_file_path: str) -> Dict[str, Any]:
+        """
+        只校验不写入：解析文件并与当前网格比较，返回校验报告与预计的差异
+        
+        Args:
+            table_id: 表格ID
+            cor_file_path: 坐标文件路径
+        
+        Returns:
+            Dict: 包含dry_run、total、inserted/updated/deleted/unchanged及report的字典
+        """
+        report = ValidationReport(settings.import_report_max_samples)
+        cells = _parse_cor_file(cor_file_path, report)
+        
+        # 内存表格中的数据比数据库新，优先比较内存表格
+        stored_cells = hot_grid_store.cells(self.db, table_id)
+        if stored_cells is None:
+            stored_cells = self.db.query(Coordinate.position, Coordinate.color).filter(
+                Coordinate.table_id == table_id
+            ).all()
+        stored = dict(stored_cells)
+        
+        changed = sum(1 for position, color in cells.items() if stored.get(position) != color)
+        inserted = sum(1 for position in cells if position not in stored)
+        return {
+            "dry_run": True,
+            "coordinates": [],
+            "total": len(cells),
+            "inserted": inserted,
+            "updated": changed - inserted,
+            "deleted": sum(1 for position in stored if position not in cells) if cells else 0,
+            "unchanged": len(cells) - changed,
+            "report": report.to_dict()
+        }
+    
     async def delete_coordinates_by_table(self, table_id: int) -> Dict[str, str]:
         """
         删除表格所有坐标
@@ -158,33 +382,36 @@ class CoordinateService:
             BusinessException: 删除失败
         """
         try:
-            # 数据操作：批量删除
+            # 数据操作：批量删除（内存表格先写回并移出）
+            hot_grid_store.evict(table_id)
             deleted_count = self.db.query(Coordinate).filter(
                 Coordinate.table_id == table_id
             ).delete()
+            clear_import_digest(self.db, table_id)
             
             # 事务提交
+            mark_changed(self.db, coordinate_version_key(table_id))
             self.db.commit()
             
             # 日志记录：记录删除数量和table_id
-            logger.info(f"成功删除表格ID {table_id} 的 {deleted_count} 个坐标")
+            logger.info("成功删除表格ID %s 的 %s 个坐标", table_id, deleted_count)
             
             return {"message": f"删除成功，共删除 {deleted_count} 个坐标"}
             
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"删除坐标数据库错误: {str(e)}")
+            logger.error("删除坐标数据库错误: %s", e)
             raise BusinessException("删除坐标数据失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"删除坐标业务错误: {str(e)}")
+            logger.error("删除坐标业务错误: %s", e)
             raise BusinessException("删除坐标数据失败", str(e))
     
     async def find_coordinates_by_table(self, table_id: int) -> Dict[str, Any]:
         """
-        获取表格坐标
+        获取表格坐标（优先读取共享内存网格）
         
         Args:
             table_id: 表格ID
@@ -196,24 +423,43 @@ class CoordinateService:
             BusinessException: 查询失败
         """
         try:
-            # 数据获取：条件查询
-            coordinates = self.db.query(Coordinate).filter(
-                Coordinate.table_id == table_id
-            ).all()
-            
-            # 数据转换：转换为Dict格式
-            coordinate_dicts = []
-            for coord in coordinates:
-                coordinate_dicts.append({
-                    'id': coord.id,
-                    'table_id': coord.table_id,
-                    'color': coord.color,
-                    'position': coord.position,
-                    'voc': coord.voc,
-                    'repeated': coord.repeated
-                })
-            
-            logger.info(f"查询到表格ID {table_id} 的 {len(coordinate_dicts)} 个坐标")
+            hot_rows = hot_grid_store.rows(self.db, table_id)
+            grid = grid_store.get(self.db, table_id) if hot_rows is None else None
+            if hot_rows is not None:
+                # 内存表格：包含尚未写回的编辑
+                coordinate_dicts = hot_rows
+            elif grid is not None:
+                # 共享网格：直接遍历段内数组
+                coordinate_dicts = [
+                    {
+                        'id': coordinate_id,
+                        'table_id': table_id,
+                        'color': color,
+                        'position': position,
+                        'voc': voc,
+                        'repeated': repeated
+                    }
+                    for coordinate_id, color, position, voc, repeated in grid.iter_rows()
+                ]
+            else:
+                # 数据获取：条件查询
+                coordinates = self.db.query(Coordinate).filter(
+                    Coordinate.table_id == table_id
+                ).all()
+                
+                # 数据转换：转换为Dict格式
+                coordinate_dicts = []
+                for coord in coordinates:
+                    coordinate_dicts.append({
+                        'id': coord.id,
+                        'table_id': coord.table_id,
+                        'color': coord.color,
+                        'position': coord.position,
+                        'voc': coord.voc,
+                        'repeated': coord.repeated
+                    })
+            
+            logger.info("查询到表格ID %s 的 %s 个坐标", table_id, len(coordinate_dicts))
             
             return {
                 "coordinates": coordinate_dicts,
@@ -221,12 +467,108 @@ class CoordinateService:
             }
             
         except SQLAlchemyError as e:
-            logger.error(f"查询坐标数据库错误: {str(e)}")
+            logger.error("查询坐标数据库错误: %s", e)
             raise BusinessException("查询坐标数据失败", str(e))
         except Exception as e:
-            logger.error(f"查询坐标业务错误: {str(e)}")
+            logger.error("查询坐标业务错误: %s", e)
             raise BusinessException("查询坐标数据失败", str(e))
     
+    async def export_coordinates(
+        self,
+        table_id: int,
+        export_format: str = "cor",
+        compress: bool = False
+    ) -> Iterator[bytes]:
+        """
+        导出表格坐标（cor.txt格式或CSV，流式输出）
+        
+        Args:
+            table_id: 表格ID
+            export_format: 导出格式，cor或csv
+            compress: 是否gzip压缩
+            
+        Returns:
+            Iterator[bytes]: 导出内容分块迭代器
+            
+        Raises:
+            BusinessException: 表格不存在或导出失败
+        """
+        try:
+            # 数据验证：验证table_id存在性，流式输出开始前完成
+            table = self.db.query(Table).filter(Table.id == table_id).first()
+            if not table:
+                raise BusinessException(f"ID为 {table_id} 的表格不存在")
+            
+            if export_format not in EXPORT_FORMATS:
+                raise BusinessException(f"不支持的导出格式: {export_format}")
+            
+            logger.info("开始导出表格ID %s 的坐标，格式: %s，压缩: %s", table_id, export_format, compress)
+            
+            return self._iter_export(table_id, export_format, compress)
+            
+        except BusinessException:
+            raise
+        except SQLAlchemyError as e:
+            logger.error("导出坐标数据库错误: %s", e)
+            raise BusinessException("导出坐标失败", str(e))
+        except Exception as e:
+            logger.error("导出坐标业务错误: %s", e)
+            raise BusinessException("导出坐标失败", str(e))
+    
+    def _iter_export(self, table_id: int, export_format: str, compress: bool) -> Iterator[bytes]:
+        """
+        按游标逐批读取坐标（或遍历共享内存网格）并编码输出，内存占用与表格大小无关
+        
+        Args:
+            table_id: 表格ID
+            export_format: 导出格式，cor或csv
+            compress: 是否gzip压缩
+            
+        Returns:
+            Iterator[bytes]: 导出内容分块迭代器
+        """
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        
+        if export_format == "csv":
+            writer.writerow(["x", "y", "color"])
+        
+        hot_cells = hot_grid_store.cells(self.db, table_id)
+        grid = grid_store.get(self.db, table_id) if hot_cells is None else None
+        if hot_cells is not None:
+            rows = hot_cells
+        elif grid is not None:
+            rows = grid.iter_cells()
+        else:
+            # 游标读取：yield_per分批拉取，不构造完整结果列表
+            rows = self.db.query(Coordinate.position, Coordinate.color).filter(
+                Coordinate.table_id == table_id
+            ).yield_per(EXPORT_CHUNK_ROWS)
+        
+        row_count = 0
+        for position, color in rows:
+            if export_format == "csv":
+                xy = CorParser.split_position(position)
+                writer.writerow([xy[0], xy[1], color] if xy else [position, "", color])
+            else:
+                buffer.write(CorParser.format_line(position, color))
+            
+            row_count += 1
+            if row_count % EXPORT_CHUNK_ROWS == 0:
+                chunk = buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                yield compressor.compress(chunk) if compressor else chunk
+        
+        chunk = buffer.getvalue().encode("utf-8")
+        if compressor:
+            yield compressor.compress(chunk) + compressor.flush()
+        elif chunk:
+            yield chunk
+        
+        logger.info("导出完成，表格ID: %s，数量: %s", table_id, row_count)
+    
     async def list_coordinate_phrases(
         self, 
         color: Optional[int] = None, 
@@ -256,7 +598,7 @@ class CoordinateService:
                 
                 if not text_info:
                     # TextInfo不存在时返回空结果
-                    logger.info(f"颜色 {color} 的TextInfo不存在，返回空结果")
+                    logger.info("颜色 %s 的TextInfo不存在，返回空结果", color)
                     return {"phrases": [], "total": 0}
                 
                 # 关联查询：获取该TextInfo的所有Phrase
@@ -277,7 +619,7 @@ class CoordinateService:
                     'type': phrase.type
                 })
             
-            logger.info(f"坐标关联词汇查询成功，参数: color={color}, table_id={table_id}, coordinate_id={coordinate_id}，结果数量: {len(phrase_dicts)}")
+            logger.info("坐标关联词汇查询成功，参数: color=%s, table_id=%s, coordinate_id=%s，结果数量: %s", color, table_id, coordinate_id, len(phrase_dicts))
             
             return {
                 "phrases": phrase_dicts,
@@ -285,10 +627,10 @@ class CoordinateService:
             }
             
         except SQLAlchemyError as e:
-            logger.error(f"查询词汇列表数据库错误: {str(e)}")
+            logger.error("查询词汇列表数据库错误: %s", e)
             raise BusinessException("查询词汇列表失败", str(e))
         except Exception as e:
-            logger.error(f"查询词汇列表业务错误: {str(e)}")
+            logger.error("查询词汇列表业务错误: %s", e)
             raise BusinessException("查询词汇列表失败", str(e))
     
     async def update_coordinate(self, coordinate_update: CoordinateUpdate) -> Dict[str, Any]:
@@ -305,36 +647,22 @@ class CoordinateService:
             BusinessException: 坐标不存在或更新失败
         """
         try:
-            # 数据获取：通过ID查询Coordinate记录
-            existing_coordinate = self.db.query(Coordinate).filter(
-                Coordinate.id == coordinate_update.id
-            ).first()
+            # 写回存储：热点表格只修改内存
+            updated_coordinate = hot_grid_store.update(coordinate_update)
+            if updated_coordinate is not None:
+                logger.debug("内存更新坐标: ID=%s", coordinate_update.id)
+                return {"coordinates": [updated_coordinate]}
             
-            # 存在性验证：检查Coordinate是否存在
-            if not existing_coordinate:
-                raise BusinessException(f"ID为 {coordinate_update.id} 的坐标不存在")
+            # 事务提交：经写入队列与并发的小写入合并提交
+            updated_coordinate = await write_queue.submit(
+                self.db,
+                lambda db: apply_coordinate_update(db, coordinate_update)
+            )
             
-            # 数据操作：更新字段
-            existing_coordinate.table_id = coordinate_update.table_id
-            existing_coordinate.color = coordinate_update.color
-            existing_coordinate.position = coordinate_update.position
-            existing_coordinate.voc = coordinate_update.voc
-            existing_coordinate.repeated = coordinate_update.repeated
-            
-            # 事务提交
-            self.db.commit()
-            
-            # 结果转换：转换为Dict格式
-            updated_coordinate = {
-                'id': existing_coordinate.id,
-                'table_id': existing_coordinate.table_id,
-                'color': existing_coordinate.color,
-                'position': existing_coordinate.position,
-                'voc': existing_coordinate.voc,
-                'repeated': existing_coordinate.repeated
-            }
+            logger.info("成功更新坐标: ID=%s", coordinate_update.id)
             
-            logger.info(f"成功更新坐标: ID={coordinate_update.id}")
+            # 写回存储：表格后续的单格编辑在内存中完成
+            hot_grid_store.activate(self.db, coordinate_update.table_id)
             
             return {"coordinates": [updated_coordinate]}
             
@@ -345,10 +673,10 @@ class CoordinateService:
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"更新坐标数据库错误: {str(e)}")
+            logger.error("更新坐标数据库错误: %s", e)
             raise BusinessException("更新坐标失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"更新坐标业务错误: {str(e)}")
+            logger.error("更新坐标业务错误: %s", e)
             raise BusinessException("更新坐标失败", str(e))
\ No newline at end of file
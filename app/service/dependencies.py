@@ -6,11 +6,12 @@ Service依赖注入模块
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from ..config.database import get_db
+from ..config.database import get_db, get_read_db
 from .text_info import TextInfoService
 from .phrase import PhraseService
 from .table import TableService
 from .coordinate import CoordinateService
+from .import_job import ImportJobService
 
 
 def get_text_info_service(db: Session = Depends(get_db)) -> TextInfoService:
@@ -30,4 +31,34 @@ def get_table_service(db: Session = Depends(get_db)) -> TableService:
 
 def get_coordinate_service(db: Session = Depends(get_db)) -> CoordinateService:
     """获取Coordinate服务实例"""
-    return CoordinateService(db=db)
\ No newline at end of file
+    return CoordinateService(db=db)
+
+
+def get_import_job_service(db: Session = Depends(get_db)) -> ImportJobService:
+    """获取ImportJob服务实例"""
+    return ImportJobService(db=db)
+
+
+def get_read_text_info_service(db: Session = Depends(get_read_db)) -> TextInfoService:
+    """获取只读会话的TextInfo服务实例（查询接口）"""
+    return TextInfoService(db=db)
+
+
+def get_read_phrase_service(db: Session = Depends(get_read_db)) -> PhraseService:
+    """获取只读会话的Phrase服务实例（查询接口）"""
+    return PhraseService(db=db)
+
+
+def get_read_table_service(db: Session = Depends(get_read_db)) -> TableService:
+    """获取只读会话的Table服务实例（查询接口）"""
+    return TableService(db=db)
+
+
+def get_read_coordinate_service(db: Session = Depends(get_read_db)) -> CoordinateService:
+    """获取只读会话的Coordinate服务实例（查询接口）"""
+    return CoordinateService(db=db)
+
+
+def get_read_import_job_service(db: Session = Depends(get_read_db)) -> ImportJobService:
+    """获取只读会话的ImportJob服务实例（查询接口）"""
+    return ImportJobService(db=db)
\ No newline at end of file
@@ -0,0 +1,722 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HotGrid Service业务逻辑（热点表格的内存写回存储）
+"""
+
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..config.settings import settings
+from ..models.coordinate import Coordinate
+from ..models.import_digest import ImportDigest
+from ..schemas.coordinate import CoordinateUpdate
+from ..tool import mark_changed, version_counter, coordinate_version_key, get_global_version, get_committed_versions
+from .exceptions import BusinessException
+
+
+logger = logging.getLogger(__name__)
+
+# 加载表格时读取行前后全局版本不一致（期间有其他写入提交）的重试次数
+ACTIVATE_ATTEMPTS = 3
+
+# 写回SQL：位置变化的行先改为按ID唯一的临时位置，避免互换位置时违反(table_id, position)唯一约束
+PARK_POSITION_SQL = text("UPDATE coordinate SET position = '#' || id WHERE id = :id")
+WRITE_CELL_SQL = text("""
+    UPDATE coordinate
+    SET color = :color, position = :position, voc = :voc, repeated = :repeated
+    WHERE id = :id
+""")
+
+# 条件写回SQL：只写回加载或上次写回以来数据库中未被其他途径修改的行
+CHECKED_PARK_POSITION_SQL = text("""
+    UPDATE coordinate SET position = '#' || id
+    WHERE id = :id AND color = :base_color AND position = :base_position
+      AND voc IS :base_voc AND repeated = :base_repeated
+""")
+CHECKED_WRITE_CELL_SQL = text("""
+    UPDATE coordinate
+    SET color = :color, position = :position, voc = :voc, repeated = :repeated
+    WHERE id = :id AND color = :base_color AND position = :expected_position
+      AND voc IS :base_voc AND repeated = :base_repeated
+""")
+
+
+class CellText:
+    """格子的文本字段"""
+    
+    __slots__ = ("position", "voc")
+    
+    def __init__(self, position: str, voc: Optional[str]):
+        self.position = position
+        self.voc = voc
+
+
+class HotTable:
+    """单个表格的内存网格，数值字段存放在紧凑数组中"""
+    
+    __slots__ = (
+        "table_id", "ids", "colors", "repeated", "texts", "index", "positions",
+        "dirty", "moved", "base", "version", "flushing_version", "last_used"
+    )
+    
+    def __init__(self, table_id: int, version: int = 0):
+        self.table_id = table_id
+        self.ids = array("q")
+        self.colors = bytearray()
+        self.repeated = array("q")
+        self.texts: List[CellText] = []
+        # 坐标ID -> 下标，位置 -> 下标
+        self.index: Dict[int, int] = {}
+        self.positions: Dict[str, int] = {}
+        # 待写回的下标，其中位置发生变化的下标
+        self.dirty = set()
+        self.moved = set()
+        # 脏格子在数据库中的值（加载或上次写回时）：下标 -> (color, position, voc, repeated)
+        self.base: Dict[int, Tuple[int, str, Optional[str], int]] = {}
+        # 内存数据对应的全局版本号；写回提交中时为提交后预期的版本号
+        self.version = version
+        self.flushing_version: Optional[int] = None
+        self.last_used = time.monotonic()
+    
+    def append(self, coordinate_id: int, color: int, position: str, voc: Optional[str], repeated: int) -> None:
+        """追加一个格子"""
+        i = len(self.ids)
+        self.ids.append(coordinate_id)
+        self.colors.append(color)
+        self.repeated.append(repeated)
+        self.texts.append(CellText(position, voc))
+        self.index[coordinate_id] = i
+        self.positions[position] = i
+    
+    def row(self, i: int) -> Dict[str, Any]:
+        """转换为坐标Dict格式"""
+        cell_text = self.texts[i]
+        return {
+            'id': self.ids[i],
+            'table_id': self.table_id,
+            'color': self.colors[i],
+            'position': cell_text.position,
+            'voc': cell_text.voc,
+            'repeated': self.repeated[i]
+        }
+    
+    def stored(self, i: int) -> Tuple[int, str, Optional[str], int]:
+        """格子当前的字段值，作为写回条件"""
+        cell_text = self.texts[i]
+        return (self.colors[i], cell_text.position, cell_text.voc, self.repeated[i])
+
+
+class HotGridStore:
+    """
+    热点表格的内存权威存储
+    
+    表格首次被单格编辑后加载到内存，之后的编辑只修改内存并追加到日志文件，
+    读取直接返回内存数据；后台线程按间隔将脏格子批量写回SQLite并截断日志。
+    持久性边界：进程崩溃时日志已写入操作系统，重启后重放；
+    断电时最多丢失一个写回间隔内的编辑。
+    日志按进程区分，进程运行期间持有对应的锁文件，只重放持有者已退出的日志。
+    其他进程在写回前读到的是上次写回的数据；读取前比较表格的全局版本号，
+    其他进程（或其他途径）写入后将表格写回并移出，以数据库为准。
+    写回是条件更新：数据库中的行在加载或上次写回后被其他途径修改时不覆盖，
+    以数据库为准并将表格移出内存。
+    """
+    
+    def __init__(
+        self,
+        enabled: bool,
+        flush_interval_ms: int,
+        max_dirty: int,
+        max_tables: int,
+        journal_path: str
+    ):
+        """
+        初始化写回存储
+        
+        Args:
+            enabled: 是否启用
+            flush_interval_ms: 写回间隔（毫秒），即脏数据的最长驻留时间
+            max_dirty: 脏格子数达到该值时立即写回
+            max_tables: 内存中保留的表格数上限（LRU）
+            journal_path: 崩溃恢复日志路径前缀（各进程的日志为"前缀.进程号"）
+        """
+        self.enabled = enabled
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_dirty = max_dirty
+        self.max_tables = max_tables
+        self.journal_prefix = journal_path
+        self._bind_journal(os.getpid())
+        self._lock_fd: Optional[int] = None
+        
+        self._tables: Dict[int, HotTable] = {}
+        # 坐标ID -> 所属的内存表格ID
+        self._owner: Dict[int, int] = {}
+        # 已移出内存、尚未写回的表格
+        self._retired: List[HotTable] = []
+        self._dirty_count = 0
+        self._journal = None
+        
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """持有本进程日志的锁文件，重放已退出进程未写回的日志，启用时启动后台写回线程"""
+        # 预先fork的worker在启动时按自己的进程号确定日志
+        self._bind_journal(os.getpid())
+        if self._lock_fd is None:
+            self._lock_fd = _lock_journal(self.lock_path, blocking=True)
+        self.recover()
+        if self.enabled and self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="hot-grid-flush", daemon=True)
+            self._thread.start()
+    
+    def close(self) -> None:
+        """停止后台线程并写回全部脏数据"""
+        if self._thread is not None:
+            self._stopping = True
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._lock:
+            self._close_journal()
+        
+        # 释放锁文件；写回失败留下的日志由之后启动的进程重放
+        if self._lock_fd is not None:
+            if not any(os.path.exists(path) for path in (self.journal_path, self.flushing_path)):
+                _remove(self.lock_path)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+    
+    def update(self, coordinate_update: CoordinateUpdate) -> Optional[Dict[str, Any]]:
+        """
+        在内存中更新坐标
+        
+        Args:
+            coordinate_update: 坐标更新数据
+        
+        Returns:
+            Optional[Dict]: 更新后的坐标；坐标不在内存表格中时返回None，由调用方走数据库路径
+        
+        Raises:
+            BusinessException: 目标位置已被同表格其他格子占用
+        """
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            table_id = self._owner.get(coordinate_update.id)
+            if table_id is None:
+                return None
+            moving = coordinate_update.table_id != table_id
+            
+            if not moving:
+                table = self._tables[table_id]
+                i = table.index[coordinate_update.id]
+                cell_text = table.texts[i]
+                if i not in table.dirty:
+                    # 未写回的格子当前值即数据库中的值
+                    table.base.setdefault(i, table.stored(i))
+                
+                if coordinate_update.position != cell_text.position:
+                    if coordinate_update.position in table.positions:
+                        raise BusinessException("更新坐标失败", f"表格内位置 {coordinate_update.position} 已存在")
+                    del table.positions[cell_text.position]
+                    table.positions[coordinate_update.position] = i
+                    cell_text.position = coordinate_update.position
+                    table.moved.add(i)
+                
+                table.colors[i] = coordinate_update.color
+                table.repeated[i] = coordinate_update.repeated
+                cell_text.voc = coordinate_update.voc
+                table.last_used = time.monotonic()
+                
+                if i not in table.dirty:
+                    table.dirty.add(i)
+                    self._dirty_count += 1
+                
+                row = table.row(i)
+                self._append_journal(row)
+                dirty_count = self._dirty_count
+                # 与写回后的解除在同一把锁下，未写回的编辑不会漏标
+                version_counter.bump(coordinate_version_key(table_id))
+        
+        if moving:
+            # 跨表格移动：写回并移出两个表格，由数据库路径处理
+            self.evict(table_id, coordinate_update.table_id)
+            return None
+        
+        if dirty_count >= self.max_dirty:
+            self._wake.set()
+        return row
+    
+    def activate(self, db: Session, table_id: int) -> None:
+        """
+        将表格加载到内存，之后的单格编辑在内存中完成
+        
+        持锁加载：加载期间的内存更新与写回不会与之交错；
+        读取行前后表格的全局版本不一致（期间有其他写入提交）时重试，仍不一致则不加载。
+        
+        Args:
+            db: 数据库会话
+            table_id: 表格ID
+        """
+        if not self.enabled:
+            return
+        
+        version_key = coordinate_version_key(table_id)
+        with self._lock:
+            if table_id in self._tables:
+                return
+            
+            # 步骤1：读取行，版本前后一致才采用
+            table = None
+            for _ in range(ACTIVATE_ATTEMPTS):
+                # 结束会话中的读事务，从最新提交的数据读取
+                db.rollback()
+                version = get_global_version(db, version_key)
+                loading = HotTable(table_id, version)
+                for coordinate_id, color, position, voc, repeated in db.query(
+                    Coordinate.id, Coordinate.color, Coordinate.position, Coordinate.voc, Coordinate.repeated
+                ).filter(Coordinate.table_id == table_id):
+                    loading.append(coordinate_id, color, position, voc, repeated)
+                db.rollback()
+                if get_global_version(db, version_key) == version:
+                    table = loading
+                    break
+            db.rollback()
+            
+            if table is None:
+                logger.info("表格写入频繁，暂不加载到内存，表格ID: %s", table_id)
+                return
+            
+            # 步骤2：超出表格数上限时移出最久未编辑的表格
+            retired = False
+            while len(self._tables) >= self.max_tables:
+                oldest = min(self._tables.values(), key=lambda hot_table: hot_table.last_used)
+                retired = self._retire(oldest.table_id) or retired
+            
+            self._tables[table_id] = table
+            for coordinate_id in table.index:
+                self._owner[coordinate_id] = table_id
+        
+        if retired:
+            self.flush()
+        
+        logger.info("表格加载到内存，表格ID: %s，格子数: %s", table_id, len(table.ids))
+    
+    def evict(self, *table_ids: int) -> None:
+        """
+        写回并移出表格，在其他途径批量修改表格坐标前调用
+        
+        Args:
+            table_ids: 表格ID
+        """
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            retired = [table_id for table_id in table_ids if self._retire(table_id)]
+        if retired:
+            self.flush()
+    
+    def rows(self, db: Session, table_id: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        读取内存表格的全部坐标
+        
+        Args:
+            db: 数据库会话（读取表格的全局版本号）
+            table_id: 表格ID
+        
+        Returns:
+            Optional[List[Dict]]: 坐标列表，表格不在内存中或已被其他途径修改时返回None
+        """
+        if not self._current(db, table_id):
+            return None
+        with self._lock:
+            table = self._tables.get(table_id)
+            if table is None:
+                return None
+            return [table.row(i) for i in range(len(table.ids))]
+    
+    def cells(self, db: Session, table_id: int) -> Optional[List[Tuple[str, int]]]:
+        """
+        读取内存表格的位置与颜色
+        
+        Args:
+            db: 数据库会话（读取表格的全局版本号）
+            table_id: 表格ID
+        
+        Returns:
+            Optional[List[Tuple[str, int]]]: (position, color)列表，表格不在内存中或已被其他途径修改时返回None
+        """
+        if not self._current(db, table_id):
+            return None
+        with self._lock:
+            table = self._tables.get(table_id)
+            if table is None:
+                return None
+            return [(cell_text.position, color) for cell_text, color in zip(table.texts, table.colors)]
+    
+    def _current(self, db: Session, table_id: int) -> bool:
+        """
+        检查内存表格是否仍是最新数据
+        
+        全局版本号超过内存数据的版本（且不是本进程正在提交的写回）时，
+        说明其他进程或其他途径修改了表格：写回并移出，调用方改从数据库读取。
+        读取事务的快照较旧（版本号更小）时内存数据更新，照常使用。
+        
+        Args:
+            db: 数据库会话
+            table_id: 表格ID
+        
+        Returns:
+            bool: 内存表格可用返回True
+        """
+        if table_id not in self._tables:
+            return False
+        version = get_global_version(db, coordinate_version_key(table_id))
+        with self._lock:
+            table = self._tables.get(table_id)
+            if table is None:
+                return False
+            if version <= table.version or version == table.flushing_version:
+                return True
+            retired = self._retire(table_id)
+        
+        logger.info("表格已被其他途径修改（全局版本 %s），移出内存，表格ID: %s", version, table_id)
+        if retired:
+            self.flush()
+        return False
+    
+    def flush(self) -> int:
+        """
+        将脏格子在单个事务中写回SQLite
+        
+        Returns:
+            int: 写回的格子数
+        """
+        with self._flush_lock:
+            # 步骤1：取出脏数据并轮换日志，之后的编辑写入新日志
+            with self._lock:
+                pending = []
+                for table in list(self._tables.values()) + self._retired:
+                    if table.dirty:
+                        pending.append((table, table.dirty, table.moved, table.base))
+                        table.dirty, table.moved, table.base = set(), set(), {}
+                        # 本次提交只使表格的全局版本号加1，否则期间有其他写入
+                        table.flushing_version = table.version + 1
+                rows = [self._checked_row(table, i, base) for table, dirty, _, base in pending for i in dirty]
+                moved_ids = [table.ids[i] for table, _, moved, _ in pending for i in moved]
+                retired, self._retired = self._retired, []
+                self._dirty_count = 0
+                if rows:
+                    self._rotate_journal()
+            
+            if not rows:
+                return 0
+            
+            # 步骤2：写回数据库
+            try:
+                conflicts, versions = self._write(rows, moved_ids)
+            except Exception as e:
+                logger.error("内存表格写回失败: %s", e)
+                with self._lock:
+                    for table, dirty, moved, base in pending:
+                        table.flushing_version = None
+                        table.dirty |= dirty
+                        table.moved |= moved
+                        # 写回失败时数据库中仍是更早的值
+                        table.base.update(base)
+                        self._dirty_count += len(dirty)
+                    self._retired.extend(table for table in retired if table.dirty)
+                return 0
+            
+            # 步骤3：冲突的表格以数据库为准，移出内存
+            if conflicts:
+                self._discard(conflicts)
+            
+            with self._lock:
+                # 同步内存表格的版本号；提交前已有其他写入的表格以数据库为准移出
+                stale = []
+                for table, _, _, _ in pending:
+                    expected, table.flushing_version = table.flushing_version, None
+                    if self._tables.get(table.table_id) is not table:
+                        continue
+                    if versions.get(coordinate_version_key(table.table_id)) == expected:
+                        table.version = expected
+                    elif self._retire(table.table_id):
+                        stale.append(table.table_id)
+                
+                # 写回期间没有新编辑的表格，ETag恢复为全局版本号
+                dirty_ids = {table.table_id for table in list(self._tables.values()) + self._retired if table.dirty}
+                version_counter.release(*[
+                    coordinate_version_key(table_id)
+                    for table_id in {table.table_id for table, _, _, _ in pending} - dirty_ids
+                ])
+            
+            if stale:
+                logger.info("写回期间表格被其他途径修改，移出内存: %s", stale)
+                self._wake.set()
+            
+            # 步骤4：已写回的日志不再需要
+            _remove(self.flushing_path)
+            
+            logger.debug("内存表格写回 %s 个格子", len(rows) - len(conflicts))
+            return len(rows) - len(conflicts)
+    
+    def recover(self) -> None:
+        """
+        重放持有者已退出的日志（含本进程号上一次运行留下的日志）
+        
+        持有者的锁文件可获取说明其进程已退出；仍在运行的进程的日志不处理。
+        """
+        for journal_path in self._journal_paths():
+            own = journal_path == self.journal_path
+            lock_fd = None if own else _lock_journal(f"{journal_path}.lock", blocking=False)
+            if not own and lock_fd is None:
+                continue
+            try:
+                self._replay(journal_path)
+            finally:
+                if lock_fd is not None:
+                    _remove(f"{journal_path}.lock")
+                    os.close(lock_fd)
+    
+    def _replay(self, journal_path: str) -> None:
+        """重放一个进程的日志并删除（按坐标ID以最后一条为准）"""
+        paths = (f"{journal_path}.flushing", journal_path)
+        rows: Dict[int, Dict[str, Any]] = {}
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        # 崩溃时写了一半的末行
+                        continue
+                    rows[row['id']] = row
+        
+        if rows:
+            self._write(list(rows.values()), list(rows), checked=False)
+            logger.info("重放内存表格日志 %s 个格子: %s", len(rows), journal_path)
+        
+        for path in paths:
+            _remove(path)
+    
+    def _bind_journal(self, pid: int) -> None:
+        """确定本进程的日志、待写回日志与锁文件路径"""
+        self.journal_path = f"{self.journal_prefix}.{pid}"
+        self.flushing_path = f"{self.journal_path}.flushing"
+        self.lock_path = f"{self.journal_path}.lock"
+    
+    def _journal_paths(self) -> List[str]:
+        """日志目录中各进程的日志路径（含旧版不带进程号的日志）"""
+        directory = os.path.dirname(self.journal_prefix) or "."
+        if not os.path.isdir(directory):
+            return []
+        prefix = os.path.basename(self.journal_prefix)
+        pattern = re.compile(rf"{re.escape(prefix)}(\.\d+)?(?:\.flushing|\.lock)?")
+        paths = set()
+        for name in os.listdir(directory):
+            match = pattern.fullmatch(name)
+            if match:
+                paths.add(f"{self.journal_prefix}{match.group(1) or ''}")
+        return sorted(paths)
+    
+    @staticmethod
+    def _checked_row(table: HotTable, i: int, base: Dict[int, Tuple[int, str, Optional[str], int]]) -> Dict[str, Any]:
+        """待写回的格子及其写回条件（调用方持有锁）"""
+        row = table.row(i)
+        row['base_color'], row['base_position'], row['base_voc'], row['base_repeated'] = base.get(i) or table.stored(i)
+        return row
+    
+    def _write(
+        self,
+        rows: List[Dict[str, Any]],
+        moved_ids: List[int],
+        checked: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        在单个事务中写回格子，清除受影响表格的导入摘要
+        
+        Args:
+            rows: 待写回的格子
+            moved_ids: 位置发生变化的坐标ID
+            checked: 是否按加载时的值条件写回（重放日志时无条件写回）
+        
+        Returns:
+            Tuple[List[Dict], Dict[str, int]]: 数据库中已被其他途径修改、未写回的格子，及提交后各表格的全局版本号
+        """
+        db = SessionLocal()
+        try:
+            conflicts = []
+            if not checked:
+                if moved_ids:
+                    db.execute(PARK_POSITION_SQL, [{"id": coordinate_id} for coordinate_id in moved_ids])
+                db.execute(WRITE_CELL_SQL, rows)
+            else:
+                # 逐行条件更新，影响0行即冲突
+                parked = set()
+                moved = set(moved_ids)
+                for row in rows:
+                    if row['id'] not in moved:
+                        continue
+                    if db.execute(CHECKED_PARK_POSITION_SQL, row).rowcount:
+                        parked.add(row['id'])
+                    else:
+                        conflicts.append(row)
+                conflict_ids = {row['id'] for row in conflicts}
+                for row in rows:
+                    if row['id'] in conflict_ids:
+                        continue
+                    expected_position = f"#{row['id']}" if row['id'] in parked else row['base_position']
+                    if not db.execute(CHECKED_WRITE_CELL_SQL, dict(row, expected_position=expected_position)).rowcount:
+                        conflicts.append(row)
+            
+            table_ids = {row['table_id'] for row in rows}
+            db.query(ImportDigest).filter(
+                ImportDigest.table_id.in_(table_ids)
+            ).delete(synchronize_session=False)
+            mark_changed(db, *[coordinate_version_key(table_id) for table_id in table_ids])
+            db.commit()
+            return conflicts, get_committed_versions(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def _discard(self, conflicts: List[Dict[str, Any]]) -> None:
+        """
+        写回冲突的表格移出内存，之后的读写走数据库路径
+        
+        Args:
+            conflicts: 未写回的格子
+        """
+        table_ids = sorted({row['table_id'] for row in conflicts})
+        logger.warning(
+            "内存表格写回冲突 %s 个格子（数据库中的行已被其他途径修改），以数据库为准，移出表格: %s",
+            len(conflicts), table_ids
+        )
+        with self._lock:
+            retired = [table_id for table_id in table_ids if self._retire(table_id)]
+        if retired and self._retired:
+            # 冲突后的编辑留待下次写回（同样按条件写回）
+            self._wake.set()
+    
+    def _retire(self, table_id: int) -> bool:
+        """将表格移出内存，脏数据留待写回（调用方持有锁）"""
+        table = self._tables.pop(table_id, None)
+        if table is None:
+            return False
+        for coordinate_id in table.index:
+            self._owner.pop(coordinate_id, None)
+        if table.dirty:
+            self._retired.append(table)
+        return True
+    
+    def _append_journal(self, row: Dict[str, Any]) -> None:
+        """追加日志并写入操作系统缓冲（调用方持有锁）"""
+        if self._journal is None:
+            directory = os.path.dirname(self.journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._journal.flush()
+    
+    def _rotate_journal(self) -> None:
+        """将当前日志转为待写回日志（调用方持有锁）"""
+        self._close_journal()
+        if not os.path.exists(self.journal_path):
+            return
+        if os.path.exists(self.flushing_path):
+            # 上次写回失败：保留原日志，按顺序追加
+            with open(self.journal_path, 'rb') as source, open(self.flushing_path, 'ab') as target:
+                target.write(source.read())
+            os.remove(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.flushing_path)
+    
+    def _close_journal(self) -> None:
+        """关闭日志文件（调用方持有锁）"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def _run(self) -> None:
+        """后台写回循环"""
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("内存表格写回线程错误: %s", e)
+
+
+def _lock_journal(lock_path: str, blocking: bool) -> Optional[int]:
+    """
+    获取日志锁文件的排他锁
+    
+    持有者退出时删除锁文件：获取到的锁所在文件已被删除或替换时重新打开。
+    
+    Args:
+        lock_path: 锁文件路径
+        blocking: 是否等待其他持有者释放
+    
+    Returns:
+        Optional[int]: 持有锁的文件描述符，非阻塞且锁被其他进程持有时返回None
+    """
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    while True:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        try:
+            current = os.stat(lock_path).st_ino == os.fstat(fd).st_ino
+        except FileNotFoundError:
+            current = False
+        if current:
+            return fd
+        os.close(fd)
+
+
+def _remove(path: str) -> None:
+    """删除文件，不存在时忽略"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# 全局写回存储实例
+hot_grid_store = HotGridStore(
+    enabled=settings.write_behind_enabled,
+    flush_interval_ms=settings.write_behind_flush_interval_ms,
+    max_dirty=settings.write_behind_max_dirty,
+    max_tables=settings.write_behind_max_tables,
+    journal_path=settings.write_behind_journal_path
+)
\ No newline at end of file
@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ImportJob Service业务逻辑（后台坐标导入任务）
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..config.database import SessionLocal
+from ..config.settings import settings
+from ..models.import_digest import ImportDigest
+from ..models.import_job import ImportJob
+from ..models.import_staging import ImportStaging
+from ..models.table import Table
+from ..schemas.import_job import ImportJobResponse
+from ..tool import CorParser, ValidationReport, generate_id, mark_changed, coordinate_version_key, timed_service, record_import
+from .coordinate import upsert_coordinates, WRITE_CHUNK_SIZE
+from .exceptions import BusinessException
+from .hot_grid import hot_grid_store
+
+
+logger = logging.getLogger(__name__)
+
+# 任务状态
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+JOB_STATUS_CANCELLED = "cancelled"
+
+# 未结束的任务状态
+ACTIVE_JOB_STATUSES = (JOB_STATUS_PENDING, JOB_STATUS_RUNNING)
+
+# 收尾删除SQL：表格中未出现在本次导入位置集合里的格子（反连接，不加载到内存）
+DELETE_UNSEEN_SQL = text("""
+    DELETE FROM coordinate
+    WHERE table_id = :table_id
+      AND NOT EXISTS (
+          SELECT 1 FROM import_staging
+          WHERE import_staging.job_id = :job_id AND import_staging.position = coordinate.position
+      )
+""")
+
+# 全局导入线程池（有界）
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# 本进程的执行者标识：进程号相同（如容器内重启）时以启动ID区分
+_BOOT_ID = uuid.uuid4().hex[:12]
+_HOSTNAME = socket.gethostname()
+
+
+def process_owner() -> str:
+    """本进程的任务执行者标识（主机:进程号:启动ID）"""
+    return f"{_HOSTNAME}:{os.getpid()}:{_BOOT_ID}"
+
+
+def _owner_alive(owner: Optional[str]) -> Optional[bool]:
+    """
+    判断任务执行者是否存活
+    
+    Args:
+        owner: 任务记录的执行者标识
+    
+    Returns:
+        Optional[bool]: 存活True，已退出False，其他主机或无法判断时None（由心跳超时判断）
+    """
+    if not owner:
+        return None
+    if owner == process_owner():
+        return True
+    try:
+        host, pid, _ = owner.rsplit(":", 2)
+        pid = int(pid)
+    except ValueError:
+        return None
+    if host != _HOSTNAME:
+        return None
+    if pid == os.getpid():
+        # 同一进程号、不同启动ID：上一次运行的本进程
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # 进程存在但无权限发送信号
+        return True
+    return True
+
+
+def get_import_executor() -> ThreadPoolExecutor:
+    """获取全局导入线程池"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.import_max_workers,
+                thread_name_prefix="import-job"
+            )
+        return _executor
+
+
+def shutdown_import_executor() -> None:
+    """关闭任务监控与导入线程池，未开始的任务保留pending状态，重启后恢复执行"""
+    global _executor
+    import_job_monitor.stop()
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _flush_batch(
+    db: Session,
+    job_id: int,
+    table_id: int,
+    batch: List[Dict[str, Any]],
+    progress: Dict[str, int],
+    report: ValidationReport
+) -> bool:
+    """
+    按位置upsert一批坐标并在同一事务中更新任务进度与校验报告
+    
+    Args:
+        db: 数据库会话
+        job_id: 任务ID
+        table_id: 表格ID
+        batch: 坐标数据批次
+        progress: 进度计数（parsed/inserted/rejected）
+        report: 校验报告
+    
+    Returns:
+        bool: 任务仍在运行返回True，已被取消返回False
+    """
+    written = upsert_coordinates(db, batch)
+    _stage_positions(db, job_id, batch)
+    
+    db.query(ImportJob).filter(ImportJob.id == job_id).update({
+        ImportJob.parsed: progress["parsed"],
+        ImportJob.inserted: progress["inserted"] + written,
+        ImportJob.rejected: progress["rejected"],
+        ImportJob.report: json.dumps(report.to_dict(), ensure_ascii=False),
+        ImportJob.update_time: func.now()
+    }, synchronize_session=False)
+    
+    # 写入后已持有SQLite写锁，此时读取的状态与提交一致
+    if not _is_running(db, job_id):
+        db.rollback()
+        return False
+    
+    if written:
+        mark_changed(db, coordinate_version_key(table_id))
+    db.commit()
+    progress["inserted"] += written
+    return True
+
+
+def _stage_positions(db: Session, job_id: int, batch: List[Dict[str, Any]]) -> None:
+    """
+    记录本批次的位置（与批次同一事务，文件中重复的位置只记一次）
+    
+    Args:
+        db: 数据库会话
+        job_id: 任务ID
+        batch: 坐标数据批次
+    """
+    if not batch:
+        return
+    stmt = sqlite_insert(ImportStaging.__table__).on_conflict_do_nothing()
+    rows = [{"job_id": job_id, "position": row["position"]} for row in batch]
+    for i in range(0, len(rows), WRITE_CHUNK_SIZE):
+        db.execute(stmt, rows[i:i + WRITE_CHUNK_SIZE])
+
+
+def _clear_staging(db: Session, job_id: int) -> None:
+    """删除任务的位置记录并提交（任务结束、取消或失败后不再续传）"""
+    db.query(ImportStaging).filter(ImportStaging.job_id == job_id).delete(synchronize_session=False)
+    db.commit()
+
+
+def _is_running(db: Session, job_id: int) -> bool:
+    """检查任务是否仍为running状态且仍由本进程执行（被重置接管后不再写入）"""
+    row = db.query(ImportJob.status, ImportJob.owner).filter(ImportJob.id == job_id).first()
+    return row is not None and row.status == JOB_STATUS_RUNNING and row.owner == process_owner()
+
+
+def _finish_job(db: Session, job_id: int, message: str) -> bool:
+    """
+    标记任务成功并提交当前事务，任务已被取消时回滚
+    
+    Returns:
+        bool: 标记成功返回True
+    """
+    finished = db.query(ImportJob).filter(
+        ImportJob.id == job_id,
+        ImportJob.status == JOB_STATUS_RUNNING,
+        ImportJob.owner == process_owner()
+    ).update({
+        ImportJob.status: JOB_STATUS_SUCCEEDED,
+        ImportJob.message: message,
+        ImportJob.update_time: func.now()
+    }, synchronize_session=False)
+    
+    if not finished:
+        db.rollback()
+        return False
+    
+    db.commit()
+    return True
+
+
+def run_import_job(job_id: int) -> None:
+    """
+    执行导入任务（在线程池中运行）
+    
+    坐标按(table_id, position)upsert，每批与任务进度、校验报告、位置记录在同一事务中提交，
+    parsed记录已处理的行号，任务中断后从该行之后继续导入。
+    收尾时以位置记录反连接删除文件中已不存在的格子，内存占用与批次大小相关；
+    文件中没有有效格子（空文件或全部行无效）时不删除，保留已有坐标（与同步导入一致）。
+    文件内容与上次导入一致时不做写入。
+    
+    Args:
+        job_id: 任务ID
+    """
+    db = SessionLocal()
+    try:
+        # 任务认领：仅pending状态可被认领，多进程下只有一个执行者，记录执行者标识
+        claimed = db.query(ImportJob).filter(
+            ImportJob.id == job_id,
+            ImportJob.status == JOB_STATUS_PENDING
+        ).update({
+            ImportJob.status: JOB_STATUS_RUNNING,
+            ImportJob.owner: process_owner(),
+            ImportJob.update_time: func.now()
+        }, synchronize_session=False)
+        db.commit()
+        if not claimed:
+            return
+        
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        table_id = job.table_id
+        resume_line = job.parsed
+        progress = {"parsed": job.parsed, "inserted": job.inserted, "rejected": job.rejected}
+        report = ValidationReport.from_dict(
+            json.loads(job.report) if job.report else None,
+            settings.import_report_max_samples
+        )
+        
+        # 幂等检查：文件内容与该表格上次导入一致时直接完成
+        content_hash = CorParser.file_digest(settings.cor_file_path)
+        digest = db.query(ImportDigest).filter(ImportDigest.table_id == table_id).first()
+        if digest and digest.content_hash == content_hash:
+            _finish_job(db, job_id, "cor.txt内容未变化，无需导入")
+            logger.info("导入任务跳过，文件内容未变化: job_id=%s", job_id)
+            return
+        
+        logger.info("开始执行导入任务: job_id=%s, table_id=%s, 起始行: %s", job_id, table_id, resume_line + 1)
+        
+        # 内存表格先写回并移出，导入直接修改数据库
+        hot_grid_store.evict(table_id)
+        started = time.perf_counter()
+        
+        batch = []
+        with open(settings.cor_file_path, 'r', encoding='utf-8') as file:
+            for line_num, line in enumerate(file, 1):
+                line = line.strip()
+                if not line:
+                    if line_num > resume_line:
+                        progress["parsed"] = line_num
+                        report.add(line_num, line, None)
+                    continue
+                
+                reason, position, color_int = CorParser.parse_line(line)
+                
+                # 断点续传：已提交的行及其位置记录已在数据库中
+                if line_num <= resume_line:
+                    continue
+                
+                progress["parsed"] = line_num
+                report.add(line_num, line, reason)
+                if reason is not None:
+                    progress["rejected"] += 1
+                    continue
+                
+                batch.append({
+                    'id': generate_id(),
+                    'table_id': table_id,
+                    'position': position,
+                    'color': color_int,
+                    'voc': '',
+                    'repeated': 0
+                })
+                
+                if len(batch) >= settings.import_batch_size:
+                    if not _flush_batch(db, job_id, table_id, batch, progress, report):
+                        logger.info("导入任务已取消: job_id=%s", job_id)
+                        _clear_staging(db, job_id)
+                        return
+                    batch = []
+        
+        if not _flush_batch(db, job_id, table_id, batch, progress, report):
+            logger.info("导入任务已取消: job_id=%s", job_id)
+            _clear_staging(db, job_id)
+            return
+        
+        # 没有有效格子：不执行反连接删除（否则清空整个表格），不记录文件摘要
+        if report.accepted == 0:
+            if _finish_job(db, job_id, "cor.txt中没有有效坐标，保留已有坐标"):
+                logger.warning("导入任务没有有效坐标，保留已有坐标: job_id=%s, 拒绝: %s", job_id, progress['rejected'])
+            else:
+                logger.info("导入任务已取消: job_id=%s", job_id)
+            _clear_staging(db, job_id)
+            return
+        
+        # 收尾：删除文件中已不存在的格子并记录文件摘要，与完成状态同一事务提交
+        removed = db.execute(DELETE_UNSEEN_SQL, {"table_id": table_id, "job_id": job_id}).rowcount
+        if removed:
+            mark_changed(db, coordinate_version_key(table_id))
+        cell_count = db.query(func.count()).select_from(ImportStaging).filter(
+            ImportStaging.job_id == job_id
+        ).scalar()
+        db.query(ImportStaging).filter(ImportStaging.job_id == job_id).delete(synchronize_session=False)
+        db.merge(ImportDigest(
+            table_id=table_id,
+            content_hash=content_hash,
+            cell_count=cell_count
+        ))
+        
+        if not _finish_job(db, job_id, "导入完成"):
+            logger.info("导入任务已取消: job_id=%s", job_id)
+            _clear_staging(db, job_id)
+            return
+        
+        record_import("job", progress["parsed"] - resume_line, time.perf_counter() - started)
+        logger.info("导入任务完成: job_id=%s, 写入: %s, 删除: %s, 拒绝: %s", job_id, progress['inserted'], removed, progress['rejected'])
+    
+    except Exception as e:
+        db.rollback()
+        logger.error("导入任务执行错误: job_id=%s, %s", job_id, e)
+        try:
+            db.query(ImportJob).filter(ImportJob.id == job_id).update({
+                ImportJob.status: JOB_STATUS_FAILED,
+                ImportJob.message: str(e)[:1000],
+                ImportJob.update_time: func.now()
+            }, synchronize_session=False)
+            db.commit()
+            _clear_staging(db, job_id)
+        except SQLAlchemyError as status_error:
+            db.rollback()
+            logger.error("导入任务状态更新失败: job_id=%s, %s", job_id, status_error)
+    finally:
+        db.close()
+
+
+def reset_orphaned_jobs(db: Session) -> List[int]:
+    """
+    将执行者已退出的running任务重置为pending（不提交）
+    
+    同一主机上执行进程已退出（或为上一次启动的本进程）的任务立即重置；
+    无法判断执行者存活的任务（其他主机、旧任务无执行者标识）按心跳超时判断。
+    
+    Args:
+        db: 数据库会话
+    
+    Returns:
+        List[int]: 重置的任务ID
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.import_stale_seconds)
+    orphaned = []
+    for job_id, owner, update_time in db.query(
+        ImportJob.id, ImportJob.owner, ImportJob.update_time
+    ).filter(ImportJob.status == JOB_STATUS_RUNNING):
+        alive = _owner_alive(owner)
+        if alive is False or (alive is None and update_time < stale_before):
+            orphaned.append(job_id)
+    
+    if orphaned:
+        db.query(ImportJob).filter(
+            ImportJob.id.in_(orphaned),
+            ImportJob.status == JOB_STATUS_RUNNING
+        ).update({
+            ImportJob.status: JOB_STATUS_PENDING,
+            ImportJob.owner: None
+        }, synchronize_session=False)
+    return orphaned
+
+
+def _heartbeat(db: Session) -> int:
+    """
+    刷新本进程正在执行的任务的心跳（不提交）
+    
+    Returns:
+        int: 刷新的任务数
+    """
+    return db.query(ImportJob).filter(
+        ImportJob.status == JOB_STATUS_RUNNING,
+        ImportJob.owner == process_owner()
+    ).update({
+        ImportJob.update_time: func.now()
+    }, synchronize_session=False)
+
+
+class ImportJobMonitor:
+    """
+    导入任务监控线程：定期刷新本进程任务的心跳，重置并重新提交执行者已退出的任务
+    
+    启动时恢复只执行一次，运行期间其他进程退出留下的running任务由监控线程接管。
+    """
+    
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def interval_seconds(self) -> float:
+        """检查间隔：心跳超时的三分之一"""
+        return max(1.0, settings.import_stale_seconds / 3)
+    
+    def start(self) -> None:
+        """启动监控线程（已启动时不重复启动）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="import-job-monitor", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """停止监控线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    def _run(self) -> None:
+        """监控循环，单次检查失败不影响后续检查"""
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error("导入任务监控检查失败: %s", e)
+    
+    def check(self) -> List[int]:
+        """
+        执行一次检查：刷新心跳、重置孤儿任务并重新提交
+        
+        Returns:
+            List[int]: 重新提交的任务ID
+        """
+        db = SessionLocal()
+        try:
+            _heartbeat(db)
+            orphaned = reset_orphaned_jobs(db)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        
+        if orphaned:
+            executor = get_import_executor()
+            for job_id in orphaned:
+                executor.submit(run_import_job, job_id)
+            logger.info("接管执行者已退出的导入任务 %s 个", len(orphaned))
+        return orphaned
+
+
+# 全局导入任务监控
+import_job_monitor = ImportJobMonitor()
+
+
+def recover_import_jobs() -> int:
+    """
+    恢复未完成的导入任务并启动任务监控（应用启动时调用）
+    
+    执行者已退出的running任务重置为pending，与其余pending任务一起重新提交。
+    
+    Returns:
+        int: 重新提交的任务数量
+    """
+    db = SessionLocal()
+    try:
+        reset_orphaned_jobs(db)
+        db.commit()
+        
+        pending_ids = [
+            job_id for (job_id,) in db.query(ImportJob.id).filter(
+                ImportJob.status == JOB_STATUS_PENDING
+            ).order_by(ImportJob.create_time).all()
+        ]
+        
+        executor = get_import_executor()
+        for job_id in pending_ids:
+            executor.submit(run_import_job, job_id)
+        
+        if pending_ids:
+            logger.info("恢复导入任务 %s 个", len(pending_ids))
+        return len(pending_ids)
+    
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error("恢复导入任务数据库错误: %s", e)
+        return 0
+    finally:
+        db.close()
+        import_job_monitor.start()
+
+
+@timed_service
+class ImportJobService:
+    """ImportJob服务类"""
+    
+    def __init__(self, db: Session = None):
+        """初始化ImportJob服务
+        
+        Args:
+            db: 数据库会话
+        """
+        self.db = db
+    
+    async def submit_job(self, table_id: int) -> ImportJobResponse:
+        """
+        提交导入任务
+        
+        Args:
+            table_id: 表格ID
+        
+        Returns:
+            ImportJobResponse: 新建的任务信息
+        
+        Raises:
+            BusinessException: 表格不存在、文件不存在或任务队列已满
+        """
+        try:
+            # 数据验证：验证table_id存在性
+            table = self.db.query(Table).filter(Table.id == table_id).first()
+            if not table:
+                raise BusinessException(f"ID为 {table_id} 的表格不存在")
+            
+            if not os.path.exists(settings.cor_file_path):
+                raise BusinessException("cor.txt文件不存在")
+            
+            # 队列限制：未结束的任务数量超过上限时拒绝提交
+            active_count = self.db.query(ImportJob).filter(
+                ImportJob.status.in_(ACTIVE_JOB_STATUSES)
+            ).count()
+            if active_count >= settings.import_max_pending:
+                raise BusinessException(f"导入任务队列已满，当前未完成任务: {active_count}")
+            
+            # 对象创建：任务持久化后再提交到线程池
+            job = ImportJob(
+                id=generate_id(),
+                table_id=table_id,
+                status=JOB_STATUS_PENDING
+            )
+            self.db.add(job)
+            self.db.commit()
+            
+            get_import_executor().submit(run_import_job, job.id)
+            
+            logger.info("提交导入任务: job_id=%s, table_id=%s", job.id, table_id)
+            
+            return ImportJobResponse.model_validate(job)
+        
+        except BusinessException:
+            # 业务异常直接抛出
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            # 数据库回滚
+            self.db.rollback()
+            logger.error("提交导入任务数据库错误: %s", e)
+            raise BusinessException("提交导入任务失败", str(e))
+        except Exception as e:
+            # 数据库回滚
+            self.db.rollback()
+            logger.error("提交导入任务业务错误: %s", e)
+            raise BusinessException("提交导入任务失败", str(e))
+    
+    async def find_job(self, job_id: int) -> ImportJobResponse:
+        """
+        查询导入任务进度
+        
+        Args:
+            job_id: 任务ID
+        
+        Returns:
+            ImportJobResponse: 任务信息
+        
+        Raises:
+            BusinessException: 任务不存在或查询失败
+        """
+        try:
+            job = self.db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            if not job:
+                raise BusinessException(f"ID为 {job_id} 的导入任务不存在")
+            
+            return ImportJobResponse.model_validate(job)
+        
+        except BusinessException:
+            raise
+        except SQLAlchemyError as e:
+            logger.error("查询导入任务数据库错误: %s", e)
+            raise BusinessException("查询导入任务失败", str(e))
+        except Exception as e:
+            logger.error("查询导入任务业务错误: %s", e)
+            raise BusinessException("查询导入任务失败", str(e))
+    
+    async def cancel_job(self, job_id: int) -> ImportJobResponse:
+        """
+        取消导入任务（已提交的批次保留）
+        
+        Args:
+            job_id: 任务ID
+        
+        Returns:
+            ImportJobResponse: 任务信息
+        
+        Raises:
+            BusinessException: 任务不存在或取消失败
+        """
+        try:
+            job = self.db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            if not job:
+                raise BusinessException(f"ID为 {job_id} 的导入任务不存在")
+            
+            # 状态更新：仅未结束的任务可取消，执行线程在下一批次提交前感知
+            if job.status in ACTIVE_JOB_STATUSES:
+                job.status = JOB_STATUS_CANCELLED
+                job.message = "任务已取消"
+                self.db.commit()
+                logger.info("取消导入任务: job_id=%s", job_id)
+            
+            return ImportJobResponse.model_validate(job)
+        
+        except BusinessException:
+            # 业务异常直接抛出
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            # 数据库回滚
+            self.db.rollback()
+            logger.error("取消导入任务数据库错误: %s", e)
+            raise BusinessException("取消导入任务失败", str(e))
+        except Exception as e:
+            # 数据库回滚
+            self.db.rollback()
+            logger.error("取消导入任务业务错误: %s", e)
+            raise BusinessException("取消导入任务失败", str(e))
\ No newline at end of file
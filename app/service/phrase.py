@@ -15,13 +15,14 @@ from ..models.text_info import TextInfo
 from ..models.phrase import Phrase
 from ..schemas.phrase import PhraseResponse
 from ..schemas.text_info import TextInfoColorUpdate
-from ..tool import TextProcessor, generate_id
+from ..tool import TextProcessor, generate_id, mark_changed, TEXT_INFO_VERSION_KEY, PHRASE_VERSION_KEY, timed_service
 from .exceptions import BusinessException
 
 
 logger = logging.getLogger(__name__)
 
 
+@timed_service
 class PhraseService:
     """Phrase服务类"""
     
@@ -110,9 +111,10 @@ class PhraseService:
             
             # 关联更新：更新TextInfo.text字段
             text_info.text = new_text
+            mark_changed(self.db, PHRASE_VERSION_KEY, TEXT_INFO_VERSION_KEY)
             self.db.commit()
             
-            logger.info(f"成功添加 {len(new_phrases)} 个词汇到TextInfo ID: {text_info_id}")
+            logger.info("成功添加 %s 个词汇到TextInfo ID: %s", len(new_phrases), text_info_id)
             
             # 结果返回：数据组装
             return {
@@ -131,12 +133,12 @@ class PhraseService:
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"添加词汇数据库错误: {str(e)}")
+            logger.error("添加词汇数据库错误: %s", e)
             raise BusinessException("添加词汇失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"添加词汇业务错误: {str(e)}")
+            logger.error("添加词汇业务错误: %s", e)
             raise BusinessException("添加词汇失败", str(e))
     
     async def delete_phrase(self, text_info_data: TextInfoColorUpdate) -> Dict[str, Any]:
@@ -174,6 +176,7 @@ class PhraseService:
             if not deleted_blocks:
                 # 更新文本但没有删除词汇
                 text_info.text = new_text
+                mark_changed(self.db, TEXT_INFO_VERSION_KEY)
                 self.db.commit()
                 return {"message": "文本已更新，但没有删除词汇"}
             
@@ -246,9 +249,10 @@ class PhraseService:
             
             # 更新当前TextInfo.text
             text_info.text = new_text
+            mark_changed(self.db, PHRASE_VERSION_KEY, TEXT_INFO_VERSION_KEY)
             self.db.commit()
             
-            logger.info(f"成功删除词汇，TextInfo ID: {text_info_id}")
+            logger.info("成功删除词汇，TextInfo ID: %s", text_info_id)
             
             # 差异化返回
             if updated_text_infos:
@@ -266,12 +270,12 @@ class PhraseService:
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"删除词汇数据库错误: {str(e)}")
+            logger.error("删除词汇数据库错误: %s", e)
             raise BusinessException("删除词汇失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"删除词汇业务错误: {str(e)}")
+            logger.error("删除词汇业务错误: %s", e)
             raise BusinessException("删除词汇失败", str(e))
     
     async def list_phrases(self, color: Optional[int] = None) -> Dict[str, Any]:
@@ -311,7 +315,7 @@ class PhraseService:
                 PhraseResponse.model_validate(phrase) for phrase in phrases
             ]
             
-            logger.info(f"查询到 {len(phrase_responses)} 个词汇")
+            logger.info("查询到 %s 个词汇", len(phrase_responses))
             
             # 结果返回
             return {
@@ -320,8 +324,8 @@ class PhraseService:
             }
             
         except SQLAlchemyError as e:
-            logger.error(f"查询词汇数据库错误: {str(e)}")
+            logger.error("查询词汇数据库错误: %s", e)
             raise BusinessException("查询词汇失败", str(e))
         except Exception as e:
-            logger.error(f"查询词汇业务错误: {str(e)}")
+            logger.error("查询词汇业务错误: %s", e)
             raise BusinessException("查询词汇失败", str(e))
\ No newline at end of file
@@ -4,20 +4,117 @@
 Table Service业务逻辑
 """
 
+import base64
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import String, func, literal, text, tuple_, type_coerce
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from ..models.table import Table
+from ..models.coordinate import Coordinate
+from ..models.import_digest import ImportDigest
 from ..schemas.table import TableCreate, TableResponse, TableUpdate, TableListResponse
-from ..tool import generate_id
+from ..tool import generate_id, reserve_ids, get_id_generator, mark_changed, coordinate_version_key, TABLE_VERSION_KEY, timed_service
 from .exceptions import BusinessException
+from .hot_grid import hot_grid_store
+from .write_queue import write_queue
 
 
 logger = logging.getLogger(__name__)
 
+# 表格列表分页大小
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
 
+# 坐标复制SQL：数据库内INSERT … SELECT，按预留区间重新映射雪花ID
+CLONE_COORDINATES_SQL = text("""
+    INSERT INTO coordinate (id, table_id, color, position, voc, repeated)
+    SELECT ((:base + (rn - 1) / :sequence_size) << :timestamp_shift) | :machine_part | ((rn - 1) % :sequence_size),
+           :new_table_id, color, position, voc, repeated
+    FROM (
+        SELECT ROW_NUMBER() OVER (ORDER BY id) AS rn, color, position, voc, repeated
+        FROM coordinate
+        WHERE table_id = :source_table_id
+    )
+""")
+
+
+def encode_page_cursor(create_time: str, table_id: int) -> str:
+    """
+    键集分页游标：上一页最后一行的(create_time, id)
+    
+    create_time使用数据库中的原始存储值，与列比较时不经过日期格式转换。
+    
+    Args:
+        create_time: 创建时间原始存储值
+        table_id: 表格ID
+        
+    Returns:
+        str: URL安全的游标
+    """
+    return base64.urlsafe_b64encode(f"{create_time}|{table_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    解析键集分页游标
+    
+    Args:
+        cursor: encode_page_cursor生成的游标
+        
+    Returns:
+        Tuple[str, int]: (create_time原始存储值, id)
+        
+    Raises:
+        ValueError: 游标无效
+    """
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        create_time, table_id = decoded.rsplit("|", 1)
+        return create_time, int(table_id)
+    except Exception:
+        raise ValueError(f"无效的分页游标: {cursor}")
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE前缀匹配模式（转义%、_与转义符本身）"""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def apply_table_update(db: Session, table_update: TableUpdate) -> Dict[str, str]:
+    """
+    在会话中更新表格（不提交）
+    
+    Args:
+        db: 数据库会话
+        table_update: 表格更新数据
+        
+    Returns:
+        Dict: 包含message的字典
+        
+    Raises:
+        BusinessException: 表格不存在
+    """
+    # 数据获取：通过ID查询Table记录
+    existing_table = db.query(Table).filter(
+        Table.id == table_update.id
+    ).first()
+    
+    # 存在性验证：检查Table是否存在
+    if not existing_table:
+        raise BusinessException(f"ID为 {table_update.id} 的表格不存在")
+    
+    # 数据操作：更新字段
+    existing_table.name = table_update.name
+    mark_changed(db, TABLE_VERSION_KEY)
+    
+    return {"message": "更新成功"}
+
+
+@timed_service
 class TableService:
     """Table服务类"""
     
@@ -55,10 +152,11 @@ class TableService:
             
             # 数据操作：数据库插入
             self.db.add(new_table)
+            mark_changed(self.db, TABLE_VERSION_KEY)
             self.db.commit()
             
             # 日志记录：记录表格创建时间
-            logger.info(f"成功创建表格: ID={table_id}, name='{table_data.name}', create_time={new_table.create_time}")
+            logger.info("成功创建表格: ID=%s, name='%s', create_time=%s", table_id, table_data.name, new_table.create_time)
             
             # 结果返回：返回创建的Table对象
             return TableResponse.model_validate(new_table)
@@ -66,43 +164,82 @@ class TableService:
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"创建表格数据库错误: {str(e)}")
+            logger.error("创建表格数据库错误: %s", e)
             raise BusinessException("创建表格失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"创建表格业务错误: {str(e)}")
+            logger.error("创建表格业务错误: %s", e)
             raise BusinessException("创建表格失败", str(e))
     
-    async def get_table_page(self) -> TableListResponse:
+    async def get_table_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        with_total: bool = False
+    ) -> TableListResponse:
         """
-        查询表格列表
+        分页查询表格列表（按创建时间降序，(create_time, id)键集分页）
+        
+        排序、游标条件与名称过滤均在覆盖索引上完成，翻页耗时与页码无关。
         
+        Args:
+            limit: 每页数量
+            cursor: 上一页返回的next_cursor，为空时查询第一页
+            name_prefix: 名称前缀过滤（不区分大小写）
+            with_total: 是否返回符合条件的总数
+            
         Returns:
-            TableListResponse: 表格列表响应
+            TableListResponse: 表格列表响应（含下一页游标）
             
         Raises:
+            ValueError: 游标无效
             BusinessException: 查询表格失败
         """
+        after = decode_page_cursor(cursor) if cursor else None
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        
         try:
-            # 数据获取：查询所有Table记录，按创建时间降序排列
-            tables = self.db.query(Table).order_by(Table.create_time.desc()).all()
+            # 条件构建：名称前缀过滤
+            conditions = []
+            if name_prefix:
+                conditions.append(Table.name.like(_like_prefix(name_prefix), escape="\\"))
             
-            logger.info(f"查询到 {len(tables)} 个表格")
+            # 数据获取：游标之后的一页，多取一行判断是否有下一页
+            create_key = type_coerce(Table.create_time, String).label("create_key")
+            query = self.db.query(Table.id, Table.name, Table.create_time, create_key).filter(*conditions)
+            if after:
+                query = query.filter(
+                    tuple_(Table.create_time, Table.id) < tuple_(literal(after[0], String), literal(after[1]))
+                )
+            rows = query.order_by(Table.create_time.desc(), Table.id.desc()).limit(limit + 1).all()
             
-            # 结果返回：转换为响应对象
-            table_responses = [TableResponse.model_validate(table) for table in tables]
+            # 下一页游标：本页最后一行
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_page_cursor(rows[-1].create_key, rows[-1].id)
+            
+            # 总数统计：按需在覆盖索引上计数
+            total = None
+            if with_total:
+                total = self.db.query(func.count(Table.id)).filter(*conditions).scalar()
+            
+            logger.info("查询到 %s 个表格", len(rows))
             
+            # 结果返回：转换为响应对象
             return TableListResponse(
-                tables=table_responses,
-                total=len(table_responses)
+                tables=[TableResponse.model_validate(row) for row in rows],
+                total=total,
+                next_cursor=next_cursor
             )
             
         except SQLAlchemyError as e:
-            logger.error(f"查询表格数据库错误: {str(e)}")
+            logger.error("查询表格数据库错误: %s", e)
             raise BusinessException("查询表格失败", str(e))
         except Exception as e:
-            logger.error(f"查询表格业务错误: {str(e)}")
+            logger.error("查询表格业务错误: %s", e)
             raise BusinessException("查询表格失败", str(e))
     
     async def update_table(self, table_update: TableUpdate) -> Dict[str, str]:
@@ -119,24 +256,15 @@ class TableService:
             BusinessException: 表格不存在或更新失败
         """
         try:
-            # 数据获取：通过ID查询Table记录
-            existing_table = self.db.query(Table).filter(
-                Table.id == table_update.id
-            ).first()
-            
-            # 存在性验证：检查Table是否存在
-            if not existing_table:
-                raise BusinessException(f"ID为 {table_update.id} 的表格不存在")
-            
-            # 数据操作：更新字段
-            existing_table.name = table_update.name
-            
-            # 事务提交
-            self.db.commit()
+            # 事务提交：经写入队列与并发的小写入合并提交
+            result = await write_queue.submit(
+                self.db,
+                lambda db: apply_table_update(db, table_update)
+            )
             
-            logger.info(f"成功更新表格: ID={table_update.id}, new_name='{table_update.name}'")
+            logger.info("成功更新表格: ID=%s, new_name='%s'", table_update.id, table_update.name)
             
-            return {"message": "更新成功"}
+            return result
             
         except BusinessException:
             # 业务异常直接抛出
@@ -145,12 +273,12 @@ class TableService:
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"更新表格数据库错误: {str(e)}")
+            logger.error("更新表格数据库错误: %s", e)
             raise BusinessException("更新表格失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"更新表格业务错误: {str(e)}")
+            logger.error("更新表格业务错误: %s", e)
             raise BusinessException("更新表格失败", str(e))
     
     async def delete_table(self, table_id: int) -> Dict[str, str]:
@@ -176,11 +304,16 @@ class TableService:
             if not existing_table:
                 raise BusinessException(f"ID为 {table_id} 的表格不存在")
             
-            # 数据操作：删除操作（级联删除会自动删除关联的Coordinate记录）
+            # 数据操作：删除操作（级联删除会自动删除关联的Coordinate记录，内存表格先写回并移出）
+            hot_grid_store.evict(table_id)
             self.db.delete(existing_table)
+            self.db.query(ImportDigest).filter(
+                ImportDigest.table_id == table_id
+            ).delete(synchronize_session=False)
+            mark_changed(self.db, TABLE_VERSION_KEY, coordinate_version_key(table_id))
             self.db.commit()
             
-            logger.info(f"成功删除表格: ID={table_id}, name='{existing_table.name}'")
+            logger.info("成功删除表格: ID=%s, name='%s'", table_id, existing_table.name)
             
             return {"message": "删除成功"}
             
@@ -191,10 +324,90 @@ class TableService:
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"删除表格数据库错误: {str(e)}")
+            logger.error("删除表格数据库错误: %s", e)
             raise BusinessException("删除表格失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"删除表格业务错误: {str(e)}")
-            raise BusinessException("删除表格失败", str(e))
\ No newline at end of file
+            logger.error("删除表格业务错误: %s", e)
+            raise BusinessException("删除表格失败", str(e))
+    
+    async def clone_table(self, table_id: int, name: Optional[str] = None) -> TableResponse:
+        """
+        克隆表格（数据库内复制全部坐标）
+        
+        Args:
+            table_id: 源表格ID
+            name: 新表格名称（可选，默认在源名称后追加"副本"）
+            
+        Returns:
+            TableResponse: 新建的表格信息
+            
+        Raises:
+            BusinessException: 表格不存在或克隆失败
+        """
+        try:
+            # 数据获取：通过ID查询源Table记录
+            source_table = self.db.query(Table).filter(
+                Table.id == table_id
+            ).first()
+            
+            # 存在性验证：检查Table是否存在
+            if not source_table:
+                raise BusinessException(f"ID为 {table_id} 的表格不存在")
+            
+            # 内存表格先写回，复制读取的是最新数据
+            hot_grid_store.evict(table_id)
+            
+            # 对象创建：新Table对象，先写入以持有SQLite写锁，保证后续计数与复制一致
+            new_table = Table(
+                id=generate_id(),
+                name=(name or f"{source_table.name}副本")[:255]
+            )
+            self.db.add(new_table)
+            self.db.flush()
+            
+            # ID预留：按坐标数量预留连续雪花ID区间
+            coordinate_count = self.db.query(Coordinate).filter(
+                Coordinate.table_id == table_id
+            ).count()
+            
+            copied_count = 0
+            if coordinate_count:
+                generator = get_id_generator()
+                # 超大区间可能需要等待借用窗口，在线程池中预留，不阻塞事件循环
+                base, machine_part = await run_in_threadpool(reserve_ids, coordinate_count)
+                
+                # 数据操作：单条INSERT … SELECT复制坐标，行数据不经过Python对象
+                result = self.db.execute(CLONE_COORDINATES_SQL, {
+                    "base": base,
+                    "sequence_size": generator.MAX_SEQUENCE + 1,
+                    "timestamp_shift": generator.TIMESTAMP_SHIFT,
+                    "machine_part": machine_part,
+                    "new_table_id": new_table.id,
+                    "source_table_id": table_id
+                })
+                copied_count = result.rowcount
+            
+            # 事务提交
+            mark_changed(self.db, TABLE_VERSION_KEY, coordinate_version_key(new_table.id))
+            self.db.commit()
+            
+            logger.info("成功克隆表格: source_id=%s, new_id=%s, 坐标数量: %s", table_id, new_table.id, copied_count)
+            
+            return TableResponse.model_validate(new_table)
+            
+        except BusinessException:
+            # 业务异常直接抛出
+            self.db.rollback()
+            raise
+        except SQLAlchemyError as e:
+            # 数据库回滚
+            self.db.rollback()
+            logger.error("克隆表格数据库错误: %s", e)
+            raise BusinessException("克隆表格失败", str(e))
+        except Exception as e:
+            # 数据库回滚
+            self.db.rollback()
+            logger.error("克隆表格业务错误: %s", e)
+            raise BusinessException("克隆表格失败", str(e))
\ No newline at end of file
@@ -12,12 +12,73 @@ from sqlalchemy.exc import SQLAlchemyError
 from ..models.text_info import TextInfo
 from ..schemas.text_info import TextInfoResponse, TextInfoUpdate
 from ..config.database import get_db
+from ..tool import mark_changed, generate_id, TEXT_INFO_VERSION_KEY, timed_service
 from .exceptions import BusinessException
+from .write_queue import write_queue
 
 
 logger = logging.getLogger(__name__)
 
+# 颜色编号范围（0-8，每个颜色一条TextInfo）
+TEXT_INFO_COLORS = range(9)
 
+
+def apply_text_info_update(db: Session, text_info_update: TextInfoUpdate) -> TextInfoResponse:
+    """
+    在会话中更新TextInfo（不提交）
+    
+    Args:
+        db: 数据库会话
+        text_info_update: TextInfo更新数据
+        
+    Returns:
+        TextInfoResponse: 更新后的TextInfo响应
+        
+    Raises:
+        BusinessException: 文本信息不存在
+    """
+    # 数据获取：通过ID查询TextInfo记录
+    existing_text_info = db.query(TextInfo).filter(
+        TextInfo.id == text_info_update.id
+    ).first()
+    
+    # 存在性验证：检查TextInfo是否存在
+    if not existing_text_info:
+        raise BusinessException(f"ID为 {text_info_update.id} 的文本信息不存在")
+    
+    # 数据操作：更新字段
+    existing_text_info.color = text_info_update.color
+    existing_text_info.text = text_info_update.text
+    
+    # 数据库保存：merge更新
+    updated_text_info = db.merge(existing_text_info)
+    mark_changed(db, TEXT_INFO_VERSION_KEY)
+    
+    # 结果转换：提交前转换，提交后对象属性过期
+    return TextInfoResponse.model_validate(updated_text_info)
+
+
+def seed_text_info(db: Session) -> int:
+    """
+    补齐0-8号颜色的TextInfo基础数据并提交（已有的颜色不变）
+    
+    Args:
+        db: 数据库会话
+        
+    Returns:
+        int: 新增的记录数
+    """
+    existing = {color for (color,) in db.query(TextInfo.color)}
+    missing = [color for color in TEXT_INFO_COLORS if color not in existing]
+    for color in missing:
+        db.add(TextInfo(id=generate_id(), color=color, text=""))
+    if missing:
+        mark_changed(db, TEXT_INFO_VERSION_KEY)
+    db.commit()
+    return len(missing)
+
+
+@timed_service
 class TextInfoService:
     """TextInfo服务类"""
     
@@ -44,16 +105,16 @@ class TextInfoService:
             text_infos = self.db.query(TextInfo).order_by(TextInfo.color).all()
             
             # 日志记录：记录查询到的记录数量
-            logger.info(f"查询到 {len(text_infos)} 条TextInfo记录")
+            logger.info("查询到 %s 条TextInfo记录", len(text_infos))
             
             # 结果返回：转换为响应模型列表
             return [TextInfoResponse.model_validate(text_info) for text_info in text_infos]
             
         except SQLAlchemyError as e:
-            logger.error(f"查询TextInfo数据库错误: {str(e)}")
+            logger.error("查询TextInfo数据库错误: %s", e)
             raise BusinessException("查询文本信息失败", str(e))
         except Exception as e:
-            logger.error(f"查询TextInfo业务错误: {str(e)}")
+            logger.error("查询TextInfo业务错误: %s", e)
             raise BusinessException("查询文本信息失败", str(e))
     
     async def update(self, text_info_update: TextInfoUpdate) -> TextInfoResponse:
@@ -70,27 +131,15 @@ class TextInfoService:
             BusinessException: 文本信息不存在或更新失败
         """
         try:
-            # 数据获取：通过ID查询TextInfo记录
-            existing_text_info = self.db.query(TextInfo).filter(
-                TextInfo.id == text_info_update.id
-            ).first()
-            
-            # 存在性验证：检查TextInfo是否存在
-            if not existing_text_info:
-                raise BusinessException(f"ID为 {text_info_update.id} 的文本信息不存在")
-            
-            # 数据操作：更新字段
-            existing_text_info.color = text_info_update.color
-            existing_text_info.text = text_info_update.text
-            
-            # 数据库保存：merge更新 + commit提交
-            updated_text_info = self.db.merge(existing_text_info)
-            self.db.commit()
+            # 事务提交：经写入队列与并发的小写入合并提交
+            updated_text_info = await write_queue.submit(
+                self.db,
+                lambda db: apply_text_info_update(db, text_info_update)
+            )
             
-            logger.info(f"成功更新TextInfo ID: {text_info_update.id}")
+            logger.info("成功更新TextInfo ID: %s", text_info_update.id)
             
-            # 结果返回：返回更新后的TextInfo对象
-            return TextInfoResponse.model_validate(updated_text_info)
+            return updated_text_info
             
         except BusinessException:
             # 业务异常直接抛出
@@ -99,10 +148,10 @@ class TextInfoService:
         except SQLAlchemyError as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"更新TextInfo数据库错误: {str(e)}")
+            logger.error("更新TextInfo数据库错误: %s", e)
             raise BusinessException("更新文本信息失败", str(e))
         except Exception as e:
             # 数据库回滚
             self.db.rollback()
-            logger.error(f"更新TextInfo业务错误: {str(e)}")
+            logger.error("更新TextInfo业务错误: %s", e)
             raise BusinessException("更新文本信息失败", str(e))
\ No newline at end of file
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Warmup Service业务逻辑（启动预热与分阶段启动耗时）
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from fastapi import Response
+from sqlalchemy import text
+
+from ..config.database import SessionLocal, ReadSessionLocal, engine, read_engine
+from ..config.settings import settings
+from ..models.coordinate import Coordinate
+from ..models.import_job import ImportJob
+from ..models.table import Table
+from ..models.text_info import TextInfo
+from ..schemas.phrase import PhraseListResponse
+from ..schemas.table import TableListResponse
+from ..schemas.text_info import TextInfoResponse
+from ..tool import cached_response, serialize_response, TEXT_INFO_VERSION_KEY, PHRASE_VERSION_KEY, TABLE_VERSION_KEY
+from .phrase import PhraseService
+from .table import TableService, DEFAULT_PAGE_SIZE
+from .text_info import TextInfoService
+
+
+logger = logging.getLogger(__name__)
+
+# 预热查询使用的不存在的ID
+_MISSING_ID = -1
+
+# 响应缓存使用的响应模型（与路由中cached_response的response_type一致）
+_RESPONSE_TYPES = (Dict[str, Any], List[TextInfoResponse], PhraseListResponse, TableListResponse)
+
+
+class StartupTimer:
+    """记录启动各阶段的耗时"""
+    
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        计时一个启动阶段，失败的阶段同样记录耗时
+        
+        Args:
+            name: 阶段名称
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - started) * 1000, 3)
+    
+    def finish(self) -> Dict[str, Any]:
+        """
+        结束计时并记录日志
+        
+        Returns:
+            Dict: 总耗时与各阶段耗时（毫秒）
+        """
+        self.total_ms = round((time.perf_counter() - self.started) * 1000, 3)
+        logger.info(
+            "启动完成，耗时 %.1fms: %s", self.total_ms,
+            "，".join(f"{name} {ms:.1f}ms" for name, ms in self.phases.items()),
+            extra={"startup_ms": self.total_ms, "phases": self.phases}
+        )
+        return self.report()
+    
+    def report(self) -> Dict[str, Any]:
+        """启动耗时报告"""
+        return {"total_ms": self.total_ms, "phases": dict(self.phases)}
+
+
+# 全局启动计时（lifespan中使用，诊断接口读取）
+startup_timer = StartupTimer()
+
+
+def warm_connections() -> int:
+    """
+    预先建立连接池中的连接（同时签出后归还，连接池保留）
+    
+    Returns:
+        int: 建立的连接数
+    """
+    opened = 0
+    engines = [engine] if read_engine is engine else [engine, read_engine]
+    for target in engines:
+        size = target.pool.size() if hasattr(target.pool, "size") else 1
+        connections = []
+        try:
+            for _ in range(max(1, min(settings.warmup_connections, size))):
+                connection = target.connect()
+                connection.execute(text("SELECT 1"))
+                connections.append(connection)
+        finally:
+            for connection in connections:
+                connection.close()
+        opened += len(connections)
+    return opened
+
+
+def refresh_statistics() -> str:
+    """
+    更新查询规划器统计信息：从未分析过时执行ANALYZE，否则PRAGMA optimize
+    
+    analysis_limit限制每个索引的采样行数，大库上同样在毫秒级完成。
+    
+    Returns:
+        str: 执行的操作
+    """
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"PRAGMA analysis_limit={int(settings.warmup_analysis_limit)}")
+        analyzed = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).first()
+        if analyzed is None:
+            connection.exec_driver_sql("ANALYZE")
+            return "analyze"
+        connection.exec_driver_sql("PRAGMA optimize")
+        return "optimize"
+
+
+def compile_statements() -> None:
+    """
+    执行热点查询的语句形态，填充读写两个引擎的SQL编译缓存
+    
+    查询使用不存在的ID，只编译不返回数据。
+    """
+    for session_factory in (ReadSessionLocal, SessionLocal):
+        db = session_factory()
+        try:
+            db.query(Table).filter(Table.id == _MISSING_ID).first()
+            db.query(TextInfo).filter(TextInfo.color == _MISSING_ID).first()
+            db.query(TextInfo).filter(TextInfo.id == _MISSING_ID).first()
+            db.query(Coordinate).filter(Coordinate.id == _MISSING_ID).first()
+            db.query(Coordinate).filter(Coordinate.table_id == _MISSING_ID).all()
+            db.query(Coordinate.id, Coordinate.position, Coordinate.color).filter(
+                Coordinate.table_id == _MISSING_ID
+            ).all()
+            db.query(ImportJob).filter(ImportJob.id == _MISSING_ID).first()
+        finally:
+            db.rollback()
+            db.close()
+
+
+def build_validators() -> int:
+    """
+    构建响应缓存使用的序列化器（TypeAdapter）
+    
+    Returns:
+        int: 构建的序列化器数
+    """
+    for response_type in _RESPONSE_TYPES:
+        try:
+            serialize_response(response_type, [] if response_type is List[TextInfoResponse] else {})
+        except Exception:
+            # 空值不满足模型时序列化失败，序列化器已构建
+            pass
+    return len(_RESPONSE_TYPES)
+
+
+async def load_small_caches() -> None:
+    """
+    预先填充小而热的响应缓存：9条TextInfo、全部词汇与表格列表第一页
+    
+    缓存key与路由一致，首个请求直接命中。
+    """
+    await cached_response(
+        Response(), "text:find", [TEXT_INFO_VERSION_KEY], List[TextInfoResponse],
+        lambda db: TextInfoService(db).find_all()
+    )
+    await cached_response(
+        Response(), "phrase:list:None", [PHRASE_VERSION_KEY, TEXT_INFO_VERSION_KEY], PhraseListResponse,
+        lambda db: PhraseService(db).list_phrases(None)
+    )
+    await cached_response(
+        Response(), f"table:page:{DEFAULT_PAGE_SIZE}:None:None:False", [TABLE_VERSION_KEY], TableListResponse,
+        lambda db: TableService(db).get_table_page()
+    )
+
+
+async def warm_up(timer: StartupTimer) -> None:
+    """
+    启动预热：连接、统计信息、语句编译、序列化器、小缓存，各阶段计时
+    
+    预热失败只记录日志，不影响启动。
+    
+    Args:
+        timer: 启动计时
+    """
+    phases = (
+        ("warmup_connections", warm_connections),
+        ("warmup_statistics", refresh_statistics),
+        ("warmup_statements", compile_statements),
+        ("warmup_validators", build_validators)
+    )
+    for name, step in phases:
+        with timer.phase(name):
+            try:
+                step()
+            except Exception as e:
+                logger.warning("启动预热失败: %s: %s", name, e)
+    
+    with timer.phase("warmup_caches"):
+        try:
+            await load_small_caches()
+        except Exception as e:
+            logger.warning("启动预热失败: warmup_caches: %s", e)
\ No newline at end of file
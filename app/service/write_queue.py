@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WriteQueue Service业务逻辑（小写入的组提交）
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+# 写操作：在给定会话中修改数据（不提交），返回调用方的结果
+WriteOperation = Callable[[Session], Any]
+
+
+class WriteQueue:
+    """
+    组提交写入队列
+    
+    SQLite同一时刻只有一个写者，并发的小写入各自提交时排队等待写锁并各自fsync。
+    写入队列将写操作交给唯一的写线程，写线程把等待中的操作合并到一个事务提交，
+    再把各自的结果或异常交还给调用方。
+    """
+    
+    def __init__(self, enabled: bool, window_ms: float, max_batch: int):
+        """
+        初始化写入队列
+        
+        Args:
+            enabled: 是否启用，未启用时在调用方会话中直接执行并提交
+            window_ms: 收到第一个操作后等待更多操作加入同一批次的时间（毫秒）
+            max_batch: 单个批次的操作数上限
+        """
+        self.enabled = enabled
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        
+        self._queue: "queue.Queue[Optional[Tuple[WriteOperation, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        
+        # 统计计数
+        self.operations = 0
+        self.commits = 0
+        self.fallbacks = 0
+    
+    async def submit(self, db: Session, operation: WriteOperation) -> Any:
+        """
+        提交写操作并等待其所在批次提交完成
+        
+        Args:
+            db: 调用方会话（未启用队列时使用）
+            operation: 写操作
+        
+        Returns:
+            Any: 写操作的返回值
+        
+        Raises:
+            Exception: 写操作或提交抛出的异常
+        """
+        if not self.enabled:
+            result = operation(db)
+            db.commit()
+            return result
+        
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((operation, future))
+        return await asyncio.wrap_future(future)
+    
+    def close(self) -> None:
+        """处理完已提交的操作后停止写线程"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+    
+    def stats(self) -> Dict[str, Any]:
+        """获取写入队列统计信息"""
+        return {
+            "write_operations": self.operations,
+            "write_commits": self.commits,
+            "write_fallbacks": self.fallbacks,
+            "write_pending": self._queue.qsize()
+        }
+    
+    def _ensure_started(self) -> None:
+        """按需启动写线程"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        """
+        写线程主循环：阻塞等待第一个操作，在时间窗口内收集更多操作后一起提交
+        
+        批次处理中的意外错误（如创建会话或回滚失败）交给该批次尚未完成的调用方，写线程继续运行。
+        """
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            
+            batch = []
+            try:
+                self._accept(batch, item)
+                deadline = time.monotonic() + self.window
+                while len(batch) < self.max_batch:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    self._accept(batch, item)
+                
+                if batch:
+                    self._commit_batch(batch)
+            except Exception as e:
+                logger.error("写入队列批次处理失败: %s", e)
+                self._fail(batch, e)
+    
+    @staticmethod
+    def _accept(batch: List[Tuple[WriteOperation, Future]], item: Tuple[WriteOperation, Future]) -> None:
+        """将操作加入批次，调用方已取消等待的操作不再执行"""
+        if item[1].set_running_or_notify_cancel():
+            batch.append(item)
+    
+    @staticmethod
+    def _fail(batch: List[Tuple[WriteOperation, Future]], error: Exception) -> None:
+        """批次中尚未完成的操作以异常结束"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+    
+    def _commit_batch(self, batch: List[Tuple[WriteOperation, Future]]) -> None:
+        """
+        在一个事务中执行并提交整个批次
+        
+        任一操作失败或提交失败时回滚整批，再逐个独立提交，
+        保证每个调用方得到的结果与单独执行时一致。
+        """
+        db = SessionLocal()
+        try:
+            try:
+                results = [operation(db) for operation, _ in batch]
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.fallbacks += 1
+                self._commit_each(db, batch)
+                return
+            
+            self.operations += len(batch)
+            self.commits += 1
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        finally:
+            db.close()
+    
+    def _commit_each(self, db: Session, batch: List[Tuple[WriteOperation, Future]]) -> None:
+        """逐个执行并提交"""
+        for operation, future in batch:
+            self.operations += 1
+            try:
+                result = operation(db)
+                db.commit()
+            except Exception as e:
+                future.set_exception(e)
+                # 回滚失败时会话不可用，异常交给写线程，剩余操作以该异常结束
+                db.rollback()
+            else:
+                self.commits += 1
+                future.set_result(result)
+
+
+# 全局写入队列实例
+write_queue = WriteQueue(
+    enabled=settings.write_queue_enabled,
+    window_ms=settings.write_queue_window_ms,
+    max_batch=settings.write_queue_max_batch
+)
\ No newline at end of file
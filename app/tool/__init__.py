@@ -4,11 +4,74 @@
 """
 
 from .text_processor import TextProcessor
-from .id_generator import generate_id, get_id_generator, SnowflakeIdGenerator
+from .cor_parser import CorParser, ValidationReport
+from .version_counter import (
+    version_counter,
+    check_not_modified,
+    coordinate_version_key,
+    TEXT_INFO_VERSION_KEY,
+    PHRASE_VERSION_KEY,
+    TABLE_VERSION_KEY
+)
+from .change_log import mark_changed, get_global_version, get_committed_versions, change_log_poller, ChangeLogPoller
+from .single_flight import single_flight, SingleFlight
+from .response_cache import response_cache, cached_response, serialize_response, ResponseCache
+from .grid_store import grid_store, SharedGridStore, GridView
+from .tracing import tracer, tracing_middleware, Tracer, TracedRoute
+from .log_pipeline import log_pipeline, LogPipeline, JsonFormatter, RateLimitFilter
+from .metrics import metrics_registry, metrics_middleware, timed_service, record_import
+from .query_inspector import capture_queries, query_inspector_middleware, QueryRecorder
+from .profiler import profiling_middleware, require_profile_token, StackSampler
+from .memory_profiler import memory_profiler, memory_middleware, MemoryProfiler
+from .id_generator import generate_id, reserve_ids, get_id_generator, SnowflakeIdGenerator
 
 __all__ = [
     "TextProcessor",
+    "CorParser",
+    "ValidationReport",
     "generate_id",
+    "reserve_ids",
     "get_id_generator", 
     "SnowflakeIdGenerator",
+    "version_counter",
+    "check_not_modified",
+    "coordinate_version_key",
+    "TEXT_INFO_VERSION_KEY",
+    "PHRASE_VERSION_KEY",
+    "TABLE_VERSION_KEY",
+    "response_cache",
+    "cached_response",
+    "serialize_response",
+    "ResponseCache",
+    "single_flight",
+    "SingleFlight",
+    "mark_changed",
+    "change_log_poller",
+    "ChangeLogPoller",
+    "get_global_version",
+    "get_committed_versions",
+    "grid_store",
+    "SharedGridStore",
+    "GridView",
+    "metrics_registry",
+    "metrics_middleware",
+    "timed_service",
+    "record_import",
+    "capture_queries",
+    "query_inspector_middleware",
+    "QueryRecorder",
+    "profiling_middleware",
+    "require_profile_token",
+    "StackSampler",
+    "memory_profiler",
+    "memory_middleware",
+    "MemoryProfiler",
+    "tracer",
+    "tracing_middleware",
+    "Tracer",
+    "TracedRoute",
+    "log_pipeline",
+    "LogPipeline",
+    "JsonFormatter",
+    "RateLimitFilter",
 ] 
\ No newline at end of file
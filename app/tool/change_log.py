@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+跨进程缓存一致性工具（change_log变更日志 + PRAGMA data_version）
+"""
+
+import logging
+import sqlite3
+import threading
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal, SQLITE_FILE_PATH, engine, read_engine
+from ..config.settings import settings
+from ..models.change_log import ChangeLog
+from ..models.version_state import VersionState
+from .version_counter import version_counter
+
+
+logger = logging.getLogger(__name__)
+
+# 会话上待提交的版本键，提交时写入的全局版本号，及最近一次提交写入的全局版本号
+_SESSION_KEYS = "changed_version_keys"
+_SESSION_VERSIONS = "changed_versions"
+_SESSION_COMMITTED = "committed_versions"
+
+
+def mark_changed(db: Session, *keys: str) -> None:
+    """
+    标记当前事务修改了哪些版本键，须在commit之前调用
+    
+    提交时在同一事务中写入change_log并递增全局版本号，提交成功后同步到本进程的版本镜像；
+    回滚时丢弃标记。
+    
+    Args:
+        db: 数据库会话
+        keys: 版本键
+    """
+    db.info.setdefault(_SESSION_KEYS, set()).update(keys)
+
+
+def _before_commit(session: Session) -> None:
+    """提交前：变更日志与全局版本号与业务数据同一事务写入，记录递增后的全局版本号"""
+    keys = session.info.get(_SESSION_KEYS)
+    if keys:
+        rows = [{"version_key": key} for key in sorted(keys)]
+        session.execute(ChangeLog.__table__.insert(), rows)
+        
+        stmt = sqlite_insert(VersionState.__table__).values(version=1)
+        result = session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[VersionState.version_key],
+                set_={"version": VersionState.__table__.c.version + 1}
+            ).returning(VersionState.version_key, VersionState.version),
+            rows
+        )
+        session.info[_SESSION_VERSIONS] = dict(result.all())
+
+
+def get_global_version(db: Session, key: str) -> int:
+    """
+    读取版本键的全局版本号（所有进程一致，用于共享内存等跨进程数据的代数）
+    
+    Args:
+        db: 数据库会话
+        key: 版本键
+        
+    Returns:
+        int: 全局版本号，从未写入时为0
+    """
+    version = db.query(VersionState.version).filter(
+        VersionState.version_key == key
+    ).scalar()
+    return version or 0
+
+
+def get_committed_versions(db: Session) -> Dict[str, int]:
+    """
+    会话最近一次提交写入的全局版本号（提交后调用）
+    
+    Args:
+        db: 数据库会话
+        
+    Returns:
+        Dict[str, int]: 版本键 -> 本次提交后的全局版本号，未标记变更时为空
+    """
+    return db.info.get(_SESSION_COMMITTED, {})
+
+
+def _after_commit(session: Session) -> None:
+    """提交后：同步本事务写入的全局版本号"""
+    session.info.pop(_SESSION_KEYS, None)
+    versions = session.info.pop(_SESSION_VERSIONS, None)
+    session.info[_SESSION_COMMITTED] = versions or {}
+    if versions:
+        version_counter.advance(versions)
+
+
+def _after_rollback(session: Session) -> None:
+    """回滚后：丢弃待提交的版本键"""
+    session.info.pop(_SESSION_KEYS, None)
+    session.info.pop(_SESSION_VERSIONS, None)
+
+
+event.listen(SessionLocal, "before_commit", _before_commit)
+event.listen(SessionLocal, "after_commit", _after_commit)
+event.listen(SessionLocal, "after_rollback", _after_rollback)
+
+
+class ChangeLogPoller:
+    """变更日志轮询器，将其他进程写入的全局版本号同步到本进程的版本镜像"""
+    
+    def __init__(self, retention: int):
+        """
+        初始化轮询器
+        
+        Args:
+            retention: change_log保留的记录数
+        """
+        self.retention = retention
+        self._connection = None
+        self._data_version: Optional[int] = None
+        self._last_seq: Optional[int] = None
+        self._last_prune_seq = 0
+        self._lock = threading.Lock()
+    
+    def poll(self) -> None:
+        """
+        检查数据库是否有新的提交，有则读取新增的变更日志
+        
+        PRAGMA data_version在其他连接（含本进程其他连接）提交后变化，
+        未变化时只需一次PRAGMA调用。
+        """
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = self._connect()
+                
+                cursor = self._connection.cursor()
+                try:
+                    data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+                    if data_version == self._data_version:
+                        return
+                    self._data_version = data_version
+                    
+                    # 全部版本号（首次轮询、失败后或日志已被清理）或变更键的版本号
+                    full = self._last_seq is None
+                    rows = []
+                    if full:
+                        # 先取日志位置再取版本号，两者之间的提交会在下次轮询再次同步
+                        self._last_seq = cursor.execute(
+                            "SELECT COALESCE(MAX(seq), 0) FROM change_log"
+                        ).fetchone()[0]
+                    else:
+                        min_seq = cursor.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+                        rows = cursor.execute(
+                            "SELECT seq, version_key FROM change_log WHERE seq > ? ORDER BY seq",
+                            (self._last_seq,)
+                        ).fetchall()
+                        if min_seq is not None and min_seq > self._last_seq + 1:
+                            # 未读取的记录已被清理，无法确定变更范围
+                            logger.info("变更日志已超出保留范围，全部缓存失效")
+                            full = True
+                    
+                    versions = {}
+                    if full:
+                        versions = dict(cursor.execute("SELECT version_key, version FROM version_state").fetchall())
+                    elif rows:
+                        keys = sorted({version_key for _, version_key in rows})
+                        versions = dict.fromkeys(keys, 0)
+                        versions.update(cursor.execute(
+                            f"SELECT version_key, version FROM version_state WHERE version_key IN ({', '.join('?' * len(keys))})",
+                            keys
+                        ).fetchall())
+                finally:
+                    cursor.close()
+            except Exception as e:
+                # 轮询失败时丢弃连接，下次重建并重新读取全部版本号；缓存全部失效以保证正确性
+                logger.warning("变更日志轮询失败: %s", e)
+                self._close()
+                version_counter.reset()
+                return
+            
+            if full:
+                version_counter.load(versions)
+            elif versions:
+                version_counter.advance(versions)
+            
+            if rows:
+                self._last_seq = rows[-1][0]
+        
+        if self._last_seq - self._last_prune_seq >= self.retention:
+            self.prune()
+    
+    @staticmethod
+    def _connect():
+        """
+        轮询专用的只读连接，不占用引擎连接池
+        
+        该连接从不写入，PRAGMA data_version对本进程其他连接的提交同样变化。
+        """
+        if SQLITE_FILE_PATH:
+            connection = sqlite3.connect(
+                f"file:{quote(SQLITE_FILE_PATH)}?mode=ro", uri=True, check_same_thread=False
+            )
+            connection.execute("PRAGMA query_only=ON")
+            return connection
+        # 内存库等无法独立连接：使用只读引擎的连接
+        return read_engine.raw_connection()
+    
+    def prune(self) -> None:
+        """清理超出保留数量的旧变更日志"""
+        try:
+            with engine.begin() as connection:
+                result = connection.execute(
+                    text("DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - :retention"),
+                    {"retention": self.retention}
+                )
+            self._last_prune_seq = self._last_seq or 0
+            if result.rowcount:
+                logger.info("清理变更日志 %s 条", result.rowcount)
+        except Exception as e:
+            logger.warning("清理变更日志失败: %s", e)
+    
+    def close(self) -> None:
+        """关闭轮询连接"""
+        with self._lock:
+            self._close()
+    
+    def _close(self) -> None:
+        """关闭连接（调用方持有锁），重新连接后读取全部版本号"""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+        self._data_version = None
+        self._last_seq = None
+
+
+# 全局变更日志轮询器，读取版本前同步其他进程的写入
+change_log_poller = ChangeLogPoller(retention=settings.change_log_retention)
+version_counter.add_refresher(change_log_poller.poll)
\ No newline at end of file
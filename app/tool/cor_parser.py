@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+坐标文件(cor.txt)解析工具类
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Optional, Tuple
+
+
+class CorParser:
+    """坐标文件解析工具类"""
+    
+    # "（x， y） color"格式，兼容全角/半角括号和逗号
+    LINE_PATTERN = re.compile(r'[（(](\d+)[，,]\s*(\d+)[）)]\s*(\d+)')
+    
+    # 已存储位置"(x, y)"格式
+    POSITION_PATTERN = re.compile(r'\((\d+),\s*(\d+)\)')
+    
+    # 拒绝原因编码
+    REASON_FORMAT = "format"
+    REASON_COLOR_RANGE = "color_range"
+    
+    # 颜色取值范围
+    MIN_COLOR = 0
+    MAX_COLOR = 8
+    
+    @staticmethod
+    def parse_line(line: str) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+        """
+        解析单行坐标数据
+        
+        Args:
+            line: 已去除首尾空白的非空行
+        
+        Returns:
+            Tuple: (拒绝原因, 位置, 颜色)，解析成功时拒绝原因为None
+        """
+        match = CorParser.LINE_PATTERN.match(line)
+        if not match:
+            return CorParser.REASON_FORMAT, None, None
+        
+        x, y, color = match.groups()
+        color_int = int(color)
+        
+        if not (CorParser.MIN_COLOR <= color_int <= CorParser.MAX_COLOR):
+            return CorParser.REASON_COLOR_RANGE, None, color_int
+        
+        return None, f"({x}, {y})", color_int
+    
+    @staticmethod
+    def describe(reason: str) -> str:
+        """
+        拒绝原因说明
+        
+        Args:
+            reason: 拒绝原因编码
+        
+        Returns:
+            str: 面向用户的说明
+        """
+        if reason == CorParser.REASON_FORMAT:
+            return "格式不正确，应为\"（x， y） color\""
+        if reason == CorParser.REASON_COLOR_RANGE:
+            return f"颜色值超出范围，应为{CorParser.MIN_COLOR}-{CorParser.MAX_COLOR}"
+        return reason
+    
+    @staticmethod
+    def format_line(position: str, color: int) -> str:
+        """
+        格式化单行坐标数据（parse_line的逆操作）
+        
+        Args:
+            position: 位置，如"(x, y)"
+            color: 颜色值
+            
+        Returns:
+            str: "(x, y) color"格式的行，含换行符
+        """
+        return f"{position} {color}\n"
+    
+    @staticmethod
+    def split_position(position: str) -> Optional[Tuple[str, str]]:
+        """
+        拆分位置为x、y坐标
+        
+        Args:
+            position: 位置，如"(x, y)"
+            
+        Returns:
+            Optional[Tuple[str, str]]: (x, y)，格式不符时返回None
+        """
+        match = CorParser.POSITION_PATTERN.fullmatch(position)
+        return match.groups() if match else None
+    
+    @staticmethod
+    def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+        """
+        计算文件内容的SHA-256摘要（分块读取）
+        
+        Args:
+            file_path: 文件路径
+            chunk_size: 每次读取的字节数
+            
+        Returns:
+            str: 十六进制摘要
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+class ValidationReport:
+    """
+    坐标文件校验报告：按拒绝原因汇总行数，每种原因只保留前若干个样例行
+    
+    内存占用与文件大小无关，可序列化后随导入结果或任务状态返回。
+    """
+    
+    # 样例行保留的最大字符数
+    MAX_SAMPLE_LENGTH = 200
+    
+    def __init__(self, max_samples: int = 10):
+        """
+        初始化校验报告
+        
+        Args:
+            max_samples: 每种拒绝原因保留的样例数
+        """
+        self.max_samples = max_samples
+        self.lines = 0
+        self.blank = 0
+        self.accepted = 0
+        # 拒绝原因 -> {count, first_line, samples}
+        self.reasons: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def rejected(self) -> int:
+        """拒绝行数"""
+        return sum(entry["count"] for entry in self.reasons.values())
+    
+    def add(self, line_num: int, line: str, reason: Optional[str]) -> None:
+        """
+        记录一行的解析结果
+        
+        Args:
+            line_num: 行号
+            line: 已去除首尾空白的行，空行为空字符串
+            reason: 拒绝原因，解析成功为None
+        """
+        self.lines = line_num
+        if not line:
+            self.blank += 1
+            return
+        if reason is None:
+            self.accepted += 1
+            return
+        
+        entry = self.reasons.get(reason)
+        if entry is None:
+            entry = self.reasons[reason] = {"count": 0, "first_line": line_num, "samples": []}
+        entry["count"] += 1
+        if len(entry["samples"]) < self.max_samples:
+            entry["samples"].append({"line": line_num, "text": line[:self.MAX_SAMPLE_LENGTH]})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {
+            "lines": self.lines,
+            "blank": self.blank,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "reasons": [
+                {"reason": reason, "description": CorParser.describe(reason), **entry}
+                for reason, entry in sorted(self.reasons.items(), key=lambda item: item[1]["first_line"])
+            ]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]], max_samples: int = 10) -> "ValidationReport":
+        """
+        从字典恢复（导入任务断点续传时继续累计）
+        
+        Args:
+            data: to_dict的结果，为空时返回新报告
+            max_samples: 每种拒绝原因保留的样例数
+        
+        Returns:
+            ValidationReport: 校验报告
+        """
+        report = cls(max_samples)
+        if data:
+            report.lines = data.get("lines", 0)
+            report.blank = data.get("blank", 0)
+            report.accepted = data.get("accepted", 0)
+            for entry in data.get("reasons", []):
+                report.reasons[entry["reason"]] = {
+                    "count": entry["count"],
+                    "first_line": entry["first_line"],
+                    "samples": list(entry["samples"])
+                }
+        return report
\ No newline at end of file
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享内存网格缓存工具（multiprocessing.shared_memory + 全局代数）
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import threading
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..models.coordinate import Coordinate
+from .change_log import get_global_version
+from .cor_parser import CorParser
+from .version_counter import coordinate_version_key
+
+
+logger = logging.getLogger(__name__)
+
+# 段头：魔数、表格ID、代数、格子数、voc字节数；魔数最后写入，作为构建完成标志
+GRID_MAGIC = b"CGRD"
+_HEADER = struct.Struct("=4s4xqqqq")
+
+# POSIX共享内存在Linux上的挂载目录，用于清理旧代数的段
+SHM_DIR = "/dev/shm"
+
+# 构建时每批读取的行数
+BUILD_CHUNK_ROWS = 1000
+
+_INT32_MAX = 2 ** 31 - 1
+
+
+class GridView:
+    """共享内存段上的只读网格视图，各数组直接映射段内存，不复制"""
+    
+    __slots__ = (
+        "table_id", "generation", "count", "nbytes",
+        "ids", "xs", "ys", "repeated", "voc_lengths", "colors", "voc_blob",
+        "_shm", "_views"
+    )
+    
+    def __init__(self, shm: SharedMemory, table_id: int, generation: int, count: int, voc_bytes: int):
+        """
+        映射段内各数组
+        
+        Args:
+            shm: 已构建完成的共享内存段
+            table_id: 表格ID
+            generation: 网格代数
+            count: 格子数
+            voc_bytes: voc字节总数
+        """
+        self._shm = shm
+        self._views = []
+        self.table_id = table_id
+        self.generation = generation
+        self.count = count
+        
+        base = memoryview(shm.buf)
+        self._views.append(base)
+        offset = _HEADER.size
+        
+        def take(typecode: str, itemsize: int, length: int) -> memoryview:
+            nonlocal offset
+            view = base[offset:offset + itemsize * length].cast(typecode)
+            self._views.append(view)
+            offset += itemsize * length
+            return view
+        
+        # 布局：ids(int64) xs/ys/repeated/voc_lengths(int32) colors(uint8) voc_blob
+        self.ids = take("q", 8, count)
+        self.xs = take("i", 4, count)
+        self.ys = take("i", 4, count)
+        self.repeated = take("i", 4, count)
+        self.voc_lengths = take("i", 4, count)
+        self.colors = take("B", 1, count)
+        self.voc_blob = take("B", 1, voc_bytes)
+        self.nbytes = offset
+    
+    def iter_rows(self) -> Iterator[Tuple[int, int, str, Optional[str], int]]:
+        """
+        按存储顺序遍历坐标
+        
+        Returns:
+            Iterator: (id, color, position, voc, repeated)
+        """
+        voc_offset = 0
+        blob = self.voc_blob
+        for coordinate_id, x, y, color, voc_length, repeated in zip(
+            self.ids, self.xs, self.ys, self.colors, self.voc_lengths, self.repeated
+        ):
+            if voc_length < 0:
+                voc = None
+            else:
+                voc = str(blob[voc_offset:voc_offset + voc_length], "utf-8")
+                voc_offset += voc_length
+            yield coordinate_id, color, f"({x}, {y})", voc, repeated
+    
+    def iter_cells(self) -> Iterator[Tuple[str, int]]:
+        """
+        按存储顺序遍历位置与颜色
+        
+        Returns:
+            Iterator: (position, color)
+        """
+        for x, y, color in zip(self.xs, self.ys, self.colors):
+            yield f"({x}, {y})", color
+    
+    def close(self) -> None:
+        """释放数组视图并解除映射"""
+        if self._shm is None:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._shm.close()
+        self._shm = None
+    
+    def __del__(self) -> None:
+        """不再被引用（含进行中的请求）时解除映射"""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class SharedGridStore:
+    """
+    主机级共享网格缓存
+    
+    每个表格的网格按全局代数（version_state中coordinate:{id}的版本号）
+    存放在独立命名的共享内存段中，同一主机的所有worker进程映射同一份内存；
+    写入使代数递增，旧代数的段不再被命中并在新段构建后解除命名。
+    """
+    
+    def __init__(self, namespace: str, min_cells: int, enabled: bool = True):
+        """
+        初始化共享网格缓存
+        
+        Args:
+            namespace: 段名前缀命名空间（区分不同数据库）
+            min_cells: 进入共享内存的最少格子数，更小的表格直接查询数据库
+            enabled: 是否启用
+        """
+        self.enabled = enabled
+        self.min_cells = min_cells
+        self._prefix = f"cg_{namespace}_"
+        
+        # 本进程已映射的网格：table_id -> GridView
+        self._grids: Dict[int, GridView] = {}
+        # 不适合缓存的表格：table_id -> 代数（代数变化后重新判断）
+        self._skipped: Dict[int, int] = {}
+        # 本进程创建的段名，退出时只解除这些段的命名
+        self._created: Set[str] = set()
+        self._lock = threading.Lock()
+        
+        # 统计计数
+        self.hits = 0
+        self.attaches = 0
+        self.builds = 0
+    
+    def segment_name(self, table_id: int, generation: int) -> str:
+        """生成表格某一代数的段名"""
+        return f"{self._prefix}{table_id:x}_{generation:x}"
+    
+    def get(self, db: Session, table_id: int) -> Optional[GridView]:
+        """
+        获取表格当前代数的网格，本进程未映射时映射已有段或从数据库构建
+        
+        先读代数再读数据，读取期间的写入只会使段内数据新于其代数。
+        
+        Args:
+            db: 数据库会话
+            table_id: 表格ID
+        
+        Returns:
+            Optional[GridView]: 网格视图，未启用或不适合缓存时返回None
+        """
+        if not self.enabled:
+            return None
+        
+        generation = get_global_version(db, coordinate_version_key(table_id))
+        
+        with self._lock:
+            grid = self._grids.get(table_id)
+            if grid is not None and grid.generation == generation:
+                self.hits += 1
+                return grid
+            if self._skipped.get(table_id) == generation:
+                return None
+        
+        grid = self._attach(table_id, generation)
+        if grid is None:
+            grid = self._build(db, table_id, generation)
+        
+        if grid is not None:
+            with self._lock:
+                # 旧视图仅解除引用，进行中的请求读完后自动解除映射
+                self._grids[table_id] = grid
+                self._skipped.pop(table_id, None)
+        return grid
+    
+    def unlink_created(self) -> None:
+        """
+        解除本进程创建的段的命名（进程退出时调用）
+        
+        其他worker创建的段不受影响；已映射的进程继续可读，之后的进程重新构建。
+        """
+        with self._lock:
+            created, self._created = self._created, set()
+            self._grids.clear()
+            self._skipped.clear()
+        for name in created:
+            _unlink(name)
+    
+    def stats(self) -> Dict[str, Any]:
+        """获取共享网格统计信息"""
+        with self._lock:
+            return {
+                "grids": len(self._grids),
+                "grid_bytes": sum(grid.nbytes for grid in self._grids.values()),
+                "grid_hits": self.hits,
+                "grid_attaches": self.attaches,
+                "grid_builds": self.builds
+            }
+    
+    def _attach(self, table_id: int, generation: int) -> Optional[GridView]:
+        """映射其他进程已构建完成的段"""
+        try:
+            shm = SharedMemory(name=self.segment_name(table_id, generation))
+        except (FileNotFoundError, OSError, ValueError):
+            # ValueError：构建方刚创建段、尚未设置大小（空文件无法映射）
+            return None
+        _untrack(shm)
+        
+        magic, segment_table_id, segment_generation, count, voc_bytes = _HEADER.unpack_from(shm.buf, 0)
+        if magic != GRID_MAGIC or segment_table_id != table_id or segment_generation != generation:
+            # 其他进程仍在构建，本次直接查询数据库
+            shm.close()
+            return None
+        
+        self.attaches += 1
+        return GridView(shm, table_id, generation, count, voc_bytes)
+    
+    def _build(self, db: Session, table_id: int, generation: int) -> Optional[GridView]:
+        """从数据库读取网格并写入新的共享内存段"""
+        # 步骤1：读取为紧凑数组，位置必须是可还原的"(x, y)"格式
+        ids, xs, ys, repeated, voc_lengths = array("q"), array("i"), array("i"), array("i"), array("i")
+        colors, voc_blob = bytearray(), bytearray()
+        
+        rows = db.query(
+            Coordinate.id, Coordinate.position, Coordinate.color, Coordinate.voc, Coordinate.repeated
+        ).filter(Coordinate.table_id == table_id).yield_per(BUILD_CHUNK_ROWS)
+        
+        for coordinate_id, position, color, voc, repeated_count in rows:
+            xy = CorParser.split_position(position)
+            if xy is None:
+                return self._skip(table_id, generation)
+            x, y = int(xy[0]), int(xy[1])
+            if x > _INT32_MAX or y > _INT32_MAX or position != f"({x}, {y})":
+                return self._skip(table_id, generation)
+            
+            ids.append(coordinate_id)
+            xs.append(x)
+            ys.append(y)
+            repeated.append(repeated_count)
+            colors.append(color)
+            if voc is None:
+                voc_lengths.append(-1)
+            else:
+                encoded = voc.encode("utf-8")
+                voc_lengths.append(len(encoded))
+                voc_blob += encoded
+        
+        count = len(ids)
+        if count < self.min_cells:
+            return self._skip(table_id, generation)
+        
+        # 步骤2：创建段，同名段已存在说明其他进程正在或已经构建
+        name = self.segment_name(table_id, generation)
+        size = _HEADER.size + 24 * count + count + len(voc_blob)
+        try:
+            shm = SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            return self._attach(table_id, generation)
+        except OSError as e:
+            logger.warning("创建共享网格失败，表格ID: %s: %s", table_id, e)
+            return self._skip(table_id, generation)
+        _untrack(shm)
+        
+        # 步骤3：写入数组，最后写段头
+        offset = _HEADER.size
+        for data in (ids, xs, ys, repeated, voc_lengths, colors, voc_blob):
+            length = len(data) * (data.itemsize if isinstance(data, array) else 1)
+            shm.buf[offset:offset + length] = memoryview(data).cast("B")
+            offset += length
+        _HEADER.pack_into(shm.buf, 0, GRID_MAGIC, table_id, generation, count, len(voc_blob))
+        
+        with self._lock:
+            self._created.add(name)
+        
+        # 步骤4：解除旧代数段的命名
+        self._unlink_matching(f"{self._prefix}{table_id:x}_", name)
+        
+        self.builds += 1
+        logger.info("构建共享网格，表格ID: %s，代数: %s，格子数: %s，字节: %s", table_id, generation, count, size)
+        return GridView(shm, table_id, generation, count, len(voc_blob))
+    
+    def _skip(self, table_id: int, generation: int) -> None:
+        """记录表格在当前代数下不适合缓存，并清理其旧段"""
+        with self._lock:
+            self._skipped[table_id] = generation
+            self._grids.pop(table_id, None)
+        self._unlink_matching(f"{self._prefix}{table_id:x}_", None)
+        return None
+    
+    def _unlink_matching(self, prefix: str, keep: Optional[str]) -> None:
+        """解除指定前缀的段命名（仅Linux可枚举）"""
+        if not os.path.isdir(SHM_DIR):
+            return
+        for name in os.listdir(SHM_DIR):
+            if name.startswith(prefix) and name != keep:
+                _unlink(name)
+        with self._lock:
+            self._created = {name for name in self._created if not name.startswith(prefix) or name == keep}
+
+
+def _unlink(name: str) -> None:
+    """解除段的命名，段已不存在时忽略"""
+    try:
+        os.unlink(os.path.join(SHM_DIR, name))
+    except OSError:
+        pass
+
+
+def _untrack(shm: SharedMemory) -> None:
+    """
+    取消resource_tracker对段的跟踪
+    
+    段由所有worker共享，不能在创建或映射它的进程退出时被自动删除。
+    """
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def _namespace() -> str:
+    """按工作目录与数据库地址生成命名空间，避免不同实例共用段"""
+    source = f"{os.getcwd()}|{settings.database_url}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:6]
+
+
+# 全局共享网格缓存实例
+grid_store = SharedGridStore(
+    namespace=_namespace(),
+    min_cells=settings.grid_cache_min_cells,
+    enabled=settings.grid_cache_enabled
+)
\ No newline at end of file
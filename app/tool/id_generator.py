@@ -4,9 +4,13 @@
 ID生成工具
 """
 
+import logging
 import time
 import threading
-from typing import Optional
+from typing import Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
 
 
 class SnowflakeIdGenerator:
@@ -22,6 +26,8 @@ class SnowflakeIdGenerator:
         self.machine_id = machine_id
         self.sequence = 0
         self.last_timestamp = -1
+        self.last_wall_timestamp = -1
+        self.borrowed = False
         self.lock = threading.Lock()
         
         # 各部分位数
@@ -39,6 +45,9 @@ class SnowflakeIdGenerator:
         # 起始时间戳 (2023-01-01 00:00:00 UTC)
         self.EPOCH = 1672531200000
         
+        # 逻辑时间戳最多超前真实时钟的毫秒数（预留区间借用未来时间的上限）
+        self.MAX_BORROW_MS = 10000
+        
         if machine_id > self.MAX_MACHINE_ID or machine_id < 0:
             raise ValueError(f"机器ID必须在0到{self.MAX_MACHINE_ID}之间")
     
@@ -53,27 +62,98 @@ class SnowflakeIdGenerator:
             timestamp = self._get_timestamp()
         return timestamp
     
+    def _wall_timestamp(self) -> int:
+        """
+        读取真实时钟并检查回拨（与借用无关：真实时钟早于此前读到的值即为回拨）
+        
+        Raises:
+            RuntimeError: 时钟回拨
+        """
+        timestamp = self._get_timestamp()
+        if timestamp < self.last_wall_timestamp:
+            logger.error("时钟回拨 %dms，拒绝生成ID", self.last_wall_timestamp - timestamp)
+            raise RuntimeError('时钟回拨，拒绝生成ID')
+        self.last_wall_timestamp = timestamp
+        return timestamp
+    
+    def _borrow_wait(self, logical_timestamp: int) -> float:
+        """
+        逻辑时间戳超前真实时钟超过借用上限时需要等待的秒数（调用方持有锁）
+        
+        调用方在释放锁之后等待，等待期间其他线程可以继续分配ID。
+        """
+        ahead = logical_timestamp - self._wall_timestamp()
+        if ahead <= self.MAX_BORROW_MS:
+            return 0.0
+        logger.warning("ID借用超前 %dms，超过上限 %dms，等待时钟追上", ahead, self.MAX_BORROW_MS)
+        return (ahead - self.MAX_BORROW_MS) / 1000
+    
     def generate_id(self) -> int:
         """生成唯一ID"""
+        wait = 0.0
         with self.lock:
-            timestamp = self._get_timestamp()
+            timestamp = self._wall_timestamp()
             
             if timestamp < self.last_timestamp:
-                raise RuntimeError('时钟回拨，拒绝生成ID')
+                if not self.borrowed:
+                    logger.error("时钟回拨 %dms，拒绝生成ID", self.last_timestamp - timestamp)
+                    raise RuntimeError('时钟回拨，拒绝生成ID')
+                # 预留区间超前于真实时钟：沿用逻辑时间戳继续分配
+                timestamp = self.last_timestamp
             
             if timestamp == self.last_timestamp:
                 self.sequence = (self.sequence + 1) & self.MAX_SEQUENCE
                 if self.sequence == 0:
-                    timestamp = self._wait_for_next_millis(self.last_timestamp)
+                    if self.borrowed:
+                        timestamp = self.last_timestamp + 1
+                        wait = self._borrow_wait(timestamp)
+                    else:
+                        timestamp = self._wait_for_next_millis(self.last_timestamp)
             else:
                 self.sequence = 0
+                self.borrowed = False
             
             self.last_timestamp = timestamp
             
             # 组装ID
-            return ((timestamp - self.EPOCH) << self.TIMESTAMP_SHIFT) | \
-                   (self.machine_id << self.MACHINE_ID_SHIFT) | \
-                   self.sequence
+            new_id = ((timestamp - self.EPOCH) << self.TIMESTAMP_SHIFT) | \
+                     (self.machine_id << self.MACHINE_ID_SHIFT) | \
+                     self.sequence
+        
+        # 超过借用上限：释放锁后等待，限制借用速度
+        if wait:
+            time.sleep(wait)
+        return new_id
+    
+    def reserve_ids(self, count: int) -> Tuple[int, int]:
+        """
+        预留一段连续的ID区间，供数据库内批量生成ID
+        
+        区间内第k个ID（k从0开始）为：
+        ((base + k // 序列容量) << TIMESTAMP_SHIFT) | machine_part | (k % 序列容量)
+        区间末尾超前真实时钟超过借用上限时，释放锁后等待再返回（超大区间按每毫秒容量限速），
+        异步调用方应在线程池中调用。
+        
+        Args:
+            count: 需要预留的ID数量
+            
+        Returns:
+            Tuple[int, int]: (起始时间戳偏移base, 机器位machine_part)
+        """
+        # 每毫秒可分配MAX_SEQUENCE + 1个ID，占用足够的毫秒数
+        millis = max(1, -(-count // (self.MAX_SEQUENCE + 1)))
+        with self.lock:
+            timestamp = max(self._wall_timestamp(), self.last_timestamp + 1)
+            
+            # 将已预留的毫秒标记为用尽，后续ID从区间之后开始分配
+            self.last_timestamp = timestamp + millis - 1
+            self.sequence = self.MAX_SEQUENCE
+            self.borrowed = True
+            wait = self._borrow_wait(self.last_timestamp)
+        
+        if wait:
+            time.sleep(wait)
+        return timestamp - self.EPOCH, self.machine_id << self.MACHINE_ID_SHIFT
 
 
 # 全局ID生成器实例
@@ -90,4 +170,9 @@ def get_id_generator() -> SnowflakeIdGenerator:
 
 def generate_id() -> int:
     """生成唯一ID"""
-    return get_id_generator().generate_id()
\ No newline at end of file
+    return get_id_generator().generate_id()
+
+
+def reserve_ids(count: int) -> Tuple[int, int]:
+    """预留连续ID区间"""
+    return get_id_generator().reserve_ids(count)
\ No newline at end of file
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步日志管道（QueueHandler/QueueListener + 结构化JSON输出 + 重复日志限流采样）
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.settings import settings
+from .tracing import current_trace_id
+
+
+# LogRecord自带的属性，其余属性视为extra结构化字段
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "trace_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """单行JSON格式：时间、级别、logger、消息、追踪ID与extra字段"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """格式化日志记录（在写入线程中执行，消息参数此时才格式化）"""
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            payload["trace_id"] = trace_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    重复日志限流：同一位置、同一消息模板在每个时间窗口内前burst条全部放行，
+    之后每sample_rate条放行一条并附带被抑制的条数
+    
+    以未格式化的消息模板为键，逐行告警等参数不同的重复日志归为同一类。
+    """
+    
+    def __init__(self, burst: int, interval_seconds: float, sample_rate: int):
+        """
+        初始化限流过滤器
+        
+        Args:
+            burst: 每个时间窗口内全部放行的条数
+            interval_seconds: 时间窗口（秒）
+            sample_rate: 超出后每多少条放行一条，0表示全部丢弃
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval_seconds = interval_seconds
+        self.sample_rate = sample_rate
+        
+        # (logger, 行号, 消息模板) -> [窗口开始时间, 窗口内条数, 未放行条数]
+        self._windows: Dict[Tuple[str, int, str], list] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """判断是否放行"""
+        if record.levelno >= logging.ERROR:
+            return True
+        
+        key = (record.name, record.lineno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval_seconds:
+                dropped = window[2] if window is not None else 0
+                if window is None and len(self._windows) >= 10000:
+                    self._windows.clear()
+                window = self._windows[key] = [now, 0, 0]
+                if dropped:
+                    record.suppressed = dropped
+            
+            window[1] += 1
+            if window[1] <= self.burst:
+                return True
+            if self.sample_rate and (window[1] - self.burst) % self.sample_rate == 0:
+                if window[2]:
+                    record.suppressed = window[2]
+                    window[2] = 0
+                return True
+            window[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    不阻塞的队列Handler：请求线程只入队原始记录，格式化与I/O在写入线程完成，
+    队列满时丢弃并计数
+    """
+    
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """入队前只附加追踪ID，不格式化消息"""
+        record.trace_id = current_trace_id()
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """队列满时丢弃"""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """根logger的异步日志管道"""
+    
+    def __init__(self):
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._queue_handler: Optional[NonBlockingQueueHandler] = None
+        self._rate_limit: Optional[RateLimitFilter] = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """替换根logger的handler为队列Handler并启动写入线程（重复调用无副作用）"""
+        with self._lock:
+            if self._listener is not None:
+                return
+            
+            if settings.log_file:
+                target: logging.Handler = logging.handlers.RotatingFileHandler(
+                    settings.log_file,
+                    maxBytes=settings.log_file_max_bytes,
+                    backupCount=settings.log_file_backup_count,
+                    encoding="utf-8"
+                )
+            else:
+                target = logging.StreamHandler(sys.stderr)
+            if settings.log_format == "json":
+                target.setFormatter(JsonFormatter())
+            else:
+                target.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+            
+            log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.log_queue_size)
+            self._queue_handler = NonBlockingQueueHandler(log_queue)
+            self._rate_limit = RateLimitFilter(
+                burst=settings.log_rate_limit_burst,
+                interval_seconds=settings.log_rate_limit_interval_seconds,
+                sample_rate=settings.log_sample_rate
+            )
+            self._queue_handler.addFilter(self._rate_limit)
+            
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(self._queue_handler)
+            root.setLevel(settings.log_level.upper())
+            
+            self._listener = logging.handlers.QueueListener(log_queue, target)
+            self._listener.start()
+    
+    def stop(self) -> None:
+        """写完队列中的日志并停止写入线程"""
+        with self._lock:
+            if self._listener is None:
+                return
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            logging.getLogger().removeHandler(self._queue_handler)
+            self._listener = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """获取日志管道统计信息"""
+        return {
+            "log_dropped": self._queue_handler.dropped if self._queue_handler else 0,
+            "log_suppressed": self._rate_limit.suppressed if self._rate_limit else 0,
+            "log_pending": self._queue_handler.queue.qsize() if self._queue_handler else 0
+        }
+
+
+# 全局日志管道
+log_pipeline = LogPipeline()
\ No newline at end of file
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内存剖析工具（tracemalloc快照、快照差异与单请求内存峰值）
+"""
+
+import threading
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from fastapi import Request
+
+
+# 快照比较的分组方式
+GROUP_BY_OPTIONS = ("lineno", "filename", "traceback")
+
+
+class MemoryProfiler:
+    """tracemalloc封装：命名快照、快照差异与按路由的请求内存峰值"""
+    
+    def __init__(self, max_snapshots: int = 10):
+        """
+        初始化内存剖析器
+        
+        Args:
+            max_snapshots: 保留的命名快照数上限（超出时删除最早的快照）
+        """
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+        # 路由 -> {count, peak_max, peak_total, peak_last}
+        self._route_peaks: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        """
+        开始跟踪内存分配
+        
+        Args:
+            frames: 每个分配记录的调用栈深度
+        
+        Returns:
+            Dict: 跟踪状态
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+    
+    def stop(self) -> Dict[str, Any]:
+        """停止跟踪并清除快照与请求峰值"""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+            self._route_peaks.clear()
+        return self.status()
+    
+    def status(self) -> Dict[str, Any]:
+        """跟踪状态与当前/峰值内存"""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = list(self._snapshots)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": snapshots
+        }
+    
+    def take_snapshot(self, name: str) -> Dict[str, Any]:
+        """
+        生成命名快照（同名覆盖）
+        
+        Args:
+            name: 快照名称
+        
+        Returns:
+            Dict: 快照名称与已跟踪的内存总量
+        
+        Raises:
+            ValueError: 未开始跟踪
+        """
+        if not tracemalloc.is_tracing():
+            raise ValueError("内存跟踪未开始")
+        
+        # 排除tracemalloc自身与导入机制的分配
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        
+        return {
+            "name": name,
+            "traced_bytes": sum(stat.size for stat in snapshot.statistics("filename"))
+        }
+    
+    def diff(self, base: str, target: str, group_by: str = "lineno", limit: int = 20) -> Dict[str, Any]:
+        """
+        比较两个快照，返回增长最多的分配位置
+        
+        Args:
+            base: 基准快照名称
+            target: 目标快照名称
+            group_by: 分组方式（lineno/filename/traceback）
+            limit: 返回的分配位置数
+        
+        Returns:
+            Dict: 总增长字节与按增长排序的分配位置
+        
+        Raises:
+            ValueError: 快照不存在或分组方式无效
+        """
+        if group_by not in GROUP_BY_OPTIONS:
+            raise ValueError(f"不支持的分组方式: {group_by}")
+        
+        with self._lock:
+            base_snapshot = self._snapshots.get(base)
+            target_snapshot = self._snapshots.get(target)
+        if base_snapshot is None:
+            raise ValueError(f"快照 {base} 不存在")
+        if target_snapshot is None:
+            raise ValueError(f"快照 {target} 不存在")
+        
+        stats = target_snapshot.compare_to(base_snapshot, group_by)
+        return {
+            "base": base,
+            "target": target,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "count_diff": sum(stat.count_diff for stat in stats),
+            "top": [
+                {
+                    "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff
+                }
+                for stat in stats[:limit]
+            ]
+        }
+    
+    def record_request(self, route: str, peak_bytes: int) -> None:
+        """
+        记录单个请求的内存峰值（相对请求开始时的增量）
+        
+        Args:
+            route: 路由模板
+            peak_bytes: 峰值增量
+        """
+        with self._lock:
+            stats = self._route_peaks.setdefault(route, {"count": 0, "peak_max": 0, "peak_total": 0, "peak_last": 0})
+            stats["count"] += 1
+            stats["peak_max"] = max(stats["peak_max"], peak_bytes)
+            stats["peak_total"] += peak_bytes
+            stats["peak_last"] = peak_bytes
+    
+    def heaviest_routes(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        按最大内存峰值排序的路由
+        
+        Args:
+            limit: 返回的路由数
+        
+        Returns:
+            List[Dict]: 路由峰值统计
+        """
+        with self._lock:
+            routes = [
+                {
+                    "route": route,
+                    "count": int(stats["count"]),
+                    "peak_max_bytes": int(stats["peak_max"]),
+                    "peak_mean_bytes": int(stats["peak_total"] / stats["count"]),
+                    "peak_last_bytes": int(stats["peak_last"])
+                }
+                for route, stats in self._route_peaks.items()
+            ]
+        routes.sort(key=lambda item: item["peak_max_bytes"], reverse=True)
+        return routes[:limit]
+
+
+# 全局内存剖析器实例
+memory_profiler = MemoryProfiler()
+
+
+async def memory_middleware(request: Request, call_next):
+    """
+    记录请求期间的内存峰值（仅在tracemalloc跟踪中生效，未跟踪时只有一次状态检查）
+    
+    峰值为进程级统计，并发请求会相互计入，结果为近似值。
+    """
+    if not tracemalloc.is_tracing():
+        return await call_next(request)
+    
+    start_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    response = await call_next(request)
+    
+    if tracemalloc.is_tracing():
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+        memory_profiler.record_request(route, max(0, peak_bytes - start_bytes))
+    return response
\ No newline at end of file
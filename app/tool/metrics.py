@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进程内指标工具（Prometheus文本格式）
+"""
+
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config.database import engine, query_elapsed, read_engine
+from .grid_store import grid_store
+from .response_cache import response_cache
+from .single_flight import single_flight
+from .tracing import tracer
+
+
+# 延迟分桶（秒）
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 单请求SQL条数分桶
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+# 标签值：(标签名, 标签值)元组
+LabelValues = Tuple[Tuple[str, str], ...]
+
+# 采集函数返回：[(指标名, 说明, 类型, [(标签, 值)])]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    """格式化标签，按Prometheus规则转义"""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """格式化样本值"""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Counter:
+    """单调递增计数器"""
+    
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """按标签递增"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def render(self) -> List[str]:
+        """输出文本格式样本"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """累积分桶直方图"""
+    
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        # 标签 -> [各分桶计数..., 总和, 总数]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels: str) -> None:
+        """按标签记录一次观测"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+    
+    def render(self) -> List[str]:
+        """输出文本格式样本（_bucket为累积计数）"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, state in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {_format_value(cumulative)}")
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {_format_value(state[-1])}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(state[-2])}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表，抓取时合并计数器、直方图与采集函数的输出"""
+    
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._collectors: List[Collector] = []
+    
+    def counter(self, name: str, documentation: str) -> Counter:
+        """注册计数器"""
+        metric = Counter(name, documentation)
+        self._metrics.append(metric)
+        return metric
+    
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """注册直方图"""
+        metric = Histogram(name, documentation, buckets)
+        self._metrics.append(metric)
+        return metric
+    
+    def add_collector(self, collector: Collector) -> None:
+        """注册抓取时读取的采集函数（连接池、缓存等即时状态）"""
+        self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """
+        输出Prometheus文本格式
+        
+        Returns:
+            str: 全部指标
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, documentation, metric_type, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels.items())} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# 全局指标注册表
+metrics_registry = MetricsRegistry()
+
+http_request_duration = metrics_registry.histogram(
+    "cube_http_request_duration_seconds", "HTTP请求耗时（按路由模板）"
+)
+service_method_duration = metrics_registry.histogram(
+    "cube_service_method_duration_seconds", "服务层方法耗时"
+)
+db_query_duration = metrics_registry.histogram(
+    "cube_db_query_duration_seconds", "SQL语句执行耗时（按语句类型）"
+)
+db_queries_per_request = metrics_registry.histogram(
+    "cube_db_queries_per_request", "单个请求执行的SQL条数", QUERY_COUNT_BUCKETS
+)
+db_query_seconds_per_request = metrics_registry.histogram(
+    "cube_db_query_seconds_per_request", "单个请求的SQL总耗时"
+)
+import_rows = metrics_registry.counter(
+    "cube_import_rows_total", "坐标导入处理的行数"
+)
+import_seconds = metrics_registry.counter(
+    "cube_import_seconds_total", "坐标导入耗时"
+)
+
+# 最近一次导入的吞吐：来源 -> 行/秒
+_import_rate: Dict[str, float] = {}
+
+
+class RequestStats:
+    """单个请求的SQL统计"""
+    
+    __slots__ = ("queries", "query_seconds")
+    
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# 当前请求的SQL统计（线程池与服务层事件循环复制上下文后共享同一对象）
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """记录语句耗时并累加到当前请求"""
+    elapsed = query_elapsed(context)
+    if elapsed is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    db_query_duration.observe(elapsed, operation=operation)
+    
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+async def metrics_middleware(request: Request, call_next):
+    """
+    HTTP中间件：记录按路由模板的请求耗时与单请求SQL统计
+    
+    路由模板（如/api/coordinate/find）作为标签，未匹配的请求归为unmatched，
+    避免路径参数导致标签基数膨胀。
+    """
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        _request_stats.reset(token)
+        
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        http_request_duration.observe(elapsed, method=request.method, route=route_path, status=str(status_code))
+        db_queries_per_request.observe(stats.queries, route=route_path)
+        db_query_seconds_per_request.observe(stats.query_seconds, route=route_path)
+
+
+def timed_service(cls: type) -> type:
+    """
+    服务类装饰器：为全部公开的异步方法记录耗时，并在追踪中记录服务方法span
+    
+    Args:
+        cls: 服务类
+    
+    Returns:
+        type: 原类（方法已包装）
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _timed(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _timed(label: str, method: Callable) -> Callable:
+    """包装单个异步方法"""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            with tracer.start_span(label, **{"code.function": label}):
+                result = await method(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            service_method_duration.observe(time.perf_counter() - start, method=label, outcome=outcome)
+    return wrapper
+
+
+def record_import(source: str, rows: int, seconds: float) -> None:
+    """
+    记录一次坐标导入的处理行数与耗时
+    
+    Args:
+        source: 导入来源（batch同步导入或job后台任务）
+        rows: 处理的行数
+        seconds: 耗时（秒）
+    """
+    import_rows.inc(rows, source=source)
+    import_seconds.inc(seconds, source=source)
+    if seconds > 0:
+        _import_rate[source] = rows / seconds
+
+
+def _collect_pools():
+    """连接池状态"""
+    pools = [("write", engine.pool)]
+    if read_engine is not engine:
+        pools.append(("read", read_engine.pool))
+    
+    for name, documentation, attribute in (
+        ("cube_db_pool_size", "连接池容量", "size"),
+        ("cube_db_pool_checked_out", "已借出的连接数", "checkedout"),
+        ("cube_db_pool_checked_in", "池中空闲的连接数", "checkedin"),
+        ("cube_db_pool_overflow", "超出容量的连接数", "overflow"),
+    ):
+        samples = [
+            ({"engine": engine_name}, getattr(pool, attribute)())
+            for engine_name, pool in pools if hasattr(pool, attribute)
+        ]
+        yield name, documentation, "gauge", samples
+
+
+def _collect_caches():
+    """缓存命中、单飞合并、共享网格与导入吞吐"""
+    cache_stats = response_cache.stats()
+    flight_stats = single_flight.stats()
+    grid_stats = grid_store.stats()
+    yield "cube_response_cache_hits_total", "响应缓存命中次数", "counter", [({}, cache_stats["hits"])]
+    yield "cube_response_cache_misses_total", "响应缓存未命中次数", "counter", [({}, cache_stats["misses"])]
+    yield "cube_response_cache_hit_ratio", "响应缓存命中率", "gauge", [({}, cache_stats["hit_rate"])]
+    yield "cube_response_cache_bytes", "响应缓存占用字节", "gauge", [({}, cache_stats["bytes"])]
+    yield "cube_response_cache_evictions_total", "响应缓存LRU淘汰次数", "counter", [({}, cache_stats["evictions"])]
+    yield "cube_single_flight_coalesced_total", "被合并的并发读取次数", "counter", [({}, flight_stats["coalesced"])]
+    yield "cube_grid_cache_hits_total", "共享网格命中次数", "counter", [({}, grid_stats["grid_hits"])]
+    yield "cube_grid_cache_builds_total", "共享网格构建次数", "counter", [({}, grid_stats["grid_builds"])]
+    yield "cube_grid_cache_bytes", "本进程映射的共享网格字节", "gauge", [({}, grid_stats["grid_bytes"])]
+    yield "cube_import_rows_per_second", "最近一次导入的吞吐（行/秒）", "gauge", [
+        ({"source": source}, rate) for source, rate in _import_rate.items()
+    ]
+
+
+metrics_registry.add_collector(_collect_pools)
+metrics_registry.add_collector(_collect_caches)
\ No newline at end of file
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单请求CPU剖析工具（cProfile / 采样剖析，按需开启）
+"""
+
+import cProfile
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+# 输出格式：pstats使用cProfile，speedscope与flamegraph使用采样剖析
+PROFILE_FORMATS = ("pstats", "speedscope", "flamegraph")
+
+# 保存到磁盘开关接受的取值（不区分大小写），其他取值视为不保存
+_TRUE_VALUES = ("1", "true", "yes")
+
+# 采样时视为空闲等待的模块（阻塞在锁、队列或事件循环select上的线程）
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+# 栈帧：(函数名, 文件, 行号)
+Frame = Tuple[str, str, int]
+
+
+class StackSampler:
+    """采样剖析器：后台线程定时读取所有线程的调用栈"""
+    
+    def __init__(self, interval_seconds: float):
+        """
+        初始化采样器
+        
+        Args:
+            interval_seconds: 采样间隔（秒）
+        """
+        self.interval = interval_seconds
+        # 调用栈（根到叶）-> 采样次数
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """开始采样"""
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """停止采样"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self) -> None:
+        """采样循环，跳过采样线程自身与空闲等待中的线程"""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in _IDLE_MODULES:
+                    continue
+                
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[tuple(stack)] += 1
+
+
+def render_pstats(profile: cProfile.Profile, limit: int = 60) -> str:
+    """
+    输出cProfile文本报告（按累计耗时排序）
+    
+    Args:
+        profile: 已停止的cProfile
+        limit: 输出的函数数
+    
+    Returns:
+        str: 文本报告
+    """
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return stream.getvalue()
+
+
+def render_flamegraph(samples: Counter) -> str:
+    """
+    输出折叠栈文本（flamegraph.pl / inferno 输入格式）
+    
+    Args:
+        samples: 调用栈采样计数
+    
+    Returns:
+        str: 每行"帧;帧;帧 次数"
+    """
+    lines = []
+    for stack, count in samples.most_common():
+        frames = ";".join(f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack)
+        lines.append(f"{frames} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def render_speedscope(samples: Counter, interval_seconds: float, name: str) -> str:
+    """
+    输出speedscope采样格式JSON
+    
+    Args:
+        samples: 调用栈采样计数
+        interval_seconds: 采样间隔（秒）
+        name: 剖析名称
+    
+    Returns:
+        str: speedscope JSON
+    """
+    frame_index: Dict[Frame, int] = {}
+    frames: List[Dict[str, object]] = []
+    sample_list = []
+    weights = []
+    interval_ms = interval_seconds * 1000
+    
+    for stack, count in samples.items():
+        indexes = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            indexes.append(frame_index[frame])
+        sample_list.append(indexes)
+        weights.append(count * interval_ms)
+    
+    return json.dumps({
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": sample_list,
+            "weights": weights
+        }],
+        "name": name,
+        "activeProfileIndex": 0,
+        "exporter": "cube-backend"
+    })
+
+
+def store_profile(content: str, profile_format: str) -> str:
+    """
+    保存剖析结果到磁盘，超出保留数量时删除最旧的文件
+    
+    Args:
+        content: 剖析结果
+        profile_format: 输出格式
+    
+    Returns:
+        str: 文件名
+    """
+    extension = {"pstats": "txt", "speedscope": "speedscope.json", "flamegraph": "folded"}[profile_format]
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    filename = f"profile_{time.strftime('%Y%m%d_%H%M%S')}_{time.monotonic_ns() % 1000000:06d}.{extension}"
+    with open(os.path.join(settings.profile_dir, filename), 'w', encoding='utf-8') as file:
+        file.write(content)
+    
+    profiles = sorted(
+        (entry for entry in os.scandir(settings.profile_dir) if entry.name.startswith("profile_")),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:max(0, len(profiles) - settings.profile_max_files)]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+    return filename
+
+
+def _token_valid(request: Request) -> bool:
+    """请求携带的令牌（X-Profile-Token头或profile_token参数）是否与配置的profile_token一致"""
+    token = request.headers.get("x-profile-token") or request.query_params.get("profile_token")
+    return bool(settings.profile_token and token and hmac.compare_digest(token, settings.profile_token))
+
+
+def require_profile_token(request: Request) -> None:
+    """
+    诊断接口依赖：校验profile_token
+    
+    Args:
+        request: 请求对象
+        
+    Raises:
+        HTTPException: 未配置profile_token时返回404，令牌缺失或无效时返回403
+    """
+    if not settings.profile_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not _token_valid(request):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="令牌无效")
+
+
+def _requested_format(request: Request) -> Optional[str]:
+    """解析剖析请求：令牌校验通过且格式有效时返回格式"""
+    if not _token_valid(request):
+        return None
+    profile_format = request.headers.get("x-profile") or request.query_params.get("profile")
+    return profile_format if profile_format in PROFILE_FORMATS else None
+
+
+def _requested_store(request: Request) -> bool:
+    """解析是否保存到磁盘：X-Profile-Store头或profile_store参数为1/true/yes"""
+    value = request.headers.get("x-profile-store") or request.query_params.get("profile_store") or ""
+    return value.strip().lower() in _TRUE_VALUES
+
+
+async def profiling_middleware(request: Request, call_next):
+    """
+    按需剖析中间件（仅在配置profile_token时注册）
+    
+    请求携带有效令牌（X-Profile-Token头或profile_token参数）与格式
+    （X-Profile头或profile参数：pstats/speedscope/flamegraph）时剖析该请求：
+    默认以剖析结果替换响应体，原状态码放在X-Profiled-Status头中；
+    X-Profile-Store头或profile_store参数为1/true/yes时保存到磁盘，正常返回响应，
+    文件名放在X-Profile-File头中。
+    
+    cProfile只覆盖事件循环线程；采样剖析覆盖全部线程（含线程池中的服务层查询），
+    并发请求的调用栈会一并计入。
+    """
+    profile_format = _requested_format(request)
+    if profile_format is None:
+        return await call_next(request)
+    
+    store = _requested_store(request)
+    interval = settings.profile_sample_interval_ms / 1000
+    profile = cProfile.Profile() if profile_format == "pstats" else None
+    sampler = StackSampler(interval) if profile is None else None
+    
+    started = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    else:
+        sampler.start()
+    try:
+        response = await call_next(request)
+        # 读取完整响应体，流式响应的生成过程也计入剖析
+        body = b"".join([chunk async for chunk in response.body_iterator])
+    finally:
+        if profile is not None:
+            profile.disable()
+        else:
+            sampler.stop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    name = f"{request.method} {request.url.path}"
+    if profile is not None:
+        content = render_pstats(profile)
+    elif profile_format == "speedscope":
+        content = render_speedscope(sampler.samples, interval, name)
+    else:
+        content = render_flamegraph(sampler.samples)
+    logger.info("请求剖析完成: %s，格式: %s，耗时: %.1fms", name, profile_format, elapsed_ms)
+    
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    if store:
+        headers["X-Profile-File"] = store_profile(content, profile_format)
+        return Response(content=body, status_code=response.status_code, headers=headers)
+    
+    media_type = "application/json" if profile_format == "speedscope" else "text/plain"
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"X-Profiled-Status": str(response.status_code), "X-Profile-Elapsed-Ms": f"{elapsed_ms:.1f}"}
+    )
\ No newline at end of file
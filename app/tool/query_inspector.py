@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQL语句检查工具（单请求语句统计、N+1检测、慢语句执行计划）
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config.database import explain_query_plan, query_elapsed, statement_shape
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """记录一段执行范围内的全部SQL语句"""
+    
+    __slots__ = ("statements", "slow_plans")
+    
+    def __init__(self):
+        # (语句形态, 耗时秒)
+        self.statements: List[Tuple[str, float]] = []
+        # (语句, 耗时秒, 执行计划)
+        self.slow_plans: List[Tuple[str, float, List[str]]] = []
+    
+    @property
+    def count(self) -> int:
+        """语句条数"""
+        return len(self.statements)
+    
+    @property
+    def total_seconds(self) -> float:
+        """语句总耗时"""
+        return sum(seconds for _, seconds in self.statements)
+    
+    def duplicates(self) -> Dict[str, int]:
+        """重复执行的语句形态及次数"""
+        counts = Counter(shape for shape, _ in self.statements)
+        return {shape: count for shape, count in counts.items() if count > 1}
+    
+    def n_plus_one(self, threshold: int) -> Dict[str, int]:
+        """
+        疑似N+1的查询：同一SELECT形态执行次数达到阈值
+        
+        Args:
+            threshold: 次数阈值
+        
+        Returns:
+            Dict[str, int]: 语句形态 -> 次数
+        """
+        return {
+            shape: count for shape, count in self.duplicates().items()
+            if count >= threshold and shape.upper().startswith("SELECT")
+        }
+    
+    def summary(self, threshold: int) -> Dict[str, Any]:
+        """统计摘要"""
+        return {
+            "queries": self.count,
+            "time_ms": round(self.total_seconds * 1000, 3),
+            "duplicates": len(self.duplicates()),
+            "n_plus_one": len(self.n_plus_one(threshold))
+        }
+
+
+# 当前执行范围的记录器
+_current_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("query_recorder", default=None)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryRecorder]:
+    """
+    记录上下文内执行的全部SQL语句（中间件与测试中使用）
+    
+    Yields:
+        QueryRecorder: 语句记录器
+    """
+    recorder = QueryRecorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """记录语句形态与耗时，慢语句附带执行计划（仅在记录范围内）"""
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return
+    elapsed = query_elapsed(context)
+    if elapsed is None:
+        return
+    
+    recorder.statements.append((statement_shape(statement), elapsed))
+    
+    if elapsed * 1000 >= settings.sql_slow_ms and not executemany:
+        plan = explain_query_plan(cursor, statement, parameters)
+        recorder.slow_plans.append((statement, elapsed, plan))
+
+
+async def query_inspector_middleware(request: Request, call_next):
+    """
+    调试中间件：记录每个请求的SQL语句，检测N+1并记录慢语句执行计划
+    
+    开启sql_inspect_header时在响应头X-SQL-Summary中返回统计摘要。
+    """
+    with capture_queries() as recorder:
+        response = await call_next(request)
+    
+    threshold = settings.sql_n_plus_one_threshold
+    path = request.url.path
+    
+    for shape, count in recorder.n_plus_one(threshold).items():
+        logger.warning("疑似N+1查询: %s %s，同一语句执行 %s 次: %s", request.method, path, count, shape)
+    for statement, elapsed, plan in recorder.slow_plans:
+        logger.warning("慢语句: %s %s，耗时 %.1fms: %s，执行计划: %s", request.method, path, elapsed * 1000, ' '.join(statement.split()), ' | '.join(plan))
+    
+    if settings.sql_inspect_header:
+        summary = recorder.summary(threshold)
+        response.headers["X-SQL-Summary"] = "; ".join(f"{key}={value}" for key, value in summary.items())
+    return response
\ No newline at end of file
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+响应缓存工具（预序列化JSON + LRU/TTL + 写入驱动失效）
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple
+
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from ..config.database import ReadSessionLocal
+from ..config.settings import settings
+from .single_flight import single_flight
+from .version_counter import version_counter
+
+
+class ResponseCache:
+    """内存上限受控的LRU响应缓存，缓存值为序列化后的字节"""
+    
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        """
+        初始化响应缓存
+        
+        Args:
+            max_bytes: 缓存字节上限
+            ttl_seconds: 缓存有效期（秒）
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        
+        # 缓存项：key -> (过期时间, 版本标签, 依赖的版本键, 序列化字节)
+        self._entries: "OrderedDict[str, Tuple[float, str, Tuple[str, ...], bytes]]" = OrderedDict()
+        # 版本键 -> 依赖该键的缓存key集合，用于精确失效
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        # 统计计数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key: str, tag: str) -> Optional[bytes]:
+        """
+        读取缓存，版本标签不一致或已过期视为未命中
+        
+        Args:
+            key: 缓存key
+            tag: 当前版本标签
+        
+        Returns:
+            Optional[bytes]: 命中时返回序列化字节
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != tag or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+    
+    def set(self, key: str, tag: str, version_keys: Sequence[str], payload: bytes) -> None:
+        """
+        写入缓存，超出字节上限时按LRU淘汰
+        
+        Args:
+            key: 缓存key
+            tag: 生成该响应前读取的版本标签
+            version_keys: 响应依赖的版本键
+            payload: 序列化字节
+        """
+        # 单项超过上限的四分之一不缓存，避免一个大响应清空整个缓存
+        if len(payload) > self.max_bytes // 4:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, tag, tuple(version_keys), payload)
+            self._bytes += len(payload)
+            for version_key in version_keys:
+                self._tag_index.setdefault(version_key, set()).add(key)
+            
+            while self._bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+    
+    def invalidate(self, *version_keys: str) -> None:
+        """使依赖指定版本键的缓存项失效，未指定键时清空缓存"""
+        if not version_keys:
+            self.clear()
+            return
+        
+        with self._lock:
+            for version_key in version_keys:
+                for key in self._tag_index.pop(version_key, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._tag_index.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+    
+    def _remove(self, key: str) -> None:
+        """移除缓存项（调用方持有锁）"""
+        _, _, version_keys, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+        for version_key in version_keys:
+            keys = self._tag_index.get(version_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[version_key]
+
+
+# 全局响应缓存实例，版本递增时精确失效
+response_cache = ResponseCache(
+    max_bytes=settings.response_cache_max_bytes,
+    ttl_seconds=settings.response_cache_ttl_seconds
+)
+version_counter.add_listener(response_cache.invalidate)
+
+# 响应模型序列化器缓存
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def serialize_response(response_type: Any, value: Any) -> bytes:
+    """
+    按响应模型序列化为JSON字节（与FastAPI response_model输出一致）
+    
+    Args:
+        response_type: 响应模型类型
+        value: 服务层返回值
+    
+    Returns:
+        bytes: JSON字节
+    """
+    adapter = _adapters.get(response_type)
+    if adapter is None:
+        adapter = _adapters.setdefault(response_type, TypeAdapter(response_type))
+    validated = adapter.validate_python(value, from_attributes=True)
+    return adapter.dump_json(validated, by_alias=True)
+
+
+def _produce_payload(response_type: Any, producer: Callable[[Session], Awaitable[Any]]) -> bytes:
+    """
+    在工作线程中执行服务层读取并序列化
+    
+    服务层方法内部为同步数据库调用，在独立事件循环中驱动，
+    查询与序列化期间不阻塞主事件循环，后续相同请求得以合并等待。
+    查询使用本次生产专用的只读会话：合并等待的请求共享结果，
+    发起请求被取消或断开时其请求级会话关闭，不影响正在进行的查询。
+    """
+    db = ReadSessionLocal()
+    try:
+        return serialize_response(response_type, asyncio.run(producer(db)))
+    finally:
+        db.close()
+
+
+async def cached_response(
+    response: Response,
+    cache_key: str,
+    version_keys: Sequence[str],
+    response_type: Any,
+    producer: Callable[[Session], Awaitable[Any]]
+) -> Response:
+    """
+    读穿缓存：命中直接返回缓存字节，未命中调用服务层并缓存序列化结果
+    
+    未命中时，同一key、同一数据版本的并发请求只执行一次查询和序列化。
+    
+    Args:
+        response: 路由注入的响应对象（携带ETag等响应头）
+        cache_key: 由路由和查询参数组成的缓存key
+        version_keys: 响应依赖的版本键
+        response_type: 响应模型类型
+        producer: 服务层读取方法，参数为生产专用的只读会话
+    
+    Returns:
+        Response: JSON响应
+    """
+    headers = {}
+    if "etag" in response.headers:
+        headers["ETag"] = response.headers["etag"]
+    
+    # 先取版本标签再查询，查询期间的写入会使本次结果不再被命中
+    version_counter.refresh()
+    tag = version_counter.etag(*version_keys)
+    cacheable = settings.response_cache_enabled and tag is not None
+    payload = response_cache.get(cache_key, tag) if cacheable else None
+    
+    if tag is None:
+        # 版本尚未与数据库同步：不缓存、不合并
+        payload = await run_in_threadpool(_produce_payload, response_type, producer)
+    elif payload is None:
+        payload = await single_flight.do(
+            f"{cache_key}|{tag}",
+            lambda: run_in_threadpool(_produce_payload, response_type, producer)
+        )
+        if cacheable:
+            response_cache.set(cache_key, tag, version_keys, payload)
+    
+    return Response(content=payload, media_type="application/json", headers=headers)
\ No newline at end of file
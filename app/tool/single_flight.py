@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并发相同读取合并工具（single-flight）
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """同一key的并发调用共享一次执行结果"""
+    
+    def __init__(self):
+        """初始化合并器"""
+        self._calls: Dict[str, asyncio.Task] = {}
+        
+        # 统计计数
+        self.executions = 0
+        self.shared = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行调用，已有相同key的调用在进行时等待其结果
+        
+        执行体以独立任务运行并被shield保护，发起者断开连接不会中断
+        其他等待者共享的查询。
+        
+        Args:
+            key: 调用key（应包含数据版本，写入后的请求不会共享写入前的查询）
+            fn: 实际执行的异步函数
+        
+        Returns:
+            Any: 执行结果
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+        else:
+            self.shared += 1
+        
+        return await asyncio.shield(task)
+    
+    def stats(self) -> Dict[str, int]:
+        """获取合并统计信息"""
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.shared
+        }
+    
+    def _forget(self, key: str, finished: asyncio.Task) -> None:
+        """调用结束后移除key"""
+        if self._calls.get(key) is finished:
+            del self._calls[key]
+
+
+# 全局读取合并实例
+single_flight = SingleFlight()
\ No newline at end of file
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+轻量链路追踪工具（请求/路由处理/服务方法/SQL语句span，导出为本地JSONL文件）
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+
+
+# span类型（OTLP枚举名）
+SPAN_KIND_SERVER = "SPAN_KIND_SERVER"
+SPAN_KIND_INTERNAL = "SPAN_KIND_INTERNAL"
+SPAN_KIND_CLIENT = "SPAN_KIND_CLIENT"
+
+# SQL语句属性的最大长度
+STATEMENT_MAX_LENGTH = 1000
+
+# 服务名（resource属性）
+SERVICE_NAME = "cube-backend"
+
+
+class Trace:
+    """单个请求的追踪：收集已结束的span，根span结束时一起导出"""
+    
+    __slots__ = ("trace_id", "spans", "last_sql_span")
+    
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.last_sql_span: Optional["Span"] = None
+
+
+class Span:
+    """追踪span"""
+    
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+    
+    def __init__(self, trace: Trace, name: str, kind: str, parent_id: str = "", attributes: Optional[Dict[str, Any]] = None):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.error: Optional[str] = None
+    
+    def end(self) -> None:
+        """结束span并加入所属追踪"""
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """转换为OTLP JSON格式"""
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": "STATUS_CODE_ERROR", "message": self.error} if self.error else {"code": "STATUS_CODE_OK"}
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """转换为OTLP属性"""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# 当前span
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    """当前上下文的追踪ID，不在追踪中时为None"""
+    span = _current_span.get()
+    return span.trace.trace_id if span is not None else None
+
+
+class Tracer:
+    """
+    追踪器：span在请求上下文中逐层嵌套，请求结束时整条追踪作为一行
+    OTLP JSON（与OpenTelemetry Collector文件导出格式一致）写入滚动文件，
+    文件写入在后台线程中进行。
+    """
+    
+    def __init__(self, enabled: bool, file_path: str, max_bytes: int, backup_count: int):
+        """
+        初始化追踪器
+        
+        Args:
+            enabled: 是否启用
+            file_path: 导出文件路径
+            max_bytes: 单个文件的字节上限
+            backup_count: 保留的滚动文件数
+        """
+        self.enabled = enabled
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        
+        self._queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        self._logger = logging.getLogger("cube.trace")
+        self._logger.propagate = False
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def start_trace(self, name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        开始一条追踪（根span），结束时导出
+        
+        Args:
+            name: 根span名称
+            trace_id: 上游传入的追踪ID（可选）
+            attributes: span属性
+        
+        Yields:
+            Optional[Span]: 根span，未启用时为None
+        """
+        if not self.enabled:
+            yield None
+            return
+        
+        span = Span(Trace(trace_id or secrets.token_hex(16)), name, SPAN_KIND_SERVER, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self._export(span.trace)
+    
+    @contextmanager
+    def start_span(self, name: str, kind: str = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        在当前追踪中开始子span，不在追踪中时不记录
+        
+        Args:
+            name: span名称
+            kind: span类型
+            attributes: span属性
+        
+        Yields:
+            Optional[Span]: 子span，不在追踪中时为None
+        """
+        parent = _current_span.get() if self.enabled else None
+        if parent is None:
+            yield None
+            return
+        
+        span = Span(parent.trace, name, kind, parent.span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+    
+    def close(self) -> None:
+        """停止后台写入线程（写完队列中的追踪）"""
+        with self._lock:
+            if self._listener is not None:
+                self._listener.stop()
+                for handler in self._listener.handlers:
+                    handler.close()
+                self._listener = None
+    
+    def _export(self, trace: Trace) -> None:
+        """将整条追踪放入写入队列"""
+        self._ensure_listener()
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": "app.tool.tracing"},
+                    "spans": [span.to_otlp() for span in trace.spans]
+                }]
+            }]
+        }, ensure_ascii=False)
+        self._logger.info(line)
+    
+    def _ensure_listener(self) -> None:
+        """按需启动后台写入线程"""
+        if self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is not None:
+                return
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                self.file_path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8"
+            )
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+            self._logger.setLevel(logging.INFO)
+            self._listener = logging.handlers.QueueListener(self._queue, file_handler)
+            self._listener.start()
+
+
+# 全局追踪器实例
+tracer = Tracer(
+    enabled=settings.tracing_enabled,
+    file_path=settings.tracing_file,
+    max_bytes=settings.tracing_max_bytes,
+    backup_count=settings.tracing_backup_count
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """在当前追踪中为SQL语句开始span"""
+    parent = _current_span.get() if tracer.enabled else None
+    if parent is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    span = Span(parent.trace, f"SQL {operation}", SPAN_KIND_CLIENT, parent.span_id, {
+        "db.system": "sqlite",
+        "db.operation": operation,
+        "db.statement": statement[:STATEMENT_MAX_LENGTH],
+        "db.executemany": executemany
+    })
+    conn.info.setdefault("trace_sql_spans", []).append(span)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """结束SQL span，写操作附带影响行数"""
+    spans = conn.info.get("trace_sql_spans")
+    if not spans:
+        return
+    span = spans.pop()
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        span.attributes["db.rows_affected"] = cursor.rowcount
+    span.end()
+    span.trace.last_sql_span = span
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _count_orm_rows(orm_execute_state):
+    """
+    ORM查询在追踪中时缓冲结果以统计返回行数（SQLite的SELECT没有rowcount）
+    
+    流式读取（yield_per）的查询不缓冲，保持内存占用与结果大小无关。
+    """
+    if _current_span.get() is None or not tracer.enabled or not orm_execute_state.is_select:
+        return None
+    if orm_execute_state.execution_options.get("yield_per") or orm_execute_state.execution_options.get("stream_results"):
+        return None
+    
+    result = orm_execute_state.invoke_statement()
+    frozen = result.freeze()
+    trace = _current_span.get().trace
+    if trace.last_sql_span is not None:
+        trace.last_sql_span.attributes["db.rows"] = len(frozen.data)
+    return frozen()
+
+
+class TracedRoute(APIRoute):
+    """
+    路由处理（依赖解析、路由函数与响应序列化）作为请求span下的子span
+    
+    各模块路由器以route_class=TracedRoute创建；未启用追踪时不包装。
+    """
+    
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        if not tracer.enabled:
+            return handler
+        
+        name = f"handler {self.name}"
+        function = f"{self.endpoint.__module__}.{self.endpoint.__qualname__}"
+        
+        async def traced_handler(request: Request) -> Response:
+            with tracer.start_span(name, **{"code.function": function, "http.route": self.path}):
+                return await handler(request)
+        return traced_handler
+
+
+async def tracing_middleware(request: Request, call_next):
+    """
+    为每个请求开始一条追踪，路由处理、服务方法与SQL语句作为子span
+    
+    支持W3C traceparent请求头传入追踪ID，响应头X-Trace-Id返回追踪ID。
+    """
+    if not tracer.enabled:
+        return await call_next(request)
+    
+    trace_id = None
+    traceparent = request.headers.get("traceparent", "")
+    parts = traceparent.split("-")
+    if len(parts) == 4 and len(parts[1]) == 32:
+        trace_id = parts[1]
+    
+    with tracer.start_trace(f"{request.method} {request.url.path}", trace_id, **{
+        "http.method": request.method,
+        "http.target": request.url.path
+    }) as span:
+        response = await call_next(request)
+        route = getattr(request.scope.get("route"), "path", None)
+        if route:
+            span.name = f"{request.method} {route}"
+            span.attributes["http.route"] = route
+        span.attributes["http.status_code"] = response.status_code
+        response.headers["X-Trace-Id"] = span.trace.trace_id
+        return response
\ No newline at end of file
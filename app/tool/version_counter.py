@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据版本计数器（ETag条件请求支持）
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from fastapi import Request, Response, status
+
+
+# 版本键：TextInfo与Phrase为全局计数，坐标按表格计数
+TEXT_INFO_VERSION_KEY = "text_info"
+PHRASE_VERSION_KEY = "phrase"
+TABLE_VERSION_KEY = "table"
+
+
+def coordinate_version_key(table_id: int) -> str:
+    """获取表格坐标的版本键"""
+    return f"coordinate:{table_id}"
+
+
+class VersionCounter:
+    """
+    版本计数器：镜像数据库中各版本键的全局版本号（version_state）
+    
+    ETag由全局版本号生成，所有进程、进程重启前后对同一数据给出相同的ETag。
+    写回存储中尚未写入数据库的编辑只有本进程可见，其ETag附加本进程标识与编辑序号。
+    """
+    
+    def __init__(self):
+        """初始化版本计数器"""
+        self._versions: Dict[str, int] = {}
+        # 本进程内存中尚未写回数据库的键 -> 最近一次编辑的序号
+        self._pending: Dict[str, int] = {}
+        self._sequence = 0
+        self._synced = False
+        self._listeners: List[Callable[..., None]] = []
+        self._refreshers: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        
+        # 进程标识：仅用于未写回编辑的ETag，不与其他进程或重启后的ETag误匹配
+        self._process_tag = format(time.time_ns(), "x")
+    
+    def get(self, key: str) -> int:
+        """获取键的当前全局版本号"""
+        return self._versions.get(key, 0)
+    
+    def load(self, versions: Dict[str, int]) -> None:
+        """
+        载入数据库中的全部全局版本号（只前进不后退），通知监听者全部失效
+        
+        Args:
+            versions: 版本键 -> 全局版本号（未出现的键为0）
+        """
+        with self._lock:
+            for key, version in versions.items():
+                if version > self._versions.get(key, 0):
+                    self._versions[key] = version
+            self._synced = True
+        
+        for listener in self._listeners:
+            listener()
+    
+    def advance(self, versions: Dict[str, int]) -> None:
+        """
+        更新一个或多个键的全局版本号（只前进不后退），并通知监听者（如响应缓存失效）
+        
+        服务层不直接调用，本进程的提交由mark_changed在事务提交后同步，
+        其他进程的写入由refresh同步过来。
+        
+        Args:
+            versions: 版本键 -> 全局版本号
+        """
+        with self._lock:
+            changed = [key for key, version in versions.items() if version > self._versions.get(key, 0)]
+            for key in changed:
+                self._versions[key] = versions[key]
+        
+        if changed:
+            for listener in self._listeners:
+                listener(*changed)
+    
+    def bump(self, *keys: str) -> None:
+        """
+        记录本进程内存中尚未写回数据库的编辑（写回存储），并通知监听者
+        
+        写回提交后由release解除，ETag恢复为全局版本号。
+        """
+        with self._lock:
+            for key in keys:
+                self._sequence += 1
+                self._pending[key] = self._sequence
+        
+        for listener in self._listeners:
+            listener(*keys)
+    
+    def release(self, *keys: str) -> None:
+        """内存中的编辑已全部写回数据库（全局版本号已前进），解除本进程的未写回标记"""
+        with self._lock:
+            for key in keys:
+                self._pending.pop(key, None)
+    
+    def reset(self) -> None:
+        """丢弃全部版本（无法确定变更范围时），重新同步前不生成ETag，通知监听者全部失效"""
+        with self._lock:
+            self._versions.clear()
+            self._synced = False
+        
+        for listener in self._listeners:
+            listener()
+    
+    def refresh(self) -> None:
+        """同步数据库中的全局版本号（含其他进程的写入），读取版本前调用"""
+        for refresher in self._refreshers:
+            refresher()
+    
+    def add_listener(self, listener: Callable[..., None]) -> None:
+        """注册版本变更监听者，参数为变更的键，无参数表示全部失效"""
+        self._listeners.append(listener)
+    
+    def add_refresher(self, refresher: Callable[[], None]) -> None:
+        """注册跨进程版本同步函数"""
+        self._refreshers.append(refresher)
+    
+    def etag(self, *keys: str) -> Optional[str]:
+        """
+        根据一个或多个键的全局版本号生成弱ETag
+        
+        Returns:
+            Optional[str]: 弱ETag；尚未与数据库同步时为None（不做条件请求与缓存）
+        """
+        with self._lock:
+            if not self._synced:
+                return None
+            parts = []
+            for key in keys:
+                version = str(self._versions.get(key, 0))
+                sequence = self._pending.get(key)
+                parts.append(version if sequence is None else f"{version}~{self._process_tag}.{sequence}")
+        return f'W/"{".".join(parts)}"'
+
+
+# 全局版本计数器实例
+version_counter = VersionCounter()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    判断If-None-Match请求头是否命中ETag
+    
+    Args:
+        if_none_match: If-None-Match请求头
+        etag: 当前ETag
+    
+    Returns:
+        bool: 命中返回True
+    """
+    if not if_none_match:
+        return False
+    
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def check_not_modified(request: Request, response: Response, *keys: str) -> Optional[Response]:
+    """
+    条件GET检查：必须在查询数据之前调用
+    
+    命中时返回304响应，调用方直接返回；未命中时在响应上设置ETag并返回None。
+    版本尚未与数据库同步时不设置ETag。
+    先取版本再查询，查询期间发生的写入只会让ETag偏旧，不会返回过期的304。
+    
+    Args:
+        request: 请求对象
+        response: 响应对象
+        keys: 响应所依赖数据的版本键
+    
+    Returns:
+        Optional[Response]: 304响应或None
+    """
+    version_counter.refresh()
+    etag = version_counter.etag(*keys)
+    if etag is None:
+        return None
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return None
\ No newline at end of file
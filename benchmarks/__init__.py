@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准测试模块（不属于pytest测试集）
+
+运行方式：
+    python -m benchmarks --sizes 1000,100000 --output benchmarks/results/local.json
+
+基准测试使用独立的临时数据库与坐标文件，直接调用服务层方法计时，
+结果以JSON输出（吞吐量、p50/p99延迟、峰值内存），用于版本间对比。
+"""
\ No newline at end of file
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试入口：python -m benchmarks [--sizes 1000,100000] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+
+# 可选的基准
+CASES = ("batch_import", "find_coordinates", "add_phrase", "delete_phrase", "delete_table", "generate_id")
+
+
+def _int_list(value: str) -> List[int]:
+    """逗号分隔的整数列表"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _git_revision() -> str:
+    """当前代码版本（无git时为unknown）"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def main() -> int:
+    """解析参数、准备临时数据库并运行基准"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="服务层热点方法基准测试")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"逗号分隔的基准名称，可选: {', '.join(CASES)}")
+    parser.add_argument("--sizes", type=_int_list, default=[1000, 100000], help="坐标基准的格子数（1k-10M）")
+    parser.add_argument("--vocabularies", type=_int_list, default=[1000, 10000], help="词汇基准的背景词汇数")
+    parser.add_argument("--words", type=int, default=50, help="add_phrase每次添加的词汇数")
+    parser.add_argument("--chain", type=int, default=50, help="delete_phrase编号序列长度")
+    parser.add_argument("--ids", type=int, default=100000, help="generate_id每次迭代生成的ID数")
+    parser.add_argument("--invalid-ratio", type=float, default=0.0, help="batch_import坐标文件中无效行的占比")
+    parser.add_argument("--repeat", type=int, default=10, help="计时迭代次数")
+    parser.add_argument("--warmup", type=int, default=1, help="预热迭代次数")
+    parser.add_argument("--workdir", default=None, help="临时数据库与坐标文件目录（默认新建临时目录）")
+    parser.add_argument("--output", default=None, help="JSON结果文件路径（默认输出到标准输出）")
+    args = parser.parse_args()
+    
+    selected = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in CASES]
+    if unknown:
+        parser.error(f"未知的基准: {', '.join(unknown)}")
+    
+    # 独立的数据库与坐标文件：须在导入app之前设置
+    temporary = args.workdir is None
+    workdir = args.workdir or tempfile.mkdtemp(prefix="cube-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    database_path = os.path.join(workdir, "bench.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(database_path + suffix):
+            os.remove(database_path + suffix)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ["COR_FILE_PATH"] = os.path.join(workdir, "cor.txt")
+    os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("WRITE_BEHIND_JOURNAL_PATH", os.path.join(workdir, "write_behind.journal"))
+    
+    from app.service.hot_grid import hot_grid_store
+    from app.service.write_queue import write_queue
+    from app.tool import change_log_poller, grid_store, log_pipeline
+    from . import cases
+    
+    log_pipeline.start()
+    results = []
+    started = time.time()
+    try:
+        cases.prepare_database()
+        for name in selected:
+            print(f"运行基准: {name}", file=sys.stderr)
+            if name == "batch_import":
+                results += cases.bench_batch_import(args.sizes, args.repeat, args.warmup, args.invalid_ratio)
+            elif name == "find_coordinates":
+                results += cases.bench_find_coordinates(args.sizes, args.repeat, args.warmup)
+            elif name == "add_phrase":
+                results += cases.bench_add_phrase(args.vocabularies, args.words, args.repeat, args.warmup)
+            elif name == "delete_phrase":
+                results += cases.bench_delete_phrase(args.vocabularies, args.chain, args.repeat, args.warmup)
+            elif name == "delete_table":
+                results += cases.bench_delete_table(args.sizes, args.repeat, args.warmup)
+            elif name == "generate_id":
+                results += cases.bench_generate_id(args.ids, args.repeat, args.warmup)
+    finally:
+        cases.cleanup()
+        write_queue.close()
+        hot_grid_store.close()
+        change_log_poller.close()
+        grid_store.unlink_created()
+        log_pipeline.stop()
+        if temporary:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+            "elapsed_s": round(time.time() - started, 3),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "workdir")}
+        },
+        "results": results
+    }
+    
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(payload)
+        print(f"结果已写入: {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
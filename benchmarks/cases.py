@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务层热点方法基准（须在设置DATABASE_URL/COR_FILE_PATH后导入）
+"""
+
+import os
+from typing import Any, Dict, List
+
+from sqlalchemy import delete
+
+from app.config.database import SessionLocal, init_db
+from app.config.settings import settings
+from app.models.phrase import Phrase
+from app.models.text_info import TextInfo
+from app.schemas.table import TableCreate
+from app.schemas.text_info import TextInfoColorUpdate
+from app.service.coordinate import CoordinateService
+from app.service.phrase import PhraseService
+from app.service.table import TableService
+from app.service.text_info import seed_text_info
+from app.tool import generate_id
+
+from .datagen import DEFAULT_ROOTS, phrase_vocabulary, suffixed_words, write_grid_file
+from .harness import measure, run_sync
+
+
+# 基准使用的颜色（TextInfo）
+BENCH_COLOR = 1
+
+
+def prepare_database() -> None:
+    """建表并补齐0-8号颜色的TextInfo"""
+    init_db()
+    db = SessionLocal()
+    try:
+        seed_text_info(db)
+    finally:
+        db.close()
+
+
+def bench_batch_import(sizes: List[int], repeat: int, warmup: int, invalid_ratio: float) -> List[Dict[str, Any]]:
+    """
+    CoordinateService.batch_import：每次迭代导入到新表格（全量写入路径）
+    
+    Args:
+        sizes: 格子数列表
+        repeat: 迭代次数
+        warmup: 预热次数
+        invalid_ratio: 无效行占比
+    
+    Returns:
+        List[Dict]: 各规模的基准结果
+    """
+    results = []
+    db = SessionLocal()
+    service = CoordinateService(db)
+    table_service = TableService(db)
+    try:
+        for cells in sizes:
+            write_grid_file(settings.cor_file_path, cells, seed=cells, invalid_ratio=invalid_ratio)
+            state = {}
+            
+            async def setup():
+                state["table_id"] = (await table_service.create_table(TableCreate(name=f"bench-import-{cells}"))).id
+            
+            results.append(measure(
+                "CoordinateService.batch_import",
+                lambda: service.batch_import(state["table_id"]),
+                setup=setup,
+                repeat=repeat,
+                warmup=warmup,
+                items=cells,
+                params={"cells": cells, "invalid_ratio": invalid_ratio}
+            ))
+    finally:
+        db.close()
+    return results
+
+
+def bench_find_coordinates(sizes: List[int], repeat: int, warmup: int) -> List[Dict[str, Any]]:
+    """
+    CoordinateService.find_coordinates_by_table：同一表格反复全量读取
+    
+    Args:
+        sizes: 格子数列表
+        repeat: 迭代次数
+        warmup: 预热次数
+    
+    Returns:
+        List[Dict]: 各规模的基准结果
+    """
+    results = []
+    db = SessionLocal()
+    service = CoordinateService(db)
+    try:
+        for cells in sizes:
+            write_grid_file(settings.cor_file_path, cells, seed=cells)
+            table_id = run_sync(lambda: TableService(db).create_table(TableCreate(name=f"bench-find-{cells}"))).id
+            run_sync(lambda: service.batch_import(table_id))
+            
+            results.append(measure(
+                "CoordinateService.find_coordinates_by_table",
+                lambda: service.find_coordinates_by_table(table_id),
+                repeat=repeat,
+                warmup=warmup,
+                items=cells,
+                params={"cells": cells}
+            ))
+    finally:
+        db.close()
+    return results
+
+
+def _reset_phrases(db, vocabulary: int) -> None:
+    """清空词汇并写入高冲突的背景词汇（不经过服务层，不计时）"""
+    db.execute(delete(Phrase))
+    text_id = db.query(TextInfo.id).filter(TextInfo.color == BENCH_COLOR + 1).scalar()
+    counts: Dict[str, int] = {}
+    rows = []
+    for word in phrase_vocabulary(vocabulary, seed=vocabulary):
+        counts[word] = counts.get(word, 0) + 1
+        numbered = word if counts[word] == 1 else f"{word}{counts[word]}"
+        rows.append({"id": generate_id(), "text_id": text_id, "word": numbered, "type": 0})
+    if rows:
+        db.execute(Phrase.__table__.insert(), rows)
+    db.query(TextInfo).filter(TextInfo.color == BENCH_COLOR).update({TextInfo.text: ""})
+    db.commit()
+
+
+def bench_add_phrase(vocabularies: List[int], words: int, repeat: int, warmup: int) -> List[Dict[str, Any]]:
+    """
+    PhraseService.add_phrase：背景词汇表越大、冲突越多，自动编号的代价越高
+    
+    Args:
+        vocabularies: 背景词汇数列表
+        words: 每次添加的词汇数
+        repeat: 迭代次数
+        warmup: 预热次数
+    
+    Returns:
+        List[Dict]: 各规模的基准结果
+    """
+    results = []
+    db = SessionLocal()
+    service = PhraseService(db)
+    try:
+        for vocabulary in vocabularies:
+            text = ", ".join(phrase_vocabulary(words, seed=words))[:1000].rstrip(", ")
+            
+            def setup():
+                # 添加的词汇会计入下一次的冲突计数，每次迭代重建背景词汇
+                _reset_phrases(db, vocabulary)
+            
+            results.append(measure(
+                "PhraseService.add_phrase",
+                lambda: service.add_phrase(TextInfoColorUpdate(color=BENCH_COLOR, text=text)),
+                setup=setup,
+                repeat=repeat,
+                warmup=warmup,
+                items=len(text.split(", ")),
+                params={"vocabulary": vocabulary, "words": words}
+            ))
+    finally:
+        db.close()
+    return results
+
+
+def bench_delete_phrase(vocabularies: List[int], chain: int, repeat: int, warmup: int) -> List[Dict[str, Any]]:
+    """
+    PhraseService.delete_phrase：删除编号词触发按词根前缀匹配的重编号
+    
+    Args:
+        vocabularies: 背景词汇数列表
+        chain: 被删除词所在编号序列的长度
+        repeat: 迭代次数
+        warmup: 预热次数
+    
+    Returns:
+        List[Dict]: 各规模的基准结果
+    """
+    results = []
+    db = SessionLocal()
+    service = PhraseService(db)
+    root = DEFAULT_ROOTS[0]
+    sequence = suffixed_words(root, chain)
+    remaining = ", ".join(word for word in sequence if word != f"{root}2")
+    try:
+        for vocabulary in vocabularies:
+            text_id = db.query(TextInfo.id).filter(TextInfo.color == BENCH_COLOR).scalar()
+            
+            def setup():
+                # 重编号会修改背景词汇，每次迭代重建以保证各次迭代的数据一致
+                _reset_phrases(db, vocabulary)
+                db.execute(Phrase.__table__.insert(), [
+                    {"id": generate_id(), "text_id": text_id, "word": word, "type": 0} for word in sequence
+                ])
+                db.query(TextInfo).filter(TextInfo.id == text_id).update({TextInfo.text: ", ".join(sequence)})
+                db.commit()
+            
+            results.append(measure(
+                "PhraseService.delete_phrase",
+                lambda: service.delete_phrase(TextInfoColorUpdate(color=BENCH_COLOR, text=remaining)),
+                setup=setup,
+                repeat=repeat,
+                warmup=warmup,
+                params={"vocabulary": vocabulary, "chain": chain}
+            ))
+    finally:
+        db.close()
+    return results
+
+
+def bench_delete_table(sizes: List[int], repeat: int, warmup: int) -> List[Dict[str, Any]]:
+    """
+    TableService.delete_table：删除已导入坐标的表格
+    
+    Args:
+        sizes: 格子数列表
+        repeat: 迭代次数
+        warmup: 预热次数
+    
+    Returns:
+        List[Dict]: 各规模的基准结果
+    """
+    results = []
+    db = SessionLocal()
+    table_service = TableService(db)
+    coordinate_service = CoordinateService(db)
+    try:
+        for cells in sizes:
+            write_grid_file(settings.cor_file_path, cells, seed=cells)
+            state = {}
+            
+            async def setup():
+                state["table_id"] = (await table_service.create_table(TableCreate(name=f"bench-delete-{cells}"))).id
+                await coordinate_service.batch_import(state["table_id"])
+            
+            results.append(measure(
+                "TableService.delete_table",
+                lambda: table_service.delete_table(state["table_id"]),
+                setup=setup,
+                repeat=repeat,
+                warmup=warmup,
+                items=cells,
+                params={"cells": cells}
+            ))
+    finally:
+        db.close()
+    return results
+
+
+def bench_generate_id(count: int, repeat: int, warmup: int) -> List[Dict[str, Any]]:
+    """
+    generate_id：每次迭代连续生成count个ID
+    
+    Args:
+        count: 每次迭代生成的ID数
+        repeat: 迭代次数
+        warmup: 预热次数
+    
+    Returns:
+        List[Dict]: 基准结果
+    """
+    def run():
+        for _ in range(count):
+            generate_id()
+    
+    return [measure("generate_id", run, repeat=repeat, warmup=warmup, items=count, params={"count": count})]
+
+
+def cleanup() -> None:
+    """删除基准生成的坐标文件"""
+    if os.path.exists(settings.cor_file_path):
+        os.remove(settings.cor_file_path)
\ No newline at end of file
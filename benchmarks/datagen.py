@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试合成数据生成（坐标文件、高冲突词汇表）
+"""
+
+import math
+import random
+from typing import List
+
+
+# 词根：前缀互相包含（红/红色/红色系），LIKE前缀匹配会命中多个词根
+DEFAULT_ROOTS = ("红", "红色", "红色系", "蓝", "蓝色", "绿", "绿叶", "绿叶子", "黄", "黄金")
+
+
+def write_grid_file(path: str, cells: int, seed: int = 0, invalid_ratio: float = 0.0) -> int:
+    """
+    生成cor.txt格式的坐标文件（近似正方形网格，逐行写入，内存占用与大小无关）
+    
+    Args:
+        path: 输出文件路径
+        cells: 格子数
+        seed: 随机种子
+        invalid_ratio: 无效行（格式错误或颜色越界）占比
+    
+    Returns:
+        int: 写入的行数
+    """
+    rng = random.Random(seed)
+    width = max(1, math.isqrt(cells - 1) + 1) if cells > 0 else 1
+    lines = 0
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as file:
+        buffer = []
+        for i in range(cells):
+            x, y = divmod(i, width)
+            if invalid_ratio and rng.random() < invalid_ratio:
+                buffer.append(f"（{x}， {y}） 9\n" if rng.random() < 0.5 else f"bad line {i}\n")
+            else:
+                buffer.append(f"（{x}， {y}） {rng.randint(0, 8)}\n")
+            if len(buffer) >= 10000:
+                file.writelines(buffer)
+                lines += len(buffer)
+                buffer = []
+        file.writelines(buffer)
+        lines += len(buffer)
+    return lines
+
+
+def phrase_vocabulary(count: int, seed: int = 0, roots: tuple = DEFAULT_ROOTS, distinct: int = 50) -> List[str]:
+    """
+    生成高冲突词汇表：少量词根反复出现，add_phrase会为重复词追加数字后缀，
+    delete_phrase按词根前缀匹配重编号时命中大量词汇
+    
+    Args:
+        count: 词汇数
+        seed: 随机种子
+        roots: 词根
+        distinct: 词根派生出的不同词汇数上限
+    
+    Returns:
+        List[str]: 词汇列表（含重复）
+    """
+    rng = random.Random(seed)
+    variants = [roots[i % len(roots)] + ("" if i < len(roots) else chr(0x4E00 + i)) for i in range(distinct)]
+    return [rng.choice(variants) for _ in range(count)]
+
+
+def suffixed_words(root: str, count: int) -> List[str]:
+    """
+    同一词根的编号序列（root, root2, root3...），与add_phrase的自动编号一致
+    
+    Args:
+        root: 词根
+        count: 数量
+    
+    Returns:
+        List[str]: 编号词汇
+    """
+    return [root] + [f"{root}{n}" for n in range(2, count + 1)]
\ No newline at end of file
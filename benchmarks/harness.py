@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试计时工具（多次迭代计时、分位数统计、tracemalloc峰值内存）
+"""
+
+import asyncio
+import inspect
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    线性插值分位数
+    
+    Args:
+        samples: 已排序的样本
+        fraction: 分位（0-1）
+    
+    Returns:
+        float: 分位数，无样本时为0
+    """
+    if not samples:
+        return 0.0
+    position = (len(samples) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+# 驱动服务层协程的事件循环（全部基准共用）
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_sync(fn: Callable[[], Any]) -> Any:
+    """
+    调用同步函数或驱动协程函数（服务层方法为async）
+    
+    Args:
+        fn: 无参函数
+    
+    Returns:
+        Any: 函数返回值
+    """
+    global _loop
+    result = fn()
+    if inspect.isawaitable(result):
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+        result = _loop.run_until_complete(result)
+    return result
+
+
+def measure(
+    name: str,
+    run: Callable[[], Any],
+    setup: Optional[Callable[[], Any]] = None,
+    repeat: int = 10,
+    warmup: int = 1,
+    items: int = 1,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    多次执行并统计耗时
+    
+    每次迭代前执行setup（不计时）；计时迭代不开启tracemalloc，
+    结束后另做一次开启tracemalloc的迭代测量峰值内存。
+    
+    Args:
+        name: 基准名称（如"CoordinateService.batch_import"）
+        run: 被测函数（可为协程函数）
+        setup: 每次迭代前的准备函数
+        repeat: 计时迭代次数
+        warmup: 预热迭代次数（不计入统计）
+        items: 每次迭代处理的条目数（格子、词汇、ID等），用于计算吞吐量
+        params: 记录到结果中的参数
+    
+    Returns:
+        Dict: 基准结果
+    """
+    for _ in range(warmup):
+        if setup:
+            run_sync(setup)
+        run_sync(run)
+    
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            run_sync(setup)
+        started = time.perf_counter()
+        run_sync(run)
+        durations.append(time.perf_counter() - started)
+    
+    # 峰值内存：单独一次迭代，只统计被测函数内的分配
+    if setup:
+        run_sync(setup)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        run_sync(run)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    durations.sort()
+    total = sum(durations)
+    return {
+        "name": name,
+        "params": params or {},
+        "iterations": repeat,
+        "items_per_iteration": items,
+        "throughput_per_s": round(items * repeat / total, 3) if total else None,
+        "mean_ms": round(total / repeat * 1000, 4) if repeat else None,
+        "min_ms": round(durations[0] * 1000, 4) if durations else None,
+        "p50_ms": round(percentile(durations, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(durations, 0.99) * 1000, 4),
+        "max_ms": round(durations[-1] * 1000, 4) if durations else None,
+        "peak_memory_bytes": peak - baseline
+    }
\ No newline at end of file
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP压测工具：python -m benchmarks.load [--url http://127.0.0.1:8000] [--mix read-heavy]
+
+基于httpx.AsyncClient，未指定--url时在进程内直接驱动ASGI应用（含lifespan）。
+多个虚拟用户按权重混合执行：坐标轮询（携带ETag）、连续涂色更新、词汇增删，
+按接口统计吞吐量、p50/p95/p99延迟、错误率与数据库锁冲突错误。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from .harness import percentile
+
+
+# 预置的流量组合：操作 -> 权重
+MIXES = {
+    "read-heavy": {"find": 90, "update": 5, "phrase": 5},
+    "painting": {"find": 30, "update": 70},
+    "editing": {"find": 40, "phrase": 60},
+    "mixed": {"find": 60, "update": 25, "phrase": 15}
+}
+
+# 数据库锁冲突的错误特征（SQLite busy/locked）
+LOCK_MARKERS = ("database is locked", "database is busy", "SQLITE_BUSY", "SQLITE_LOCKED")
+
+
+class EndpointStats:
+    """单个接口的延迟样本与错误计数"""
+    
+    __slots__ = ("latencies", "errors", "lock_errors", "statuses")
+    
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.lock_errors = 0
+        self.statuses: Dict[str, int] = {}
+    
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """统计摘要"""
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "requests": count,
+            "throughput_per_s": round(count / elapsed, 3) if elapsed else None,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3) if latencies else None,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 5) if count else 0.0,
+            "lock_errors": self.lock_errors,
+            "statuses": dict(sorted(self.statuses.items()))
+        }
+
+
+class LoadRunner:
+    """虚拟用户调度与结果统计"""
+    
+    def __init__(self, client: httpx.AsyncClient, table_id: str, cells: List[Tuple[str, str]], args: argparse.Namespace):
+        """
+        初始化压测
+        
+        Args:
+            client: HTTP客户端
+            table_id: 压测使用的表格ID
+            cells: (坐标ID, 位置)列表
+            args: 命令行参数
+        """
+        self.client = client
+        self.table_id = table_id
+        self.cells = cells
+        self.args = args
+        self.mix = parse_mix(args.mix)
+        self.stats: Dict[str, EndpointStats] = {}
+        # 同一颜色的词汇文本由一个用户修改，客户端按颜色串行
+        self._color_locks = [asyncio.Lock() for _ in range(9)]
+    
+    async def request(self, endpoint: str, method: str, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+        """
+        发送请求并记录延迟与错误
+        
+        Args:
+            endpoint: 统计使用的接口名
+            method: HTTP方法
+            url: 请求路径
+            kwargs: httpx请求参数
+        
+        Returns:
+            Optional[httpx.Response]: 响应，连接错误或超时时为None
+        """
+        stats = self.stats.setdefault(endpoint, EndpointStats())
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            stats.latencies.append(time.perf_counter() - started)
+            stats.errors += 1
+            key = type(e).__name__
+            stats.statuses[key] = stats.statuses.get(key, 0) + 1
+            return None
+        
+        stats.latencies.append(time.perf_counter() - started)
+        key = str(response.status_code)
+        stats.statuses[key] = stats.statuses.get(key, 0) + 1
+        if response.status_code >= 400:
+            stats.errors += 1
+            if any(marker in response.text for marker in LOCK_MARKERS):
+                stats.lock_errors += 1
+        return response
+    
+    async def poll(self, user: Dict[str, Any]) -> None:
+        """坐标轮询：携带上次的ETag，未变化时服务端返回304"""
+        headers = {"If-None-Match": user["etag"]} if user.get("etag") and not self.args.no_etag else {}
+        response = await self.request(
+            "GET /api/coordinate/find", "GET", "/api/coordinate/find",
+            params={"id": self.table_id}, headers=headers
+        )
+        if response is not None and response.status_code == 200:
+            user["etag"] = response.headers.get("etag")
+    
+    async def paint(self, user: Dict[str, Any]) -> None:
+        """连续涂色：从随机位置开始连续更新一串格子"""
+        start = random.randrange(len(self.cells))
+        color = random.randint(0, 8)
+        for offset in range(self.args.burst):
+            coordinate_id, position = self.cells[(start + offset) % len(self.cells)]
+            await self.request("PUT /api/coordinate/update", "PUT", "/api/coordinate/update", json={
+                "id": coordinate_id,
+                "table_id": self.table_id,
+                "color": color,
+                "position": position,
+                "voc": "",
+                "repeated": 0
+            })
+    
+    async def edit_phrase(self, user: Dict[str, Any]) -> None:
+        """词汇编辑：添加一个重复词（触发自动编号），再删除"""
+        color = random.randint(0, 8)
+        async with self._color_locks[color]:
+            response = await self.request("GET /api/text/find", "GET", "/api/text/find")
+            if response is None or response.status_code != 200:
+                return
+            current = next((item["text"] or "" for item in response.json() if item["color"] == color), "")
+            word = random.choice(("红", "红色", "蓝", "绿叶"))
+            added = f"{current}, {word}" if current else word
+            if len(added) > 1000:
+                added, current = word, ""
+            
+            await self.request("POST /api/phrase/add", "POST", "/api/phrase/add", json={"color": color, "text": added})
+            await self.request("DELETE /api/phrase/delete", "DELETE", "/api/phrase/delete", json={"color": color, "text": current})
+    
+    async def user(self, deadline: float, budget: List[int]) -> None:
+        """单个虚拟用户：按权重循环选择操作直到截止时间或请求数用完"""
+        state: Dict[str, Any] = {}
+        operations = {"find": self.poll, "update": self.paint, "phrase": self.edit_phrase}
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.perf_counter() < deadline and budget[0] > 0:
+            budget[0] -= 1
+            await operations[random.choices(names, weights)[0]](state)
+            if self.args.think_ms:
+                await asyncio.sleep(random.uniform(0, self.args.think_ms * 2) / 1000)
+    
+    async def run(self) -> Dict[str, Any]:
+        """执行压测"""
+        budget = [self.args.operations or sys.maxsize]
+        started = time.perf_counter()
+        deadline = started + self.args.duration
+        await asyncio.gather(*(self.user(deadline, budget) for _ in range(self.args.concurrency)))
+        elapsed = time.perf_counter() - started
+        
+        overall = EndpointStats()
+        for stats in self.stats.values():
+            overall.latencies += stats.latencies
+            overall.errors += stats.errors
+            overall.lock_errors += stats.lock_errors
+            for key, count in stats.statuses.items():
+                overall.statuses[key] = overall.statuses.get(key, 0) + count
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "overall": overall.summary(elapsed),
+            "endpoints": {endpoint: stats.summary(elapsed) for endpoint, stats in sorted(self.stats.items())}
+        }
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """
+    解析流量组合：预置名称或"find=80,update=15,phrase=5"
+    
+    Args:
+        value: 组合描述
+    
+    Returns:
+        Dict[str, int]: 操作 -> 权重
+    """
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ("find", "update", "phrase") or not weight.strip().isdigit():
+            raise ValueError(f"无效的流量组合: {item}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("流量组合的权重不能全为0")
+    return mix
+
+
+@asynccontextmanager
+async def open_client(args: argparse.Namespace) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    创建HTTP客户端：指定--url时连接运行中的服务，否则在进程内驱动ASGI应用
+    
+    进程内模式使用临时数据库与生成的坐标文件，须在导入应用前设置环境变量。
+    """
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+            yield client
+        return
+    
+    workdir = tempfile.mkdtemp(prefix="cube-load-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'load.db')}"
+    os.environ["COR_FILE_PATH"] = os.path.join(workdir, "cor.txt")
+    os.environ["WRITE_BEHIND_JOURNAL_PATH"] = os.path.join(workdir, "write_behind.journal")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    
+    from .datagen import write_grid_file
+    write_grid_file(os.environ["COR_FILE_PATH"], args.cells, seed=args.cells)
+    
+    from app.config.database import SessionLocal
+    from app.models.text_info import TextInfo
+    from app.tool import generate_id
+    from main import app
+    
+    try:
+        async with app.router.lifespan_context(app):
+            db = SessionLocal()
+            try:
+                existing = {color for (color,) in db.query(TextInfo.color)}
+                db.add_all([TextInfo(id=generate_id(), color=color, text="") for color in range(9) if color not in existing])
+                db.commit()
+            finally:
+                db.close()
+            
+            async with httpx.AsyncClient(app=app, base_url="http://loadtest", limits=limits, timeout=timeout) as client:
+                yield client
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def prepare_table(client: httpx.AsyncClient, table_id: Optional[str]) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    准备压测表格：未指定时新建表格并从服务端的cor.txt导入
+    
+    Returns:
+        Tuple: (表格ID, (坐标ID, 位置)列表)
+    """
+    if table_id is None:
+        response = await client.post("/api/table/add", json={"name": f"loadtest-{int(time.time())}"})
+        response.raise_for_status()
+        table_id = response.json()["id"]
+        response = await client.get("/api/coordinate/batch", params={"id": table_id})
+        response.raise_for_status()
+    
+    response = await client.get("/api/coordinate/find", params={"id": table_id})
+    response.raise_for_status()
+    cells = [(item["id"], item["position"]) for item in response.json()["coordinates"]]
+    if not cells:
+        raise RuntimeError(f"表格 {table_id} 没有坐标，无法压测")
+    return table_id, cells
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    """准备数据并执行压测"""
+    async with open_client(args) as client:
+        table_id, cells = await prepare_table(client, args.table_id)
+        runner = LoadRunner(client, table_id, cells, args)
+        result = await runner.run()
+    
+    return {
+        "meta": {
+            "target": args.url or "in-process",
+            "mix": runner.mix,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "burst": args.burst,
+            "cells": len(cells)
+        },
+        **result
+    }
+
+
+def main() -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="API混合流量压测")
+    parser.add_argument("--url", default=None, help="目标服务地址（如http://127.0.0.1:8000），默认进程内运行")
+    parser.add_argument("--mix", default="read-heavy", help=f"流量组合：{'/'.join(MIXES)}，或find=80,update=15,phrase=5")
+    parser.add_argument("--concurrency", type=int, default=32, help="虚拟用户数")
+    parser.add_argument("--duration", type=float, default=10.0, help="持续时间（秒）")
+    parser.add_argument("--operations", type=int, default=0, help="总操作数上限（0表示只按时间）")
+    parser.add_argument("--burst", type=int, default=10, help="每次涂色连续更新的格子数")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="操作间的平均等待时间（毫秒）")
+    parser.add_argument("--no-etag", action="store_true", help="轮询时不携带ETag")
+    parser.add_argument("--table-id", default=None, help="使用已有表格（默认新建并导入）")
+    parser.add_argument("--cells", type=int, default=10000, help="进程内模式生成的格子数")
+    parser.add_argument("--timeout", type=float, default=30.0, help="单个请求超时（秒）")
+    parser.add_argument("--output", default=None, help="JSON结果文件路径（默认输出到标准输出）")
+    args = parser.parse_args()
+    
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    report = asyncio.run(main_async(args))
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(payload)
+    else:
+        print(payload)
+    
+    for endpoint, summary in report["endpoints"].items():
+        print(
+            f"{endpoint:<28} {summary['requests']:>7} req {summary['throughput_per_s']:>9} req/s "
+            f"p50 {summary['p50_ms']:>8}ms p95 {summary['p95_ms']:>8}ms p99 {summary['p99_ms']:>8}ms "
+            f"错误 {summary['error_rate']:.2%} 锁冲突 {summary['lock_errors']}",
+            file=sys.stderr
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
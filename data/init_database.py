@@ -1,215 +1,101 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-SQLite数据库初始化脚本
+SQLite数据库初始化脚本（与应用启动共用app.config.schema中由模型生成的表结构与迁移）
+
+运行方式：
+    python data/init_database.py [--db-path ./cube.db]
+
+未指定--db-path时使用应用配置中的DATABASE_URL（默认./cube.db）。
 """
 
-import sqlite3
-import time
-import threading
+import argparse
+import os
+import sys
 from typing import Optional
 
-
-class SnowflakeIDGenerator:
-    """雪花算法ID生成器"""
-    
-    def __init__(self, datacenter_id: int = 1, worker_id: int = 1):
-        self.datacenter_id = datacenter_id
-        self.worker_id = worker_id
-        self.sequence = 0
-        self.last_timestamp = -1
-        self.lock = threading.Lock()
-        
-        # 64位ID的组成部分
-        self.DATACENTER_ID_BITS = 5
-        self.WORKER_ID_BITS = 5
-        self.SEQUENCE_BITS = 12
-        
-        # 最大值
-        self.MAX_DATACENTER_ID = -1 ^ (-1 << self.DATACENTER_ID_BITS)
-        self.MAX_WORKER_ID = -1 ^ (-1 << self.WORKER_ID_BITS)
-        self.MAX_SEQUENCE = -1 ^ (-1 << self.SEQUENCE_BITS)
-        
-        # 偏移量
-        self.WORKER_ID_SHIFT = self.SEQUENCE_BITS
-        self.DATACENTER_ID_SHIFT = self.SEQUENCE_BITS + self.WORKER_ID_BITS
-        self.TIMESTAMP_LEFT_SHIFT = self.SEQUENCE_BITS + self.WORKER_ID_BITS + self.DATACENTER_ID_BITS
-        
-        # 起始时间戳 (2023-01-01 00:00:00 UTC)
-        self.TWEPOCH = 1672531200000
-        
-        if self.worker_id > self.MAX_WORKER_ID or self.worker_id < 0:
-            raise ValueError(f'worker_id超出范围: {self.worker_id}')
-        if self.datacenter_id > self.MAX_DATACENTER_ID or self.datacenter_id < 0:
-            raise ValueError(f'datacenter_id超出范围: {self.datacenter_id}')
-    
-    def _get_timestamp(self) -> int:
-        """获取当前时间戳（毫秒）"""
-        return int(time.time() * 1000)
-    
-    def _wait_for_next_millis(self, last_timestamp: int) -> int:
-        """等待到下一个毫秒"""
-        timestamp = self._get_timestamp()
-        while timestamp <= last_timestamp:
-            timestamp = self._get_timestamp()
-        return timestamp
-    
-    def generate_id(self) -> int:
-        """生成唯一ID"""
-        with self.lock:
-            timestamp = self._get_timestamp()
-            
-            if timestamp < self.last_timestamp:
-                raise RuntimeError('时钟回拨，拒绝生成ID')
-            
-            if timestamp == self.last_timestamp:
-                self.sequence = (self.sequence + 1) & self.MAX_SEQUENCE
-                if self.sequence == 0:
-                    timestamp = self._wait_for_next_millis(self.last_timestamp)
-            else:
-                self.sequence = 0
-            
-            self.last_timestamp = timestamp
-            
-            return ((timestamp - self.TWEPOCH) << self.TIMESTAMP_LEFT_SHIFT) | \
-                   (self.datacenter_id << self.DATACENTER_ID_SHIFT) | \
-                   (self.worker_id << self.WORKER_ID_SHIFT) | \
-                   self.sequence
+# 项目根目录加入导入路径（直接以脚本方式运行时）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 class DatabaseInitializer:
     """数据库初始化器"""
     
-    def __init__(self, db_path: str = "./cube.db"):
-        self.db_path = db_path
-        self.id_generator = SnowflakeIDGenerator()
+    def __init__(self, db_path: Optional[str] = None):
+        # 数据库地址须在导入app之前设置（引擎在导入时创建）
+        if db_path:
+            os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+        from app.config.settings import settings
+        self.database_url = settings.database_url
     
     def create_database(self):
-        """创建SQLite数据库和表结构"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """按模型创建SQLite数据库和表结构，并迁移旧版脚本创建的表"""
+        from app.config.database import init_db
         
         try:
-            # 创建Table表
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS "Table" (
-                    id BIGINT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    create_time DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 创建TextInfo表
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS TextInfo (
-                    id BIGINT PRIMARY KEY,
-                    color INTEGER NOT NULL UNIQUE CHECK (color >= 0 AND color <= 8),
-                    text TEXT DEFAULT ''
-                )
-            ''')
-            
-            # 创建Phrase表
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS Phrase (
-                    id BIGINT PRIMARY KEY,
-                    text_id BIGINT NOT NULL,
-                    word VARCHAR(255) NOT NULL,
-                    type INTEGER NOT NULL DEFAULT 0,
-                    FOREIGN KEY (text_id) REFERENCES TextInfo(id)
-                )
-            ''')
-            
-            # 创建Coordinate表
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS Coordinate (
-                    id BIGINT PRIMARY KEY,
-                    tableId BIGINT NOT NULL,
-                    color INTEGER NOT NULL CHECK (color >= 0 AND color <= 8),
-                    position VARCHAR(255) NOT NULL,
-                    voc VARCHAR(255),
-                    repeated INTEGER NOT NULL DEFAULT 0,
-                    FOREIGN KEY (tableId) REFERENCES "Table"(id)
-                )
-            ''')
-            
-            conn.commit()
+            init_db()
             print("数据库表结构创建成功")
-            
+        
         except Exception as e:
             print(f"创建数据库表结构失败: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
     
     def insert_text_info_data(self):
         """插入TextInfo基础数据"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        from app.config.database import SessionLocal
+        from app.service.text_info import seed_text_info
         
+        db = SessionLocal()
         try:
-            # 检查是否已有数据
-            cursor.execute("SELECT COUNT(*) FROM TextInfo")
-            count = cursor.fetchone()[0]
-            
-            if count > 0:
+            inserted = seed_text_info(db)
+            if inserted:
+                print(f"TextInfo基础数据插入成功: {inserted} 条")
+            else:
                 print("TextInfo表已有数据，跳过插入")
-                return
-            
-            # 插入9条记录，color分别为0-8
-            for color in range(9):
-                text_id = self.id_generator.generate_id()
-                cursor.execute(
-                    "INSERT INTO TextInfo (id, color, text) VALUES (?, ?, ?)",
-                    (text_id, color, "")
-                )
-            
-            conn.commit()
-            print("TextInfo基础数据插入成功")
-            
+        
         except Exception as e:
             print(f"插入TextInfo数据失败: {e}")
-            conn.rollback()
+            db.rollback()
             raise
         finally:
-            conn.close()
+            db.close()
     
     def verify_database(self):
         """验证数据库结构"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        from sqlalchemy import inspect
+        from app.config.database import Base, SessionLocal, engine
+        from app.models import TextInfo
         
+        db = SessionLocal()
         try:
-            # 检查表是否存在
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name IN ('Table', 'TextInfo', 'Phrase', 'Coordinate')
-            """)
-            tables = [row[0] for row in cursor.fetchall()]
+            # 检查表与索引是否与模型一致
+            inspector = inspect(engine)
+            tables = inspector.get_table_names()
             print(f"已创建的表: {tables}")
-            
-            # 检查TextInfo数据
-            cursor.execute("SELECT COUNT(*) FROM TextInfo")
-            text_info_count = cursor.fetchone()[0]
-            print(f"TextInfo表记录数: {text_info_count}")
+            missing = [table.name for table in Base.metadata.sorted_tables if table.name not in tables]
+            if missing:
+                raise RuntimeError(f"缺少数据表: {missing}")
+            for table in Base.metadata.sorted_tables:
+                indexes = [index["name"] for index in inspector.get_indexes(table.name)]
+                print(f"  {table.name} 索引: {indexes}")
             
             # 显示TextInfo数据
-            cursor.execute("SELECT id, color, text FROM TextInfo ORDER BY color")
-            text_info_data = cursor.fetchall()
+            text_infos = db.query(TextInfo).order_by(TextInfo.color).all()
+            print(f"TextInfo表记录数: {len(text_infos)}")
             print("TextInfo数据:")
-            for row in text_info_data:
-                print(f"  ID: {row[0]}, Color: {row[1]}, Text: '{row[2]}'")
-                
+            for text_info in text_infos:
+                print(f"  ID: {text_info.id}, Color: {text_info.color}, Text: '{text_info.text}'")
+        
         except Exception as e:
             print(f"验证数据库失败: {e}")
             raise
         finally:
-            conn.close()
+            db.close()
     
     def initialize_database(self):
         """执行完整的数据库初始化"""
         print("开始初始化SQLite数据库...")
-        print(f"数据库路径: {self.db_path}")
+        print(f"数据库地址: {self.database_url}")
         
         try:
             # 创建数据库和表结构
@@ -222,7 +108,7 @@ class DatabaseInitializer:
             self.verify_database()
             
             print("数据库初始化完成！")
-            
+        
         except Exception as e:
             print(f"数据库初始化失败: {e}")
             raise
@@ -230,9 +116,13 @@ class DatabaseInitializer:
 
 def main():
     """主函数"""
-    initializer = DatabaseInitializer()
+    parser = argparse.ArgumentParser(description="初始化SQLite数据库")
+    parser.add_argument("--db-path", default=None, help="数据库文件路径（默认使用DATABASE_URL）")
+    args = parser.parse_args()
+    
+    initializer = DatabaseInitializer(args.db_path)
     initializer.initialize_database()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
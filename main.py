@@ -4,10 +4,65 @@
 项目主入口文件
 """
 
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI
+
+from app.config.database import init_db
+from app.config.settings import settings
+from app.routers import metrics_router
+from app.routers.main import api_router
+from app.service.hot_grid import hot_grid_store
+from app.service.import_job import recover_import_jobs, shutdown_import_executor
+from app.service.warmup import startup_timer, warm_up
+from app.service.write_queue import write_queue
+from app.tool import change_log_poller, grid_store, metrics_middleware, query_inspector_middleware, profiling_middleware, memory_middleware, tracer, tracing_middleware, log_pipeline
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动日志管道、建表、清理变更日志、重放写回日志、恢复导入任务并预热（各阶段计时），关闭时写回并释放资源"""
+    log_pipeline.start()
+    with startup_timer.phase("init_db"):
+        init_db()
+    with startup_timer.phase("change_log_prune"):
+        change_log_poller.prune()
+    with startup_timer.phase("write_behind_replay"):
+        hot_grid_store.start()
+    with startup_timer.phase("recover_import_jobs"):
+        recover_import_jobs()
+    if settings.warmup_enabled:
+        await warm_up(startup_timer)
+    startup_timer.finish()
+    yield
+    shutdown_import_executor()
+    write_queue.close()
+    hot_grid_store.close()
+    change_log_poller.close()
+    grid_store.unlink_created()
+    tracer.close()
+    log_pipeline.stop()
+
+
+# 应用实例
+app = FastAPI(title="Cube Backend", debug=settings.debug, lifespan=lifespan)
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(memory_middleware)
+if settings.debug and settings.sql_inspect_enabled:
+    app.middleware("http")(query_inspector_middleware)
+if settings.profile_token:
+    app.middleware("http")(profiling_middleware)
+if settings.tracing_enabled:
+    app.middleware("http")(tracing_middleware)
+app.include_router(api_router)
+app.include_router(metrics_router)
+
+
 def main():
     """主函数"""
-    print("项目启动成功！")
+    uvicorn.run("main:app", host=settings.host, port=settings.port)
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
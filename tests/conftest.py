@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共配置：导入应用之前将数据库与数据文件指向临时目录
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, Iterator
+
+import pytest
+
+# 引擎与设置在导入app时创建，环境变量须在此之前设置
+TEST_DIR = tempfile.mkdtemp(prefix="cube-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'cube.db')}"
+os.environ["COR_FILE_PATH"] = os.path.join(TEST_DIR, "cor.txt")
+os.environ["WRITE_BEHIND_JOURNAL_PATH"] = os.path.join(TEST_DIR, "write_behind.journal")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """启动应用（执行lifespan建表与预热）并补齐TextInfo基础数据"""
+    from main import app
+    from app.config.database import SessionLocal
+    from app.service.text_info import seed_text_info
+    
+    with TestClient(app) as test_client:
+        db = SessionLocal()
+        try:
+            seed_text_info(db)
+        finally:
+            db.close()
+        yield test_client
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db(client: TestClient) -> Iterator[Session]:
+    """写连接上的数据库会话"""
+    from app.config.database import SessionLocal
+    
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def write_cor() -> Callable[[Dict[str, int]], None]:
+    """写入坐标文件：位置 -> 颜色"""
+    def write(cells: Dict[str, int]) -> None:
+        with open(os.environ["COR_FILE_PATH"], "w", encoding="utf-8") as file:
+            for position, color in cells.items():
+                file.write(f"{position} {color}\n")
+    return write
+
+
+def grid(width: int, height: int, offset: int = 0) -> Dict[str, int]:
+    """width x height的坐标网格，颜色按位置循环"""
+    return {f"({x}, {y})": (x + y + offset) % 9 for x in range(width) for y in range(height)}
\ No newline at end of file
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+跨进程缓存一致性测试：其他进程的提交经变更日志使本进程的ETag与响应缓存失效
+"""
+
+import sqlite3
+
+from app.config.database import SQLITE_FILE_PATH, engine
+from app.tool import TABLE_VERSION_KEY, change_log_poller
+
+
+def _commit_from_other_process(name: str) -> int:
+    """模拟其他进程：在独立连接上新增表格并写入变更日志与全局版本号"""
+    connection = sqlite3.connect(SQLITE_FILE_PATH)
+    try:
+        table_id = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM table_info").fetchone()[0]
+        connection.execute(
+            "INSERT INTO table_info (id, name, create_time) VALUES (?, ?, CURRENT_TIMESTAMP)", (table_id, name)
+        )
+        connection.execute(
+            "INSERT INTO change_log (version_key, create_time) VALUES (?, CURRENT_TIMESTAMP)", (TABLE_VERSION_KEY,)
+        )
+        connection.execute(
+            "INSERT INTO version_state (version_key, version) VALUES (?, 1) "
+            "ON CONFLICT (version_key) DO UPDATE SET version = version + 1",
+            (TABLE_VERSION_KEY,)
+        )
+        connection.commit()
+        return table_id
+    finally:
+        connection.close()
+
+
+def test_other_process_commit_invalidates_cache(client):
+    """其他进程提交后，条件请求不再返回304，缓存的列表被重新查询"""
+    params = {"limit": 5}
+    first = client.get("/api/table/page", params=params)
+    etag = first.headers["ETag"]
+    assert client.get("/api/table/page", params=params, headers={"If-None-Match": etag}).status_code == 304
+    
+    table_id = _commit_from_other_process("other-process-table")
+    changed = client.get("/api/table/page", params=params, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert str(table_id) in [table["id"] for table in changed.json()["tables"]]
+
+
+def test_poller_does_not_hold_pooled_connection(client):
+    """轮询使用独立连接，不长期占用写引擎连接池"""
+    change_log_poller.close()
+    checked_out = engine.pool.checkedout()
+    change_log_poller.poll()
+    assert engine.pool.checkedout() == checked_out
\ No newline at end of file
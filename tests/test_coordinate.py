@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Coordinate导入测试：增量导入、重复导入不写入
+"""
+
+import asyncio
+
+from app.service.coordinate import CoordinateService
+from app.tool import capture_queries
+
+from .conftest import grid
+
+# 修改数据的语句
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+
+def _create_table(client, name: str) -> str:
+    """创建表格，返回ID"""
+    return client.post("/api/table/add", json={"name": name}).json()["id"]
+
+
+def _import(db, table_id: str):
+    """执行一次导入，返回结果与执行的语句形态"""
+    with capture_queries() as recorder:
+        result = asyncio.run(CoordinateService(db).batch_import(int(table_id)))
+    return result, [shape for shape, _ in recorder.statements]
+
+
+def _writes(shapes: list) -> list:
+    """修改数据的语句"""
+    return [shape for shape in shapes if shape.lstrip().upper().startswith(WRITE_PREFIXES)]
+
+
+def test_reimport_same_file_is_noop(client, db, write_cor):
+    """文件内容未变化时重复导入不写入，语句数与格子数无关"""
+    table_id = _create_table(client, "reimport")
+    write_cor(grid(30, 30))
+    
+    result, shapes = _import(db, table_id)
+    assert result["inserted"] == 900
+    assert _writes(shapes)
+    
+    result, shapes = _import(db, table_id)
+    assert (result["inserted"], result["updated"], result["deleted"], result["unchanged"]) == (0, 0, 0, 900)
+    assert result["total"] == 900
+    assert result["report"] is None
+    assert _writes(shapes) == []
+    # 表格、导入摘要、结果查询
+    assert len(shapes) <= 3
+
+
+def test_reimport_writes_only_changed_cells(client, db, write_cor):
+    """文件变化时只写入变化的格子"""
+    table_id = _create_table(client, "reimport-diff")
+    cells = grid(10, 10)
+    write_cor(cells)
+    _import(db, table_id)
+    
+    cells["(0, 0)"] = (cells["(0, 0)"] + 1) % 9
+    del cells["(9, 9)"]
+    cells["(10, 10)"] = 4
+    write_cor(cells)
+    result, shapes = _import(db, table_id)
+    assert (result["inserted"], result["updated"], result["deleted"], result["unchanged"]) == (1, 1, 1, 98)
+    assert result["total"] == 100
+    
+    stored = {c["position"]: c["color"] for c in result["coordinates"]}
+    assert stored == cells
+
+
+def test_reimport_keeps_coordinate_ids(client, write_cor):
+    """重复导入与增量导入不改变已有格子的ID"""
+    table_id = _create_table(client, "reimport-ids")
+    cells = grid(5, 5)
+    write_cor(cells)
+    first = client.get("/api/coordinate/batch", params={"id": table_id}).json()["coordinates"]
+    
+    cells["(1, 1)"] = (cells["(1, 1)"] + 1) % 9
+    write_cor(cells)
+    second = client.get("/api/coordinate/batch", params={"id": table_id}).json()["coordinates"]
+    assert {c["position"]: c["id"] for c in first} == {c["position"]: c["id"] for c in second}
\ No newline at end of file
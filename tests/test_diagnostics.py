@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+诊断接口测试：内存跟踪与慢语句接口需要profile_token
+"""
+
+import pytest
+
+from app.config.settings import settings
+
+MEMORY_ROUTES = (
+    ("post", "/api/diagnostics/memory/start"),
+    ("post", "/api/diagnostics/memory/stop"),
+    ("get", "/api/diagnostics/memory/status"),
+    ("post", "/api/diagnostics/memory/snapshot?name=base"),
+    ("get", "/api/diagnostics/memory/diff?base=base&target=base"),
+    ("get", "/api/diagnostics/memory/requests"),
+)
+
+SLOW_QUERY_ROUTES = (
+    ("get", "/api/diagnostics/slow-queries"),
+    ("delete", "/api/diagnostics/slow-queries"),
+)
+
+
+@pytest.fixture
+def profile_token(monkeypatch) -> str:
+    """配置profile_token"""
+    monkeypatch.setattr(settings, "profile_token", "diagnostics-secret")
+    return settings.profile_token
+
+
+@pytest.mark.parametrize("method,url", MEMORY_ROUTES + SLOW_QUERY_ROUTES)
+def test_memory_routes_unavailable_without_configured_token(client, monkeypatch, method, url):
+    """未配置profile_token时诊断接口不可用"""
+    monkeypatch.setattr(settings, "profile_token", None)
+    assert client.request(method, url, headers={"X-Profile-Token": "anything"}).status_code == 404
+
+
+@pytest.mark.parametrize("method,url", MEMORY_ROUTES + SLOW_QUERY_ROUTES)
+def test_memory_routes_reject_invalid_token(client, profile_token, method, url):
+    """令牌缺失或不一致时返回403"""
+    assert client.request(method, url).status_code == 403
+    assert client.request(method, url, headers={"X-Profile-Token": "wrong"}).status_code == 403
+
+
+def test_memory_tracing_with_token(client, profile_token):
+    """携带有效令牌（请求头或查询参数）时可以跟踪内存"""
+    headers = {"X-Profile-Token": profile_token}
+    try:
+        assert client.post("/api/diagnostics/memory/start", headers=headers).json()["tracing"] is True
+        status = client.get("/api/diagnostics/memory/status", params={"profile_token": profile_token})
+        assert status.status_code == 200 and status.json()["tracing"] is True
+    finally:
+        assert client.post("/api/diagnostics/memory/stop", headers=headers).status_code == 200
+
+
+def test_slow_queries_with_token(client, profile_token):
+    """携带有效令牌时可以查询与清空慢语句"""
+    headers = {"X-Profile-Token": profile_token}
+    assert client.delete("/api/diagnostics/slow-queries", headers=headers).json() == {"success": True}
+    assert client.get("/api/diagnostics/slow-queries", headers=headers).json() == []
\ No newline at end of file
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+共享网格测试：按全局代数构建与映射、写入后换代、退出时只清理本进程创建的段
+"""
+
+import os
+
+import pytest
+
+from app.tool import SharedGridStore
+from app.tool.grid_store import SHM_DIR
+
+from .conftest import grid
+
+pytestmark = pytest.mark.skipif(not os.path.isdir(SHM_DIR), reason="需要可枚举的POSIX共享内存目录")
+
+
+def _store() -> SharedGridStore:
+    """独立命名空间的共享网格缓存（模拟一个worker进程）"""
+    return SharedGridStore(namespace=f"t{os.getpid():x}", min_cells=1)
+
+
+def _import(client, write_cor, table_id: str, cells: dict) -> None:
+    """同步导入坐标文件"""
+    write_cor(cells)
+    assert client.get("/api/coordinate/batch", params={"id": table_id}).status_code == 200
+
+
+def _segment_exists(name: str) -> bool:
+    """段名是否仍存在"""
+    return os.path.exists(os.path.join(SHM_DIR, name))
+
+
+def test_generation_swap_and_cleanup(client, db, write_cor):
+    """写入使代数递增：新代数重新构建、旧段解除命名；其他进程映射同一段；退出时只清理自己创建的段"""
+    table_id = client.post("/api/table/add", json={"name": "grid-swap"}).json()["id"]
+    cells = grid(6, 5)
+    _import(client, write_cor, table_id, cells)
+    
+    builder, reader = _store(), _store()
+    try:
+        first = builder.get(db, int(table_id))
+        db.rollback()
+        assert builder.get(db, int(table_id)) is first
+        assert dict(first.iter_cells()) == cells
+        
+        attached = reader.get(db, int(table_id))
+        db.rollback()
+        assert attached.generation == first.generation
+        assert reader.stats()["grid_attaches"] == 1 and reader.stats()["grid_builds"] == 0
+        old_name = builder.segment_name(int(table_id), first.generation)
+        
+        changed = grid(6, 5, offset=2)
+        _import(client, write_cor, table_id, changed)
+        swapped = reader.get(db, int(table_id))
+        db.rollback()
+        assert swapped.generation > first.generation
+        assert dict(swapped.iter_cells()) == changed
+        assert not _segment_exists(old_name)
+        # 旧视图仍可读，读完后解除映射
+        assert dict(first.iter_cells()) == cells
+        new_name = reader.segment_name(int(table_id), swapped.generation)
+        
+        builder.unlink_created()
+        assert _segment_exists(new_name)
+        reader.unlink_created()
+        assert not _segment_exists(new_name)
+    finally:
+        builder.unlink_created()
+        reader.unlink_created()
\ No newline at end of file
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+写回存储测试：内存编辑写回、按进程区分的日志重放与其他途径写入后的失效
+"""
+
+import fcntl
+import json
+import os
+import sqlite3
+
+import pytest
+
+from app.config.database import SQLITE_FILE_PATH
+from app.models.coordinate import Coordinate
+from app.schemas.coordinate import CoordinateUpdate
+from app.service.hot_grid import HotGridStore
+from app.tool import coordinate_version_key
+
+from .conftest import grid
+
+
+def _new_store(journal_path: str) -> HotGridStore:
+    """启用的写回存储（写回间隔足够长，由测试显式写回）"""
+    store = HotGridStore(
+        enabled=True, flush_interval_ms=60000, max_dirty=10000, max_tables=4, journal_path=journal_path
+    )
+    store.start()
+    return store
+
+
+@pytest.fixture
+def journal_prefix(client, tmp_path) -> str:
+    """日志路径前缀"""
+    return str(tmp_path / "write_behind.journal")
+
+
+@pytest.fixture
+def store(journal_prefix):
+    """独立的写回存储"""
+    hot_grid_store = _new_store(journal_prefix)
+    yield hot_grid_store
+    hot_grid_store.close()
+
+
+def _create_grid(client, write_cor, name: str) -> tuple:
+    """创建表格并导入网格，返回(表格ID, 坐标列表)"""
+    table_id = client.post("/api/table/add", json={"name": name}).json()["id"]
+    write_cor(grid(4, 4))
+    assert client.get("/api/coordinate/batch", params={"id": table_id}).status_code == 200
+    coordinates = client.get("/api/coordinate/find", params={"id": table_id}).json()["coordinates"]
+    return int(table_id), coordinates
+
+
+def _recolor(cell: dict) -> dict:
+    """换一个颜色的坐标数据"""
+    return {**cell, "id": int(cell["id"]), "table_id": int(cell["table_id"]), "color": (cell["color"] + 1) % 9}
+
+
+def _stored_color(db, coordinate_id: int) -> int:
+    """数据库中坐标的颜色"""
+    db.rollback()
+    return db.query(Coordinate.color).filter(Coordinate.id == coordinate_id).scalar()
+
+
+def test_edits_are_journaled_and_flushed(client, db, write_cor, store):
+    """内存编辑先写入本进程日志，写回后数据库更新、日志删除，表格仍在内存中"""
+    table_id, coordinates = _create_grid(client, write_cor, "hot-flush")
+    store.activate(db, table_id)
+    edited = _recolor(coordinates[0])
+    assert store.update(CoordinateUpdate(**edited)) is not None
+    
+    assert store.journal_path.endswith(f".{os.getpid()}")
+    with open(store.journal_path, encoding="utf-8") as file:
+        assert [json.loads(line)["id"] for line in file] == [edited["id"]]
+    assert _stored_color(db, edited["id"]) == coordinates[0]["color"]
+    
+    assert store.flush() == 1
+    assert _stored_color(db, edited["id"]) == edited["color"]
+    assert not os.path.exists(store.journal_path) and not os.path.exists(store.flushing_path)
+    
+    # 自己的写回不使内存表格失效
+    rows = store.rows(db, table_id)
+    assert rows is not None
+    assert {row["id"]: row["color"] for row in rows}[edited["id"]] == edited["color"]
+
+
+def test_recover_replays_only_dead_owners(client, db, write_cor, journal_prefix):
+    """只重放锁文件未被持有（进程已退出）的日志，运行中进程的日志保留"""
+    _, coordinates = _create_grid(client, write_cor, "hot-recover")
+    dead, alive = _recolor(coordinates[0]), _recolor(coordinates[1])
+    for pid, row in ((999998, dead), (999999, alive)):
+        with open(f"{journal_prefix}.{pid}", "w", encoding="utf-8") as file:
+            file.write(json.dumps(row) + "\n")
+    
+    lock_fd = os.open(f"{journal_prefix}.999999.lock", os.O_RDWR | os.O_CREAT)
+    fcntl.flock(lock_fd, fcntl.LOCK_EX)
+    try:
+        store = _new_store(journal_prefix)
+        store.close()
+    finally:
+        os.close(lock_fd)
+    
+    assert _stored_color(db, dead["id"]) == dead["color"]
+    assert not os.path.exists(f"{journal_prefix}.999998")
+    assert _stored_color(db, alive["id"]) == coordinates[1]["color"]
+    assert os.path.exists(f"{journal_prefix}.999999")
+
+
+def test_write_from_elsewhere_evicts_resident_table(client, db, write_cor, store):
+    """其他进程提交后全局版本号前进，读取时内存表格写回并移出，改从数据库读取"""
+    table_id, coordinates = _create_grid(client, write_cor, "hot-stale")
+    store.activate(db, table_id)
+    edited = _recolor(coordinates[0])
+    store.update(CoordinateUpdate(**edited))
+    db.rollback()
+    assert store.rows(db, table_id) is not None
+    
+    other = _recolor(coordinates[1])
+    connection = sqlite3.connect(SQLITE_FILE_PATH)
+    try:
+        connection.execute("UPDATE coordinate SET color = ? WHERE id = ?", (other["color"], other["id"]))
+        connection.execute(
+            "UPDATE version_state SET version = version + 1 WHERE version_key = ?", (coordinate_version_key(table_id),)
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    
+    db.rollback()
+    assert store.rows(db, table_id) is None
+    assert store.cells(db, table_id) is None
+    # 移出前的内存编辑已写回，其他进程的修改保留
+    assert _stored_color(db, edited["id"]) == edited["color"]
+    assert _stored_color(db, other["id"]) == other["color"]
\ No newline at end of file
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+导入任务测试：任务认领、断点续传、孤儿任务接管与无有效数据时保留已有坐标
+"""
+
+import os
+import socket
+import time
+
+from app.models.import_job import ImportJob
+from app.service.import_job import (
+    JOB_STATUS_CANCELLED, JOB_STATUS_RUNNING, _stage_positions, import_job_monitor, process_owner, run_import_job
+)
+from app.tool import generate_id
+
+from .conftest import grid
+
+# 任务结束状态
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+def _create_table(client, name: str) -> str:
+    """创建表格，返回ID"""
+    return client.post("/api/table/add", json={"name": name}).json()["id"]
+
+
+def _run_job(client, table_id: str, timeout: float = 10.0) -> dict:
+    """提交导入任务并等待结束"""
+    job = client.post("/api/import/add", params={"id": table_id}).json()
+    return _wait_job(client, job, timeout)
+
+
+def _wait_job(client, job: dict, timeout: float = 10.0) -> dict:
+    """等待导入任务结束"""
+    deadline = time.monotonic() + timeout
+    while job["status"] not in FINISHED_STATUSES:
+        assert time.monotonic() < deadline, f"导入任务未结束: {job}"
+        time.sleep(0.02)
+        job = client.get("/api/import/find", params={"id": job["id"]}).json()
+    return job
+
+
+def _cor_path() -> str:
+    """坐标文件路径"""
+    from app.config.settings import settings
+    return settings.cor_file_path
+
+
+def _cells(client, table_id: str) -> dict:
+    """表格的位置 -> 颜色"""
+    coordinates = client.get("/api/coordinate/find", params={"id": table_id}).json()["coordinates"]
+    return {coordinate["position"]: coordinate["color"] for coordinate in coordinates}
+
+
+def _add_job(db, table_id: str, **fields) -> int:
+    """直接写入一条导入任务记录（模拟其他执行者或中断的任务）"""
+    job = ImportJob(id=generate_id(), table_id=int(table_id), **{"parsed": 0, "inserted": 0, "rejected": 0, **fields})
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def _find_job(client, job_id: int) -> dict:
+    """查询导入任务"""
+    return client.get("/api/import/find", params={"id": str(job_id)}).json()
+
+
+def test_claimed_job_is_not_run_again(client, db, write_cor):
+    """已被认领（running）的任务不会被再次执行"""
+    table_id = _create_table(client, "job-claimed")
+    cells = grid(3, 3)
+    write_cor(cells)
+    assert _run_job(client, table_id)["status"] == "succeeded"
+    
+    write_cor(grid(3, 3, offset=1))
+    job_id = _add_job(db, table_id, status=JOB_STATUS_RUNNING, owner=process_owner())
+    try:
+        run_import_job(job_id)
+        job = _find_job(client, job_id)
+        assert job["status"] == JOB_STATUS_RUNNING
+        assert job["parsed"] == 0
+        assert _cells(client, table_id) == cells
+    finally:
+        db.query(ImportJob).filter(ImportJob.id == job_id).update({ImportJob.status: JOB_STATUS_CANCELLED})
+        db.commit()
+
+
+def test_interrupted_job_resumes_after_parsed_line(client, db, write_cor):
+    """中断的任务从parsed之后的行继续导入，已提交行的位置记录保留，收尾不删除这些格子"""
+    table_id = _create_table(client, "job-resume")
+    old_cells = grid(3, 3)
+    write_cor(old_cells)
+    assert _run_job(client, table_id)["status"] == "succeeded"
+    
+    new_cells = grid(3, 3, offset=1)
+    write_cor(new_cells)
+    committed = list(new_cells)[:4]
+    job_id = _add_job(db, table_id, parsed=len(committed))
+    _stage_positions(db, job_id, [{"position": position} for position in committed])
+    db.commit()
+    
+    run_import_job(job_id)
+    job = _find_job(client, job_id)
+    assert job["status"] == "succeeded"
+    assert job["parsed"] == 9
+    assert job["inserted"] == 5
+    expected = {position: (old_cells if position in committed else new_cells)[position] for position in new_cells}
+    assert _cells(client, table_id) == expected
+
+
+def test_orphaned_job_is_taken_over(client, db, write_cor):
+    """执行者已退出的running任务由监控重置并重新执行"""
+    table_id = _create_table(client, "job-orphan")
+    cells = grid(4, 4)
+    write_cor(cells)
+    job_id = _add_job(db, table_id, status=JOB_STATUS_RUNNING, owner=f"{socket.gethostname()}:{os.getpid()}:previous")
+    
+    assert job_id in import_job_monitor.check()
+    job = _wait_job(client, _find_job(client, job_id))
+    assert job["status"] == "succeeded"
+    assert _cells(client, table_id) == cells
+
+
+def test_job_removes_cells_missing_from_file(client, write_cor):
+    """导入任务写入文件中的格子并删除文件中已不存在的格子"""
+    table_id = _create_table(client, "job-diff")
+    write_cor(grid(6, 6))
+    assert _run_job(client, table_id)["status"] == "succeeded"
+    
+    cells = grid(4, 4, offset=1)
+    write_cor(cells)
+    job = _run_job(client, table_id)
+    assert job["status"] == "succeeded"
+    assert _cells(client, table_id) == cells
+
+
+def test_all_invalid_file_keeps_cells(client, write_cor):
+    """文件中没有有效坐标（全部无效或空文件）时两种导入都保留已有坐标"""
+    table_id = _create_table(client, "job-invalid")
+    cells = grid(5, 5)
+    write_cor(cells)
+    assert _run_job(client, table_id)["status"] == "succeeded"
+    
+    with open(_cor_path(), "w", encoding="utf-8") as file:
+        file.write("(0, 0) 12\nnot a coordinate\n(1, 1) -1\n")
+    job = _run_job(client, table_id)
+    assert job["status"] == "succeeded"
+    assert job["rejected"] == 3
+    assert _cells(client, table_id) == cells
+    
+    batch = client.get("/api/coordinate/batch", params={"id": table_id}).json()
+    assert batch["total"] == 0
+    assert _cells(client, table_id) == cells
+    
+    write_cor({})
+    assert _run_job(client, table_id)["status"] == "succeeded"
+    assert _cells(client, table_id) == cells
\ No newline at end of file
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+导入校验报告测试：按原因汇总拒绝行、只校验不写入、导出文件可原样导入
+"""
+
+import gzip
+import os
+
+from app.tool import ValidationReport
+from app.tool.cor_parser import CorParser
+
+from .conftest import grid
+
+
+def _create_table(client, name: str) -> str:
+    """创建表格，返回ID"""
+    return client.post("/api/table/add", json={"name": name}).json()["id"]
+
+
+def _write_lines(lines: list) -> None:
+    """按原样写入坐标文件"""
+    with open(os.environ["COR_FILE_PATH"], "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def _batch(client, table_id: str, **params) -> dict:
+    """调用导入接口"""
+    response = client.get("/api/coordinate/batch", params={"id": table_id, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _stored(client, table_id: str) -> dict:
+    """表格中已存储的坐标：位置 -> 颜色"""
+    coordinates = client.get("/api/coordinate/find", params={"id": table_id}).json()["coordinates"]
+    return {coordinate["position"]: coordinate["color"] for coordinate in coordinates}
+
+
+def test_report_counts_and_caps_samples():
+    """按原因计数，每种原因只保留前若干个样例，按首次出现的行排序"""
+    report = ValidationReport(max_samples=2)
+    lines = ["(0, 0) 9", "bad", "", "(1, 1) 3", "(2, 2) 12", "also bad", "(3, 3) 99"]
+    for line_num, line in enumerate(lines, 1):
+        report.add(line_num, line, CorParser.parse_line(line)[0] if line else None)
+    
+    data = report.to_dict()
+    assert (data["lines"], data["blank"], data["accepted"], data["rejected"]) == (7, 1, 1, 5)
+    assert [entry["reason"] for entry in data["reasons"]] == [CorParser.REASON_COLOR_RANGE, CorParser.REASON_FORMAT]
+    color_range, bad_format = data["reasons"]
+    assert (color_range["count"], color_range["first_line"]) == (3, 1)
+    assert [sample["line"] for sample in color_range["samples"]] == [1, 5]
+    assert bad_format["samples"] == [{"line": 2, "text": "bad"}, {"line": 6, "text": "also bad"}]
+    
+    # 断点续传恢复后继续累计，样例上限不变
+    resumed = ValidationReport.from_dict(data, max_samples=2)
+    assert resumed.to_dict() == data
+    resumed.add(8, "bad again", CorParser.REASON_FORMAT)
+    assert resumed.rejected == 6
+    assert len(resumed.reasons[CorParser.REASON_FORMAT]["samples"]) == 2
+
+
+def test_dry_run_reports_without_writing(client, write_cor):
+    """只校验时返回校验报告与预计差异，不修改表格；之后的实际导入仍会写入"""
+    table_id = _create_table(client, "dry-run")
+    cells = grid(3, 3)
+    write_cor(cells)
+    _batch(client, table_id)
+    
+    _write_lines([
+        "(0, 0) 8",
+        "（1， 1） 7",
+        "(5, 5) 1",
+        "",
+        "(6, 6) 10",
+        "not a line",
+    ])
+    dry_run = _batch(client, table_id, dry_run=True)
+    assert dry_run["dry_run"] is True and dry_run["coordinates"] == []
+    assert dry_run["total"] == 3
+    assert (dry_run["inserted"], dry_run["updated"], dry_run["deleted"], dry_run["unchanged"]) == (1, 2, 7, 0)
+    report = dry_run["report"]
+    assert (report["lines"], report["blank"], report["accepted"], report["rejected"]) == (6, 1, 3, 2)
+    assert [(entry["reason"], entry["first_line"]) for entry in report["reasons"]] == [
+        (CorParser.REASON_COLOR_RANGE, 5), (CorParser.REASON_FORMAT, 6)
+    ]
+    assert _stored(client, table_id) == cells
+    
+    imported = _batch(client, table_id)
+    assert (imported["inserted"], imported["updated"], imported["deleted"]) == (1, 2, 7)
+    assert imported["report"] == report
+    assert _stored(client, table_id) == {"(0, 0)": 8, "(1, 1)": 7, "(5, 5)": 1}
+
+
+def test_export_imports_back_unchanged(client, write_cor):
+    """导出文件（含gzip）可原样导入：校验无拒绝行，导入到新表格后内容一致"""
+    source_id = _create_table(client, "export-source")
+    cells = grid(8, 6)
+    write_cor(cells)
+    _batch(client, source_id)
+    
+    exported = client.get("/api/coordinate/export", params={"id": source_id}).content
+    compressed = client.get("/api/coordinate/export", params={"id": source_id, "gzip": True}).content
+    assert gzip.decompress(compressed) == exported
+    
+    with open(os.environ["COR_FILE_PATH"], "wb") as file:
+        file.write(exported)
+    check = _batch(client, source_id, dry_run=True)
+    assert check["report"]["rejected"] == 0
+    assert (check["total"], check["unchanged"], check["deleted"]) == (len(cells), len(cells), 0)
+    
+    target_id = _create_table(client, "export-target")
+    imported = _batch(client, target_id)
+    assert imported["inserted"] == len(cells) and imported["report"]["rejected"] == 0
+    assert _stored(client, target_id) == cells
\ No newline at end of file
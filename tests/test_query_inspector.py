@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+SQL语句检查测试：语句计数、重复语句与N+1检测、失败语句不影响计时
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.config.settings import settings
+from app.tool import capture_queries, query_inspector_middleware
+
+
+def _select_each(engine, count: int) -> None:
+    """逐条执行同一形态的查询（N+1）"""
+    with engine.connect() as connection:
+        for i in range(count):
+            connection.execute(text("SELECT :value"), {"value": i})
+
+
+def test_recorder_counts_and_detects_n_plus_one(client):
+    """同一形态的SELECT执行次数达到阈值时判定为N+1"""
+    from app.config.database import engine
+    
+    with capture_queries() as recorder:
+        _select_each(engine, 6)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1 WHERE 1 = 0"))
+    
+    assert recorder.count == 7
+    assert list(recorder.duplicates().values()) == [6]
+    assert list(recorder.n_plus_one(5).values()) == [6]
+    assert recorder.n_plus_one(7) == {}
+
+
+def test_statements_outside_scope_are_not_recorded(client):
+    """记录范围之外执行的语句不计入"""
+    from app.config.database import engine
+    
+    with capture_queries() as recorder:
+        pass
+    _select_each(engine, 3)
+    assert recorder.count == 0
+
+
+def test_middleware_summary_header(client, monkeypatch):
+    """中间件在响应头中返回本请求的语句统计"""
+    from app.config.database import engine
+    
+    monkeypatch.setattr(settings, "sql_inspect_header", True)
+    app = FastAPI()
+    app.middleware("http")(query_inspector_middleware)
+    
+    @app.get("/loop")
+    def loop(count: int):
+        _select_each(engine, count)
+        return {}
+    
+    with TestClient(app) as test_client:
+        summary = test_client.get("/loop", params={"count": 5}).headers["X-SQL-Summary"]
+        quiet = test_client.get("/loop", params={"count": 1}).headers["X-SQL-Summary"]
+    
+    assert "queries=5" in summary and "n_plus_one=1" in summary
+    assert "queries=1" in quiet and "n_plus_one=0" in quiet
+
+
+def test_failed_statement_does_not_leak_or_skew_timing(client):
+    """失败的语句不在连接上残留开始时间，之后的语句按自身开始时间计时"""
+    from app.config.database import engine
+    
+    with engine.connect() as connection:
+        info = {key: repr(value) for key, value in connection.info.items()}
+        with capture_queries() as recorder:
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+            time.sleep(0.2)
+            connection.execute(text("SELECT 1"))
+        assert {key: repr(value) for key, value in connection.info.items()} == info
+    
+    assert recorder.count == 1
+    assert recorder.statements[0][1] < 0.1
\ No newline at end of file
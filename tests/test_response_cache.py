@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+响应缓存测试：LRU字节上限、版本标签、精确失效与接口读穿缓存
+"""
+
+import time
+
+from app.tool import ResponseCache, response_cache
+
+
+def test_lru_evicts_by_bytes():
+    """超出字节上限时淘汰最久未读取的项，单项过大不缓存"""
+    cache = ResponseCache(max_bytes=40, ttl_seconds=60)
+    for key in ("a", "b", "c", "d"):
+        cache.set(key, "v1", ["k"], key.encode() * 10)
+    assert cache.get("a", "v1") == b"a" * 10
+    
+    cache.set("e", "v1", ["k"], b"e" * 10)
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") == b"a" * 10
+    assert cache.stats()["evictions"] == 1
+    
+    cache.set("big", "v1", ["k"], b"x" * 11)
+    assert cache.get("big", "v1") is None
+
+
+def test_tag_mismatch_and_expiry_miss():
+    """版本标签不一致或已过期时视为未命中并移除"""
+    cache = ResponseCache(max_bytes=1024, ttl_seconds=60)
+    cache.set("a", "v1", ["k"], b"old")
+    assert cache.get("a", "v2") is None
+    assert cache.get("a", "v1") is None
+    
+    expiring = ResponseCache(max_bytes=1024, ttl_seconds=0)
+    expiring.set("a", "v1", ["k"], b"old")
+    time.sleep(0.01)
+    assert expiring.get("a", "v1") is None
+    assert expiring.stats()["entries"] == 0
+
+
+def test_invalidate_only_dependents():
+    """按版本键失效只移除依赖该键的项，未指定键时清空"""
+    cache = ResponseCache(max_bytes=1024, ttl_seconds=60)
+    cache.set("coordinates", "v1", ["coordinate:1", "text_info"], b"1")
+    cache.set("phrases", "v1", ["phrase", "text_info"], b"2")
+    cache.set("tables", "v1", ["table"], b"3")
+    
+    cache.invalidate("coordinate:1")
+    assert cache.get("coordinates", "v1") is None
+    assert cache.get("phrases", "v1") == b"2"
+    
+    cache.invalidate("text_info")
+    assert cache.get("phrases", "v1") is None
+    assert cache.get("tables", "v1") == b"3"
+    
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+def test_page_served_from_cache_until_table_changes(client):
+    """相同请求命中缓存，表格写入后重新查询"""
+    params = {"limit": 7}
+    first = client.get("/api/table/page", params=params)
+    hits = response_cache.hits
+    cached = client.get("/api/table/page", params=params)
+    assert response_cache.hits == hits + 1
+    assert cached.content == first.content
+    
+    table_id = client.post("/api/table/add", json={"name": "cache-table"}).json()["id"]
+    changed = client.get("/api/table/page", params=params)
+    assert response_cache.hits == hits + 1
+    assert table_id in [table["id"] for table in changed.json()["tables"]]
\ No newline at end of file
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+数据库结构迁移测试：旧版初始化脚本创建的数据库按模型迁移
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.config.schema import bootstrap_schema
+from app.tool import capture_queries
+
+# 旧版data/init_database.py创建的表结构
+LEGACY_SCHEMA = """
+    CREATE TABLE "Table" (
+        id BIGINT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        create_time DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE TextInfo (
+        id BIGINT PRIMARY KEY,
+        color INTEGER NOT NULL UNIQUE CHECK (color >= 0 AND color <= 8),
+        text TEXT DEFAULT ''
+    );
+    CREATE TABLE Phrase (
+        id BIGINT PRIMARY KEY,
+        text_id BIGINT NOT NULL,
+        word VARCHAR(255) NOT NULL,
+        type INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (text_id) REFERENCES TextInfo(id)
+    );
+    CREATE TABLE Coordinate (
+        id BIGINT PRIMARY KEY,
+        tableId BIGINT NOT NULL,
+        color INTEGER NOT NULL CHECK (color >= 0 AND color <= 8),
+        position VARCHAR(255) NOT NULL,
+        voc VARCHAR(255),
+        repeated INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (tableId) REFERENCES "Table"(id)
+    );
+"""
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """旧版脚本创建并写入数据的数据库文件"""
+    path = tmp_path / "legacy.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(LEGACY_SCHEMA)
+    connection.executemany("INSERT INTO TextInfo (id, color, text) VALUES (?, ?, '')", [(100 + color, color) for color in range(9)])
+    connection.execute("INSERT INTO \"Table\" (id, name) VALUES (1, 'legacy')")
+    connection.execute("INSERT INTO Phrase (id, text_id, word, type) VALUES (10, 101, '甲', 0)")
+    connection.executemany(
+        "INSERT INTO Coordinate (id, tableId, color, position, voc, repeated) VALUES (?, 1, ?, ?, NULL, 0)",
+        [(1000 + i, i % 9, f"({i}, 0)") for i in range(20)]
+    )
+    connection.commit()
+    connection.close()
+    return path
+
+
+def _schema(path) -> dict:
+    """表与索引的建表语句"""
+    connection = sqlite3.connect(path)
+    try:
+        return {name: sql for name, sql in connection.execute("SELECT name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")}
+    finally:
+        connection.close()
+
+
+def _rows(path, statement: str) -> list:
+    """查询迁移后的数据"""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(statement).fetchall()
+    finally:
+        connection.close()
+
+
+def test_legacy_database_is_migrated(legacy_db):
+    """旧表数据迁移到模型表，坐标按(table_id, position)聚簇，旧表删除"""
+    engine = create_engine(f"sqlite:///{legacy_db}")
+    try:
+        bootstrap_schema(engine)
+    finally:
+        engine.dispose()
+    
+    schema = _schema(legacy_db)
+    assert "Table" not in schema and "TextInfo" not in schema
+    assert "WITHOUT ROWID" in schema["coordinate"].upper()
+    assert "ux_coordinate_id" in schema
+    assert "ix_table_info_create_time_id_name" in schema
+    
+    assert _rows(legacy_db, "SELECT id, name FROM table_info") == [(1, "legacy")]
+    assert _rows(legacy_db, "SELECT count(*) FROM text_info") == [(9,)]
+    assert _rows(legacy_db, "SELECT id, text_id, word FROM phrase") == [(10, 101, "甲")]
+    coordinates = _rows(legacy_db, "SELECT id, table_id, color, position FROM coordinate ORDER BY id")
+    assert coordinates == [(1000 + i, 1, i % 9, f"({i}, 0)") for i in range(20)]
+
+
+def test_bootstrap_is_repeatable(legacy_db):
+    """已迁移的数据库再次初始化不重建表、不建新索引"""
+    engine = create_engine(f"sqlite:///{legacy_db}")
+    try:
+        bootstrap_schema(engine)
+        migrated = _schema(legacy_db)
+        with capture_queries() as recorder:
+            bootstrap_schema(engine)
+    finally:
+        engine.dispose()
+    
+    assert _schema(legacy_db) == migrated
+    assert not [shape for shape, _ in recorder.statements if shape.lstrip().upper().startswith(("CREATE", "ALTER", "INSERT"))]
+
+
+def test_duplicate_positions_keep_newest(legacy_db):
+    """旧表中同一表格同一位置的重复坐标在重建时只保留ID最大的一行"""
+    connection = sqlite3.connect(legacy_db)
+    connection.executemany(
+        "INSERT INTO Coordinate (id, tableId, color, position, voc, repeated) VALUES (?, 1, ?, ?, NULL, 0)",
+        [(2000, 8, "(0, 0)"), (1500, 7, "(0, 0)"), (2001, 6, "(1, 0)"), (900, 5, "(2, 0)")]
+    )
+    connection.commit()
+    connection.close()
+    
+    engine = create_engine(f"sqlite:///{legacy_db}")
+    try:
+        bootstrap_schema(engine)
+    finally:
+        engine.dispose()
+    
+    coordinates = dict(_rows(legacy_db, "SELECT position, id FROM coordinate"))
+    assert len(coordinates) == 20
+    assert coordinates["(0, 0)"] == 2000
+    assert coordinates["(1, 0)"] == 2001
+    assert coordinates["(2, 0)"] == 1002
+    assert _rows(legacy_db, "SELECT color FROM coordinate WHERE id = 2000") == [(8,)]
\ No newline at end of file
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+读取合并测试：并发相同读取只执行一次、发起者取消不影响等待者、失败不残留
+"""
+
+import asyncio
+
+from app.tool import SingleFlight
+
+
+def _counting(calls: list, result, delay: float = 0.05, error: Exception = None):
+    """计数的异步读取"""
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    return fetch
+
+
+def test_concurrent_calls_share_one_execution():
+    """同一key的并发调用共享一次执行，不同key各自执行"""
+    flight = SingleFlight()
+    calls = []
+    payload = object()
+    
+    async def run():
+        return await asyncio.gather(
+            *[flight.do("page", _counting(calls, payload)) for _ in range(5)],
+            flight.do("other", _counting(calls, "other"))
+        )
+    
+    results = asyncio.run(run())
+    assert len(calls) == 2
+    assert all(result is payload for result in results[:5])
+    assert results[5] == "other"
+    assert flight.stats() == {"in_flight": 0, "executions": 2, "coalesced": 4}
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    """发起者被取消时，等待同一结果的调用方仍得到结果"""
+    flight = SingleFlight()
+    calls = []
+    
+    async def run():
+        first = asyncio.ensure_future(flight.do("page", _counting(calls, "rows")))
+        second = asyncio.ensure_future(flight.do("page", _counting(calls, "rows")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(run()) == "rows"
+    assert len(calls) == 1
+
+
+def test_failure_is_shared_and_not_retained():
+    """执行失败时所有等待者得到同一异常，之后的调用重新执行"""
+    flight = SingleFlight()
+    calls = []
+    
+    async def run():
+        failed = await asyncio.gather(
+            *[flight.do("page", _counting(calls, None, error=RuntimeError("查询失败"))) for _ in range(3)],
+            return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in failed)
+        return await flight.do("page", _counting(calls, "rows", delay=0))
+    
+    assert asyncio.run(run()) == "rows"
+    assert len(calls) == 2
+    assert flight.stats()["in_flight"] == 0
\ No newline at end of file
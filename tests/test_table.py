@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Table接口测试：克隆、键集分页与条件请求
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+
+from app.service.table import TableService
+from app.tool import TABLE_VERSION_KEY, capture_queries, change_log_poller, get_global_version, version_counter
+from app.tool.id_generator import SnowflakeIdGenerator
+
+from .conftest import grid
+
+
+def _create_table(client, name: str) -> str:
+    """创建表格，返回ID"""
+    response = client.post("/api/table/add", json={"name": name})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _coordinate_ids(client, table_id: str) -> list:
+    """表格全部坐标ID"""
+    response = client.get("/api/coordinate/find", params={"id": table_id})
+    assert response.status_code == 200
+    return [coordinate["id"] for coordinate in response.json()["coordinates"]]
+
+
+def _clone_queries(db, table_id: str) -> int:
+    """克隆表格执行的SQL语句数"""
+    with capture_queries() as recorder:
+        asyncio.run(TableService(db).clone_table(int(table_id)))
+    return recorder.count
+
+
+def test_clone_assigns_unique_ids(client, write_cor):
+    """克隆的坐标使用新的唯一ID，位置与颜色与源表格一致"""
+    source_id = _create_table(client, "clone-source")
+    write_cor(grid(12, 10))
+    assert client.get("/api/coordinate/batch", params={"id": source_id}).status_code == 200
+    
+    first = client.post("/api/table/clone", params={"id": source_id, "name": "clone-1"}).json()
+    second = client.post("/api/table/clone", params={"id": source_id}).json()
+    assert second["name"] == "clone-source副本"
+    
+    source_ids = _coordinate_ids(client, source_id)
+    first_ids = _coordinate_ids(client, first["id"])
+    second_ids = _coordinate_ids(client, second["id"])
+    assert len(source_ids) == len(first_ids) == len(second_ids) == 120
+    all_ids = source_ids + first_ids + second_ids
+    assert len(set(all_ids)) == len(all_ids)
+    
+    source_cells = client.get("/api/coordinate/find", params={"id": source_id}).json()["coordinates"]
+    clone_cells = client.get("/api/coordinate/find", params={"id": first["id"]}).json()["coordinates"]
+    assert sorted((c["position"], c["color"]) for c in source_cells) == sorted((c["position"], c["color"]) for c in clone_cells)
+
+
+def test_clone_query_count_independent_of_size(client, db, write_cor):
+    """克隆在数据库内复制：语句数与坐标数无关"""
+    small_id = _create_table(client, "clone-small")
+    write_cor(grid(3, 3))
+    client.get("/api/coordinate/batch", params={"id": small_id})
+    large_id = _create_table(client, "clone-large")
+    write_cor(grid(40, 40))
+    client.get("/api/coordinate/batch", params={"id": large_id})
+    
+    small = _clone_queries(db, small_id)
+    large = _clone_queries(db, large_id)
+    assert small == large
+    assert large <= 10
+
+
+def test_borrow_wait_releases_generator_lock():
+    """预留区间超过借用上限时在锁外等待，等待期间生成器锁可用"""
+    generator = SnowflakeIdGenerator(machine_id=3)
+    generator.MAX_BORROW_MS = 20
+    millis = 300
+    
+    worker = threading.Thread(target=generator.reserve_ids, args=((generator.MAX_SEQUENCE + 1) * millis,))
+    started = time.monotonic()
+    worker.start()
+    time.sleep(0.05)
+    acquired = generator.lock.acquire(timeout=0.05)
+    if acquired:
+        generator.lock.release()
+    worker.join(timeout=5)
+    
+    assert acquired
+    assert not worker.is_alive()
+    assert time.monotonic() - started >= (millis - generator.MAX_BORROW_MS) / 1000 * 0.9
+
+
+def test_page_keyset_cursor(client):
+    """按游标逐页读取，结果按创建时间降序且不重复不遗漏"""
+    prefix = f"page-{uuid.uuid4().hex[:8]}-"
+    created = [_create_table(client, f"{prefix}{i}") for i in range(7)]
+    _create_table(client, "other-table")
+    
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3, "name_prefix": prefix.upper(), "with_total": True}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/table/page", params=params).json()
+        assert body["total"] == 7
+        seen.extend(table["id"] for table in body["tables"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert pages == 3
+    assert seen == list(reversed(created))
+
+
+def test_page_bad_cursor(client):
+    """无效游标返回400"""
+    response = client.get("/api/table/page", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_page_query_count(client, db):
+    """每页一条查询，返回总数时多一条计数查询，与翻页位置无关"""
+    prefix = f"count-{uuid.uuid4().hex[:8]}-"
+    for i in range(5):
+        _create_table(client, f"{prefix}{i}")
+    service = TableService(db)
+    
+    with capture_queries() as recorder:
+        first = asyncio.run(service.get_table_page(2, None, prefix))
+    assert recorder.count == 1
+    
+    with capture_queries() as recorder:
+        asyncio.run(service.get_table_page(2, first.next_cursor, prefix, True))
+    assert recorder.count == 2
+
+
+def test_page_etag_not_modified_and_invalidation(client):
+    """未变化时条件请求返回304，表格变化后ETag失效"""
+    first = client.get("/api/table/page")
+    etag = first.headers["ETag"]
+    
+    not_modified = client.get("/api/table/page", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    
+    table_id = _create_table(client, "etag-table")
+    changed = client.get("/api/table/page", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert table_id in [table["id"] for table in changed.json()["tables"]]
+    
+    renamed = client.put("/api/table/update", json={"id": table_id, "name": "etag-renamed"})
+    assert renamed.status_code == 200
+    after_update = client.get("/api/table/page", headers={"If-None-Match": changed.headers["ETag"]})
+    assert after_update.status_code == 200
+    assert "etag-renamed" in [table["name"] for table in after_update.json()["tables"]]
+
+def test_etag_derived_from_shared_version(client, db):
+    """ETag由全局版本号生成，丢弃本进程版本并重新同步（如进程重启）后不变"""
+    _create_table(client, "etag-shared")
+    etag = client.get("/api/table/page").headers["ETag"]
+    assert etag == f'W/"{get_global_version(db, TABLE_VERSION_KEY)}"'
+    
+    version_counter.reset()
+    change_log_poller.close()
+    resynced = client.get("/api/table/page", headers={"If-None-Match": etag})
+    assert resynced.status_code == 304
+    assert resynced.headers["ETag"] == etag
\ No newline at end of file
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+写入队列测试：组提交、失败隔离与写线程存活
+"""
+
+import asyncio
+
+import pytest
+
+from app.models.table import Table
+from app.service import write_queue as write_queue_module
+from app.service.write_queue import WriteQueue
+from app.tool import generate_id
+
+
+@pytest.fixture
+def queue(client):
+    """独立的写入队列（窗口足够长，并发提交的操作进入同一批次）"""
+    write_queue = WriteQueue(enabled=True, window_ms=50, max_batch=64)
+    yield write_queue
+    write_queue.close()
+
+
+def _add_table(name: str, fail: bool = False):
+    """写操作：新增表格，fail时在写入后抛出异常"""
+    def operation(db):
+        table = Table(id=generate_id(), name=name)
+        db.add(table)
+        db.flush()
+        if fail:
+            raise ValueError(f"写入失败: {name}")
+        return table.id
+    return operation
+
+
+async def _submit_all(write_queue: WriteQueue, operations: list) -> list:
+    """并发提交全部操作"""
+    return await asyncio.gather(
+        *[write_queue.submit(None, operation) for operation in operations],
+        return_exceptions=True
+    )
+
+
+def _stored_names(db, prefix: str) -> set:
+    """已提交的表格名称"""
+    return {name for (name,) in db.query(Table.name).filter(Table.name.like(f"{prefix}%"))}
+
+
+def test_concurrent_writes_share_one_commit(queue, db):
+    """并发的小写入合并到一个事务提交，各自得到自己的结果"""
+    names = [f"wq-batch-{i}" for i in range(10)]
+    results = asyncio.run(_submit_all(queue, [_add_table(name) for name in names]))
+    
+    assert all(isinstance(result, int) for result in results)
+    assert len(set(results)) == 10
+    assert queue.commits == 1
+    assert queue.operations == 10
+    assert _stored_names(db, "wq-batch-") == set(names)
+
+
+def test_failed_operation_is_isolated(queue, db):
+    """批次中一个操作失败时回滚整批并逐个重做，只有失败的调用方得到异常"""
+    operations = [_add_table("wq-mixed-0"), _add_table("wq-mixed-bad", fail=True), _add_table("wq-mixed-2")]
+    results = asyncio.run(_submit_all(queue, operations))
+    
+    assert isinstance(results[0], int) and isinstance(results[2], int)
+    assert isinstance(results[1], ValueError)
+    assert queue.fallbacks == 1
+    assert queue.commits == 2
+    assert _stored_names(db, "wq-mixed-") == {"wq-mixed-0", "wq-mixed-2"}
+
+
+def test_unexpected_error_fails_batch_and_keeps_thread(queue, db, monkeypatch):
+    """创建会话失败时整批以异常结束，写线程继续处理后续操作"""
+    def broken_session():
+        raise RuntimeError("无法创建会话")
+    
+    monkeypatch.setattr(write_queue_module, "SessionLocal", broken_session)
+    results = asyncio.run(_submit_all(queue, [_add_table("wq-broken-0"), _add_table("wq-broken-1")]))
+    assert all(isinstance(result, RuntimeError) for result in results)
+    
+    monkeypatch.undo()
+    results = asyncio.run(_submit_all(queue, [_add_table("wq-after")]))
+    assert isinstance(results[0], int)
+    assert _stored_names(db, "wq-broken-") == set()
+    assert _stored_names(db, "wq-after") == {"wq-after"}
\ No newline at end of file